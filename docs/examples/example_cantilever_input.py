@@ -8,8 +8,6 @@ import compas_rhino
 import compas_rhino.objects
 
 import compas
-from compas.itertools import pairwise
-from compas.tolerance import TOL
 from compas_bender.datastructures import BendNetwork
 
 HERE = os.path.dirname(__file__)
@@ -32,73 +30,20 @@ guids = compas_rhino.objects.get_polylines(layer="cables")
 cable_polylines = compas_rhino.objects.get_polyline_coordinates(guids)
 
 # ==============================================================================
-# Network from lines
+# Network from lines, with anchors, splines and cables
 # ==============================================================================
 
-network = BendNetwork.from_lines(lines)
-
-gkey_key = {TOL.geometric_key(network.node_attributes(node, "xyz")): node for node in network.nodes()}
-
-# ==============================================================================
-# Identify anchors
-# ==============================================================================
-
-for point in points:
-    gkey = TOL.geometric_key(point)
-    if gkey in gkey_key:
-        key = gkey_key[gkey]
-        network.node_attribute(key, "is_anchor", True)
-
-# ==============================================================================
-# Identify splines
-# ==============================================================================
-
-splines = []
-
-for polyline in spline_polylines:
-    start = None
-    edges = []
-    for a, b in pairwise(polyline):
-        a_gkey = TOL.geometric_key(a)
-        b_gkey = TOL.geometric_key(b)
-        if a_gkey in gkey_key and b_gkey in gkey_key:
-            u = gkey_key[a_gkey]
-            v = gkey_key[b_gkey]
-            if start is None:
-                start = u
-            if network.has_edge((u, v)):
-                edges.append((u, v))
-            else:
-                edges.append((v, u))
-    splines.append({"start": start, "edges": edges})
-
-# ==============================================================================
-# Identify cables
-# ==============================================================================
-
-cables = []
-
-for polyline in cable_polylines:
-    start = None
-    edges = []
-    for a, b in pairwise(polyline):
-        a_gkey = TOL.geometric_key(a)
-        b_gkey = TOL.geometric_key(b)
-        if a_gkey in gkey_key and b_gkey in gkey_key:
-            u = gkey_key[a_gkey]
-            v = gkey_key[b_gkey]
-            if start is None:
-                start = u
-            if network.has_edge((u, v)):
-                edges.append((u, v))
-            else:
-                edges.append((v, u))
-    cables.append({"start": start, "edges": edges})
+network = BendNetwork.from_lines_with_features(
+    lines,
+    anchors=points,
+    splines=spline_polylines,
+    cables=cable_polylines,
+)
 
 # ==============================================================================
 # Export
 # ==============================================================================
 
-data = {"network": network, "splines": splines, "cables": cables}
+data = {"network": network}
 
 compas.json_dump(data, FILE)
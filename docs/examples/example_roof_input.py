@@ -7,8 +7,6 @@ import os
 import compas_rhino
 
 import compas
-from compas.utilities import geometric_key
-from compas.utilities import pairwise
 from compas_bender.datastructures import BendNetwork
 
 HERE = os.path.dirname(__file__)
@@ -34,87 +32,21 @@ guids = compas_rhino.get_lines(layer="ties")
 tie_lines = compas_rhino.get_line_coordinates(guids)
 
 # ==============================================================================
-# Network from lines
+# Network from lines, with anchors, splines, cables and ties
 # ==============================================================================
 
-network = BendNetwork.from_lines(lines)
-
-gkey_key = {geometric_key(network.node_attributes(node, "xyz")): node for node in network.nodes()}
-
-# ==============================================================================
-# Identify anchors
-# ==============================================================================
-
-for point in points:
-    gkey = geometric_key(point)
-    if gkey in gkey_key:
-        key = gkey_key[gkey]
-        network.node_attribute(key, "is_anchor", True)
-
-# ==============================================================================
-# Identify splines
-# ==============================================================================
-
-splines = []
-
-for polyline in spline_polylines:
-    start = None
-    edges = []
-    for a, b in pairwise(polyline):
-        a_gkey = geometric_key(a)
-        b_gkey = geometric_key(b)
-        if a_gkey in gkey_key and b_gkey in gkey_key:
-            u = gkey_key[a_gkey]
-            v = gkey_key[b_gkey]
-            if start is None:
-                start = u
-            if network.has_edge(u, v):
-                edges.append((u, v))
-            else:
-                edges.append((v, u))
-    splines.append({"start": start, "edges": edges})
-
-# ==============================================================================
-# Identify cables
-# ==============================================================================
-
-cables = []
-
-for polyline in cable_polylines:
-    start = None
-    edges = []
-    for a, b in pairwise(polyline):
-        a_gkey = geometric_key(a)
-        b_gkey = geometric_key(b)
-        if a_gkey in gkey_key and b_gkey in gkey_key:
-            u = gkey_key[a_gkey]
-            v = gkey_key[b_gkey]
-            if start is None:
-                start = u
-            if network.has_edge(u, v):
-                edges.append((u, v))
-            else:
-                edges.append((v, u))
-    cables.append({"start": start, "edges": edges})
-
-# ==============================================================================
-# Identify ties
-# ==============================================================================
-
-ties = []
-
-for a, b in tie_lines:
-    a_gkey = geometric_key(a)
-    b_gkey = geometric_key(b)
-    if a_gkey in gkey_key and b_gkey in gkey_key:
-        u = gkey_key[a_gkey]
-        v = gkey_key[b_gkey]
-        ties.append((u, v))
+network = BendNetwork.from_lines_with_features(
+    lines,
+    anchors=points,
+    splines=spline_polylines,
+    cables=cable_polylines,
+    ties=tie_lines,
+)
 
 # ==============================================================================
 # Export
 # ==============================================================================
 
-data = {"network": network, "splines": splines, "cables": cables, "ties": ties}
+data = {"network": network}
 
 compas.json_dump(data, FILE)
@@ -16,4 +16,4 @@ TEMP = os.path.abspath(os.path.join(HOME, "temp"))
 
 
 __all__ = ["HOME", "DATA", "DOCS", "TEMP"]
-__all_plugins__ = ["compas_bender.install"]
+__all_plugins__ = ["compas_bender.install", "compas_bender.notebook.scene"]
@@ -1,2 +1,6 @@
+import sys
+
+from compas_bender.cli import main
+
 if __name__ == "__main__":
-    pass
+    sys.exit(main())
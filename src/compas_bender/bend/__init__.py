@@ -1,3 +1,33 @@
+from .solver import BendSolver
+from .solver import CancellationToken
+from .solver import SolverSnapshot
+from .contact import SplineContact
+from .sensitivity import Sensitivity
+from .inverse import InverseSolver
+from .continuation import Continuation
+from .continuation import EquilibriumPath
+from .dynamics import TransientSolver
+from .modal import ModalAnalysis
+from .modal import Modes
 from .bend_splines import bend_splines
+from .hashing import solve_hash
+from .cache import SolveCache
+from .service import SolveService
 
-__all__ = ["bend_splines"]
+__all__ = [
+    "BendSolver",
+    "CancellationToken",
+    "Continuation",
+    "EquilibriumPath",
+    "InverseSolver",
+    "ModalAnalysis",
+    "Modes",
+    "Sensitivity",
+    "SolveCache",
+    "SolverSnapshot",
+    "SolveService",
+    "SplineContact",
+    "TransientSolver",
+    "bend_splines",
+    "solve_hash",
+]
@@ -0,0 +1,213 @@
+import json
+import os
+
+from compas_bender.datastructures import BendNetwork
+
+from .solver import EDGE_RESULTS
+from .solver import NODE_RESULTS
+
+UNCACHEABLE = ("tmax", "cancelled")
+
+
+class SolveCache(object):
+    """
+    On-disk cache of solve results, keyed by the content hash of the solver inputs.
+
+    Every entry is an uncompressed NumPy archive with the node and edge results and the convergence history.
+    The least recently used entries are evicted when the total size of the cache exceeds the maximum size.
+    Multiple processes can share the same cache folder.
+
+    Parameters
+    ----------
+    path : str
+        The path to the folder of the cache.
+        The folder is created if it doesn't exist.
+    max_size : int, optional
+        The maximum total size of the cache, in bytes.
+
+    Examples
+    --------
+    >>> cache = SolveCache("cache", max_size=2**30)  # doctest: +SKIP
+    >>> bend_splines(network, config=config, cache=cache)  # doctest: +SKIP
+
+    See Also
+    --------
+    :func:`compas_bender.bend.solve_hash`
+
+    """
+
+    def __init__(self, path, max_size=2**30):
+        self.path = path
+        self.max_size = max_size
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key):
+        return os.path.exists(self._filepath(key))
+
+    def _filepath(self, key):
+        return os.path.join(self.path, key + ".npz")
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".npz"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    @property
+    def size(self):
+        """int : The total size of the cache, in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        """Remove all entries from the cache.
+
+        Returns
+        -------
+        None
+
+        """
+        for _, _, filepath in self._entries():
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        size = sum(size for _, size, _ in entries)
+        for _, entrysize, filepath in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                continue
+            size -= entrysize
+
+    # --------------------------------------------------------------------------
+    # Arrays
+    # --------------------------------------------------------------------------
+
+    def get(self, key):
+        """Get the results stored under a key.
+
+        Parameters
+        ----------
+        key : str
+            The content hash of the solver inputs.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, dict] | None
+            The node results, the edge results and the convergence history,
+            or None if the key is not in the cache.
+
+        """
+        from numpy import load
+
+        filepath = self._filepath(key)
+        try:
+            with load(filepath) as archive:
+                nodes = archive["nodes"]
+                edges = archive["edges"]
+                iterations = json.loads(bytes(archive["iterations"]).decode("utf-8"))
+        except (OSError, KeyError, ValueError):
+            return None
+        try:
+            os.utime(filepath, None)
+        except OSError:
+            pass
+        return nodes, edges, iterations
+
+    def put(self, key, nodes, edges, iterations):
+        """Store results under a key, and evict the least recently used entries if the cache is full.
+
+        Parameters
+        ----------
+        key : str
+            The content hash of the solver inputs.
+        nodes : numpy.ndarray
+            The node results.
+        edges : numpy.ndarray
+            The edge results.
+        iterations : dict
+            The convergence history.
+
+        Returns
+        -------
+        None
+
+        """
+        from numpy import frombuffer
+        from numpy import savez
+
+        filepath = self._filepath(key)
+        temp = "{}.{}.tmp".format(filepath, os.getpid())
+        with open(temp, "wb") as f:
+            savez(f, nodes=nodes, edges=edges, iterations=frombuffer(json.dumps(iterations).encode("utf-8"), "uint8"))
+        os.replace(temp, filepath)
+        self._evict()
+
+    # --------------------------------------------------------------------------
+    # Networks
+    # --------------------------------------------------------------------------
+
+    def load(self, key, network: BendNetwork):
+        """Write the results stored under a key to a network.
+
+        Parameters
+        ----------
+        key : str
+            The content hash of the solver inputs.
+        network : :class:`compas_bender.datastructures.BendNetwork`
+
+        Returns
+        -------
+        dict | None
+            The convergence history, or None if the key is not in the cache.
+
+        """
+        result = self.get(key)
+        if result is None:
+            return None
+        nodes, edges, iterations = result
+        network.nodes_attributes_array(NODE_RESULTS, nodes)
+        network.edges_attributes_array(EDGE_RESULTS, edges)
+        return iterations
+
+    def save(self, key, network: BendNetwork, iterations):
+        """Store the results of a solve under a key.
+
+        Results of solves that were cancelled or ran out of time are not stored,
+        because they depend on more than the inputs.
+
+        Parameters
+        ----------
+        key : str
+            The content hash of the solver inputs, computed before the solve.
+        network : :class:`compas_bender.datastructures.BendNetwork`
+            The network with the results of the solve.
+        iterations : dict
+            The convergence history.
+
+        Returns
+        -------
+        bool
+            True if the results were stored.
+
+        """
+        if iterations.get("status") in UNCACHEABLE:
+            return False
+        nodes = network.nodes_attributes_array(NODE_RESULTS)
+        edges = network.edges_attributes_array(EDGE_RESULTS)
+        self.put(key, nodes, edges, iterations)
+        return True
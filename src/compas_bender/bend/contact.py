@@ -0,0 +1,302 @@
+def _closest_points(p0, p1, q0, q1):
+    """Compute the parameters of the closest points of pairs of segments."""
+    from numpy import clip
+    from numpy import where
+
+    d1 = p1 - p0
+    d2 = q1 - q0
+    r = p0 - q0
+    a = (d1**2).sum(axis=1)
+    e = (d2**2).sum(axis=1)
+    b = (d1 * d2).sum(axis=1)
+    c = (d1 * r).sum(axis=1)
+    f = (d2 * r).sum(axis=1)
+    # segments of zero length are points, with a parameter of zero
+    # their terms (b, c or f) are zero as well, so the divisions by one leave them at zero
+    a1 = where(a == 0, 1.0, a)
+    e1 = where(e == 0, 1.0, e)
+    denom = a * e - b**2
+    # parallel segments use the start of the first segment
+    parallel = denom <= 1e-12 * a * e
+    s = where(parallel, 0.0, clip((b * f - c * e) / where(parallel, 1.0, denom), 0.0, 1.0))
+    # the closest point of the first segment to a second segment of zero length
+    s = where(e == 0, clip(-c / a1, 0.0, 1.0), s)
+    t = (b * s + f) / e1
+    below = t < 0
+    above = t > 1
+    s = where(below, clip(-c / a1, 0.0, 1.0), s)
+    s = where(above, clip((b - c) / a1, 0.0, 1.0), s)
+    t = clip(t, 0.0, 1.0)
+    return s, t
+
+
+class SplineContact(object):
+    """
+    Penalty contact between the segments of splines, with a spatial hash as broad phase.
+
+    The segments are hashed into a uniform grid by their midpoints,
+    with cells larger than the largest distance at which two segments can interact,
+    such that the candidate pairs of a segment are found in its own cell and the neighbouring ones.
+    The candidate pairs are computed with a margin (the skin), and are kept until a segment has moved further than
+    half the skin since it was hashed. Only the segments that have moved that far are hashed again,
+    and only their candidate pairs are recomputed, so the cost of an update is proportional to the number of
+    segments that have moved, plus the sort of the hash.
+
+    Parameters
+    ----------
+    segments : array-like
+        The indices of the start and end nodes of the segments, as an array of shape (number of segments, 2).
+    radii : array-like
+        The radii of the cross sections of the segments.
+        The contact distance of a pair of segments is the sum of their radii.
+    stiffness : float | array-like
+        The penalty stiffness, in N/m, for all segments or per segment.
+        The stiffness of a pair of segments is the smaller of their stiffnesses.
+    skin : float
+        The margin of the candidate pairs.
+    number_of_nodes : int
+        The number of nodes of the network.
+
+    Attributes
+    ----------
+    pairs : numpy.ndarray
+        The candidate pairs of segments, as an array of shape (number of pairs, 2).
+    contacts : int
+        The number of pairs in contact at the last evaluation of the forces.
+    rebuilds : int
+        The number of updates of the candidate pairs.
+    limits : numpy.ndarray
+        The largest displacements of the nodes for which the segments of the candidate pairs cannot pass
+        through each other, at the last evaluation of the forces.
+        The limits of nodes without candidate pairs are infinite.
+
+    Notes
+    -----
+    Pairs of segments that share a node are never in contact,
+    such that neighbouring segments of a spline, and segments of splines crossing at a node, are ignored.
+
+    Penalty forces alone cannot prevent segments from passing through each other
+    if they move further than the contact distance in a single step.
+    The limits of the displacements are 40% of the distance between the segments of the nearest candidate pair
+    (but at least 20% of its contact distance), such that two segments that are not in contact cannot cross.
+
+    Examples
+    --------
+    >>> contact = SplineContact(segments, radii, stiffness=1e6, skin=0.05, number_of_nodes=len(xyz))  # doctest: +SKIP
+    >>> contact.update(xyz)  # doctest: +SKIP
+    >>> forces, stiffness = contact.forces(xyz)  # doctest: +SKIP
+
+    """
+
+    def __init__(self, segments, radii, stiffness, skin, number_of_nodes):
+        from numpy import asarray
+        from numpy import float64
+        from numpy import full
+        from numpy import inf
+        from numpy import ones
+        from numpy import zeros
+
+        self.segments = asarray(segments, dtype=int).reshape((-1, 2))
+        self.radii = asarray(radii, dtype=float64)
+        self.stiffness = asarray(stiffness, dtype=float64) * ones(len(self.segments))
+        self.skin = skin
+        self.number_of_nodes = number_of_nodes
+        self.pairs = zeros((0, 2), dtype=int)
+        self.contacts = 0
+        self.rebuilds = 0
+        self.limits = full(number_of_nodes, inf)
+        self._a = None
+        self._b = None
+        self._cell = None
+        self._mid = None
+        self._reach = None
+        self._keys = None
+        self._order = None
+
+    def reset(self):
+        """Discard the hash, such that the next update hashes all segments again.
+
+        Returns
+        -------
+        None
+
+        """
+        self._a = None
+        self._b = None
+
+    def _cells(self, mid):
+        """Compute the integer coordinates of the cells of midpoints of segments."""
+        from numpy import floor
+
+        return floor((mid - self._origin) / self._cell).astype(int)
+
+    def _hash(self, cells):
+        """Compute the keys of integer coordinates of cells."""
+        return (cells[:, 0] * self._shape[1] + cells[:, 1]) * self._shape[2] + cells[:, 2]
+
+    def _query(self, segments):
+        """Find the candidate pairs of a selection of segments in the hash."""
+        from numpy import arange
+        from numpy import concatenate
+        from numpy import cumsum
+        from numpy import repeat
+        from numpy import searchsorted
+        from numpy import zeros
+
+        keys = self._hash(self._cells(self._mid[segments]))
+        pi = []
+        pj = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    neighbours = keys + (dx * self._shape[1] + dy) * self._shape[2] + dz
+                    lo = searchsorted(self._keys, neighbours, side="left")
+                    hi = searchsorted(self._keys, neighbours, side="right")
+                    counts = hi - lo
+                    total = counts.sum()
+                    if not total:
+                        continue
+                    offsets = arange(total) - repeat(cumsum(counts) - counts, counts)
+                    pi.append(repeat(segments, counts))
+                    pj.append(self._order[repeat(lo, counts) + offsets])
+        if not pi:
+            return self.pairs[:0]
+        pi = concatenate(pi)
+        pj = concatenate(pj)
+        # pairs of two selected segments are found twice
+        selected = zeros(len(self.segments), dtype=bool)
+        selected[segments] = True
+        keep = (pi < pj) | ~selected[pj]
+        keep &= ((self._mid[pi] - self._mid[pj]) ** 2).sum(axis=1) <= (self._reach[pi] + self._reach[pj]) ** 2
+        pi = pi[keep]
+        pj = pj[keep]
+        si = self.segments[pi]
+        sj = self.segments[pj]
+        shared = (si[:, :1] == sj).any(axis=1) | (si[:, 1:] == sj).any(axis=1)
+        return concatenate((pi[~shared, None], pj[~shared, None]), axis=1)
+
+    def update(self, xyz):
+        """Update the candidate pairs of the segments that have moved more than half the skin since they were hashed.
+
+        Parameters
+        ----------
+        xyz : numpy.ndarray
+            The coordinates of the nodes.
+
+        Returns
+        -------
+        bool
+            True if the candidate pairs were updated.
+
+        """
+        from numpy import arange
+        from numpy import argsort
+        from numpy import array
+        from numpy import concatenate
+        from numpy import floor
+
+        segments = self.segments
+        if not len(segments):
+            return False
+        a = xyz[segments[:, 0]]
+        b = xyz[segments[:, 1]]
+        full = self._a is None
+        if not full:
+            skin = (0.5 * self.skin) ** 2
+            changed = (((a - self._a) ** 2).sum(axis=1) > skin) | (((b - self._b) ** 2).sum(axis=1) > skin)
+            moved = changed.nonzero()[0]
+            if not len(moved):
+                return False
+            mid = 0.5 * (a[moved] + b[moved])
+            reach = 0.5 * ((b[moved] - a[moved]) ** 2).sum(axis=1) ** 0.5 + self.radii[moved] + 0.5 * self.skin
+            # the segments are hashed again from scratch if a moved segment no longer fits the grid
+            cells = self._cells(mid)
+            full = 2 * reach.max() > self._cell or (cells < 1).any() or (cells > self._shape - 2).any()
+        if full:
+            moved = arange(len(segments))
+            self._mid = 0.5 * (a + b)
+            self._reach = 0.5 * ((b - a) ** 2).sum(axis=1) ** 0.5 + self.radii + 0.5 * self.skin
+            self._cell = 2 * self._reach.max()
+            # one cell of padding around the segments for the neighbours of the outer cells
+            self._origin = self._mid.min(axis=0) - self._cell
+            self._shape = array(floor((self._mid.max(axis=0) - self._origin) / self._cell) + 2, dtype=int)
+            self.pairs = self.pairs[:0]
+            self._a = a
+            self._b = b
+        else:
+            self._mid[moved] = mid
+            self._reach[moved] = reach
+            self._a[moved] = a[moved]
+            self._b[moved] = b[moved]
+            self.pairs = self.pairs[~changed[self.pairs].any(axis=1)]
+        keys = self._hash(self._cells(self._mid))
+        self._order = argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+        self.pairs = concatenate((self.pairs, self._query(moved)))
+        self.rebuilds += 1
+        return True
+
+    def forces(self, xyz):
+        """Compute the penalty forces of the pairs of segments in contact.
+
+        Parameters
+        ----------
+        xyz : numpy.ndarray
+            The coordinates of the nodes.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The contact forces at the nodes, as an array of shape (number of nodes, 3),
+            and the contact stiffness at the nodes, as an array of shape (number of nodes,).
+            The stiffness includes the pairs that are closer than the skin to being in contact,
+            such that it does not change abruptly when contacts open and close.
+
+        """
+        from numpy import bincount
+        from numpy import concatenate
+        from numpy import float64
+        from numpy import inf
+        from numpy import maximum
+        from numpy import minimum
+        from numpy import sqrt
+        from numpy import tile
+        from numpy import zeros
+
+        n = self.number_of_nodes
+        forces = zeros((n, 3), dtype=float64)
+        stiffness = zeros(n, dtype=float64)
+        self.update(xyz)
+        self.limits[:] = inf
+        if not len(self.pairs):
+            self.contacts = 0
+            return forces, stiffness
+        i = self.segments[self.pairs[:, 0]]
+        j = self.segments[self.pairs[:, 1]]
+        p0 = xyz[i[:, 0]]
+        p1 = xyz[i[:, 1]]
+        q0 = xyz[j[:, 0]]
+        q1 = xyz[j[:, 1]]
+        s, t = _closest_points(p0, p1, q0, q1)
+        d = (p0 + s[:, None] * (p1 - p0)) - (q0 + t[:, None] * (q1 - q0))
+        distance = sqrt((d**2).sum(axis=1))
+        reach = self.radii[self.pairs[:, 0]] + self.radii[self.pairs[:, 1]]
+        gap = reach - distance
+        k = minimum(self.stiffness[self.pairs[:, 0]], self.stiffness[self.pairs[:, 1]])
+        nodes = concatenate((i[:, 0], i[:, 1], j[:, 0], j[:, 1]))
+        minimum.at(self.limits, nodes, tile(0.4 * maximum(distance, 0.5 * reach), 4))
+        near = tile(gap > -self.skin, 4)
+        stiffness += bincount(nodes[near], tile(k, 4)[near], minlength=n)
+        # coincident closest points have no direction
+        active = (gap > 0) & (distance > 0)
+        self.contacts = int(active.sum())
+        if not self.contacts:
+            return forces, stiffness
+        f = (k[active] * gap[active] / distance[active])[:, None] * d[active]
+        s = s[active][:, None]
+        t = t[active][:, None]
+        nodes = concatenate((i[active, 0], i[active, 1], j[active, 0], j[active, 1]))
+        values = concatenate(((1 - s) * f, s * f, -(1 - t) * f, -t * f))
+        for axis in range(3):
+            forces[:, axis] = bincount(nodes, values[:, axis], minlength=n)
+        return forces, stiffness
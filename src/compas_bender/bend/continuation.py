@@ -0,0 +1,324 @@
+from time import perf_counter
+from typing import Dict
+from typing import List
+
+from compas_bender.datastructures import BendNetwork
+
+from .sensitivity import Sensitivity
+from .sensitivity import _assign
+from .sensitivity import _parameters
+from .sensitivity import _restore
+from .sensitivity import _save
+from .sensitivity import _values
+from .solver import BendSolver
+
+
+class EquilibriumPath(object):
+    """
+    The equilibrium states along a path of parameter values, as traced by :class:`Continuation`.
+
+    The states are stored in arrays that grow with the number of states,
+    with one row per state.
+
+    Parameters
+    ----------
+    number_of_nodes : int
+    number_of_edges : int
+    number_of_parameters : int
+
+    Attributes
+    ----------
+    t : numpy.ndarray
+        The path parameter of the states, between 0 (start) and 1 (end).
+    values : numpy.ndarray
+        The values of the design parameters, as an array of shape (number of states, number of parameters).
+    xyz : numpy.ndarray
+        The coordinates of the nodes, as an array of shape (number of states, number of nodes, 3).
+    f : numpy.ndarray
+        The axial forces in the edges, as an array of shape (number of states, number of edges).
+    iterations : numpy.ndarray
+        The number of iterations of the relaxation of every state.
+    status : str
+        ``"completed"`` if the end of the path was reached,
+        ``"min_step"`` if the step size dropped below the minimum,
+        or the status of the last solve otherwise.
+
+    """
+
+    def __init__(self, number_of_nodes, number_of_edges, number_of_parameters):
+        from numpy import zeros
+
+        self._count = 0
+        self._t = zeros(16)
+        self._values = zeros((16, number_of_parameters))
+        self._xyz = zeros((16, number_of_nodes, 3))
+        self._f = zeros((16, number_of_edges))
+        self._iterations = zeros(16, dtype=int)
+        self.status = None
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def t(self):
+        return self._t[: self._count]
+
+    @property
+    def values(self):
+        return self._values[: self._count]
+
+    @property
+    def xyz(self):
+        return self._xyz[: self._count]
+
+    @property
+    def f(self):
+        return self._f[: self._count]
+
+    @property
+    def iterations(self):
+        return self._iterations[: self._count]
+
+    def append(self, t, values, xyz, f, iterations):
+        """Append a state to the path.
+
+        Parameters
+        ----------
+        t : float
+            The path parameter of the state.
+        values : array-like
+            The values of the design parameters.
+        xyz : array-like
+            The coordinates of the nodes.
+        f : array-like
+            The axial forces in the edges.
+        iterations : int
+            The number of iterations of the relaxation.
+
+        Returns
+        -------
+        int
+            The index of the state.
+
+        """
+        from numpy import concatenate
+        from numpy import zeros_like
+
+        index = self._count
+        if index == len(self._t):
+            for name in ("_t", "_values", "_xyz", "_f", "_iterations"):
+                array = getattr(self, name)
+                setattr(self, name, concatenate((array, zeros_like(array))))
+        self._t[index] = t
+        self._values[index] = values
+        self._xyz[index] = xyz
+        self._f[index] = f
+        self._iterations[index] = iterations
+        self._count += 1
+        return index
+
+    def state(self, t):
+        """Interpolate the coordinates of the nodes and the axial forces at a value of the path parameter.
+
+        Parameters
+        ----------
+        t : float
+            The path parameter.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The coordinates of the nodes and the axial forces in the edges,
+            linearly interpolated between the two nearest states.
+
+        """
+        from numpy import clip
+        from numpy import searchsorted
+
+        ts = self.t
+        j = int(clip(searchsorted(ts, t), 1, len(ts) - 1))
+        i = j - 1
+        w = 0.0 if ts[j] == ts[i] else min(max((t - ts[i]) / (ts[j] - ts[i]), 0.0), 1.0)
+        return (1 - w) * self.xyz[i] + w * self.xyz[j], (1 - w) * self.f[i] + w * self.f[j]
+
+
+class Continuation(object):
+    """
+    Continuation of the equilibrium of a network of nodes and edges, combined with cables and splines,
+    along a linear path of parameter values.
+
+    Every step of the path is a warm-started solve of a single :class:`BendSolver`,
+    starting from the equilibrium of the previous step.
+    The size of the steps is adapted to the difficulty of the relaxation,
+    by comparing the displacements of every step with the first-order prediction of :meth:`Sensitivity.tangent`.
+    Steps for which the relaxation does not converge, or does not follow the prediction, are rejected and halved.
+    Steps that follow the prediction closely are followed by larger ones.
+
+    Parameters
+    ----------
+    network : :class:`BendNetwork`
+    parameters : list[tuple[str, object]]
+        The parameters that change along the path. See :class:`Sensitivity` for the supported parameters.
+    end : list[float]
+        The values of the parameters at the end of the path.
+    start : list[float], optional
+        The values of the parameters at the start of the path.
+        Default is the current values.
+    cables : list[:class:`Cable` | dict], optional
+        Default is the cables of the network.
+    splines : list[:class:`Spline` | dict], optional
+        Default is the splines of the network.
+    config : dict, optional
+        The configuration of the solves. See :meth:`BendSolver.solve`.
+
+    Attributes
+    ----------
+    solver : :class:`BendSolver`
+        The solver of the steps.
+    parameters : list[tuple[str, int | tuple[int, int]]]
+        The design parameters, with the splines and cables replaced by their indices.
+
+    Examples
+    --------
+    Shorten the ties of a network from their current length to 97% in (at least) 100 steps.
+
+    >>> ties = list(network.edges_where(is_tie=True))  # doctest: +SKIP
+    >>> lengths = [network.edge_length(edge) for edge in ties]  # doctest: +SKIP
+    >>> continuation = Continuation(
+    ...     network,
+    ...     [("lpre", edge) for edge in ties],
+    ...     end=[0.97 * length for length in lengths],
+    ...     start=lengths,
+    ... )  # doctest: +SKIP
+    >>> path = continuation.trace(max_step=0.01)  # doctest: +SKIP
+    >>> path.xyz[:, node, 2]  # doctest: +SKIP
+
+    """
+
+    def __init__(
+        self,
+        network: BendNetwork,
+        parameters,
+        end,
+        start=None,
+        cables: List[Dict] = None,
+        splines: List[Dict] = None,
+        config=None,
+    ):
+        from numpy import asarray
+
+        self.network = network
+        self.solver = BendSolver(network, cables, splines, config)
+        self.parameters = _parameters(self.solver, parameters)
+        self.start = _values(self.solver, self.parameters) if start is None else asarray(start, dtype=float)
+        self.end = asarray(end, dtype=float)
+        if self.start.shape != (len(self.parameters),) or self.end.shape != (len(self.parameters),):
+            raise ValueError("The number of values does not match the number of parameters.")
+        self.solves = 0
+        self.rejected = 0
+        self.time = 0.0
+
+    def values(self, t):
+        """Compute the values of the parameters at a value of the path parameter.
+
+        Parameters
+        ----------
+        t : float
+            The path parameter, between 0 (start) and 1 (end).
+
+        Returns
+        -------
+        numpy.ndarray
+
+        """
+        return self.start + t * (self.end - self.start)
+
+    def _solve(self, t):
+        _assign(self.solver, self.parameters, self.values(t))
+        iterations = self.solver.solve()
+        self.solves += 1
+        return iterations
+
+    def _append(self, path, t, iterations, store):
+        solver = self.solver
+        count = len(iterations["membrane"]) * solver.config.get("kdiv", 100)
+        index = path.append(t, self.values(t), solver.xyz, solver.f[:, 0], count)
+        if store is not None:
+            store.append(index, self.network, iterations)
+
+    def trace(self, step=0.05, min_step=1e-3, max_step=0.25, tol=0.25, atol=None, store=None):
+        """Trace the equilibrium path from the start to the end values of the parameters.
+
+        Parameters
+        ----------
+        step : float, optional
+            The initial step size, as a fraction of the path.
+        min_step : float, optional
+            The minimum step size.
+            The tracing stops if a step of this size is rejected.
+        max_step : float, optional
+            The maximum step size.
+            Use ``1 / n`` to store at least ``n`` states along the path.
+        tol : float, optional
+            The maximum relative difference between the displacements of a step
+            and their first-order prediction.
+        atol : float, optional
+            The maximum absolute difference between the displacements of a step
+            and their first-order prediction, for steps with small displacements.
+            Default is the displacement of the nodes during one convergence check of a converged relaxation,
+            i.e. ``config["kdiv"] * config["tol3"]``.
+        store : :class:`compas_bender.files.ResultStore`, optional
+            A store for the full results of the states of the path.
+            The states are appended with their index in the path as identifier.
+
+        Returns
+        -------
+        :class:`EquilibriumPath`
+
+        """
+        from numpy.linalg import norm
+
+        solver = self.solver
+        if atol is None:
+            atol = solver.config.get("kdiv", 100) * solver.config.get("tol3", 1e-6)
+        start = perf_counter()
+        self.solves = 0
+        self.rejected = 0
+        path = EquilibriumPath(solver.num_v, solver.num_e, len(self.parameters))
+
+        iterations = self._solve(0.0)
+        if not iterations["converged"]:
+            path.status = iterations["status"]
+            self.time = perf_counter() - start
+            return path
+        self._append(path, 0.0, iterations, store)
+
+        t = 0.0
+        step = min(max(step, min_step), max_step)
+        while t < 1.0:
+            h = min(step, 1.0 - t)
+            sensitivity = Sensitivity(solver, self.parameters)
+            predicted = sensitivity.tangent(self.values(t + h) - self.values(t))
+            state = _save(solver)
+            iterations = self._solve(t + h)
+            error = float("inf")
+            if iterations["converged"]:
+                error = norm(solver.xyz - state["xyz"] - predicted) / max(tol * norm(predicted), atol)
+            if error <= 1.0:
+                t = 1.0 if h == 1.0 - t else t + h
+                self._append(path, t, iterations, store)
+                if error <= 0.5:
+                    step = min(1.5 * step, max_step)
+                continue
+            # reject the step and restore the previous equilibrium
+            self.rejected += 1
+            _restore(solver, self.parameters, self.values(t), state)
+            if h <= min_step:
+                path.status = "min_step" if iterations["converged"] else iterations["status"]
+                solver.write()
+                break
+            step = max(0.5 * h, min_step)
+        else:
+            path.status = "completed"
+        self.time = perf_counter() - start
+        return path
@@ -0,0 +1,315 @@
+from time import perf_counter
+from typing import Dict
+from typing import List
+
+from compas_bender.datastructures import BendNetwork
+
+from .solver import BendSolver
+
+
+def _lumped_masses(solver, density, linear_density=0.0, masses=None):
+    """Lump half of the mass of every edge of a solver at each of its nodes, and add the masses of the nodes."""
+    from numpy import float64
+    from numpy import zeros
+
+    linit = solver.linit.copy()
+    linit[linit == 0] = solver.l[linit == 0]
+    edges = (density * solver.A + linear_density) * linit
+    mass = 0.5 * abs(solver.Ct).dot(edges)
+    nodes = zeros((solver.num_v, 1), dtype=float64)
+    for node, value in (masses or {}).items():
+        nodes[solver.node_index[node], 0] += value
+    return mass + nodes
+
+
+def _rotary_inertia(solver, density):
+    """Compute the rotary inertia of the segments of the rods about their axes."""
+    from numpy import float64
+    from numpy import zeros
+
+    inertia = zeros(len(solver.theta), dtype=float64)
+    for data in solver._spline_data:
+        if data["rod"]:
+            linit = solver.linit[data["ei"], 0]
+            linit[linit == 0] = solver.l[data["ei"], 0][linit == 0]
+            inertia[data["segments"]] = density * data["Ip"] * linit
+    return inertia
+
+
+class TransientSolver(object):
+    """
+    Simulation in physical time of the motion of a network of nodes and edges, combined with cables and splines,
+    for example for vibrations and snap-through of bending-active structures under time-varying loads.
+
+    The internal forces are assembled as in the relaxation of :class:`BendSolver`,
+    without scaling of the shear forces of the splines,
+    but the nodes have the lumped masses of the edges, computed from the density and the area of their sections,
+    and the equations of motion are integrated with a fixed time step.
+    The integration scheme is the explicit central difference (leapfrog) scheme,
+    with damping proportional to the masses.
+    The angles of twist of the segments of splines with the rod model are integrated with the same scheme,
+    with the rotary inertia of their sections.
+
+    Parameters
+    ----------
+    network : :class:`BendNetwork`
+    cables : list[:class:`Cable` | dict], optional
+        Default is the cables of the network.
+    splines : list[:class:`Spline` | dict], optional
+        Default is the splines of the network.
+    density : float, optional
+        The density of the material of the edges with a section, in kg/m3.
+    linear_density : float, optional
+        An additional mass per unit of length of all edges, in kg/m,
+        for example for cables and ties without a section.
+    masses : dict[int, float], optional
+        Additional masses of nodes, in kg.
+    damping : float, optional
+        The damping coefficient, in 1/s.
+        The damping force of a node is the product of its mass, its velocity and this coefficient.
+    loads : callable, optional
+        A function of the time, returning the loads of the nodes as an array of shape (number of nodes, 3).
+        Default is the constant loads of the network.
+    config : dict, optional
+        The configuration of the units of the sections and of the contact between splines.
+        See :class:`BendSolver` and :meth:`BendSolver.solve`.
+
+    Attributes
+    ----------
+    solver : :class:`BendSolver`
+        The solver of which the force assembly and the state are used.
+    mass : numpy.ndarray
+        The lumped masses of the nodes, as an array of shape (number of nodes, 1).
+    v : numpy.ndarray
+        The velocities of the nodes, at the middle of the last time step.
+    vtheta : numpy.ndarray
+        The angular velocities of the twist of the segments of the rods, at the middle of the last time step.
+    t : float
+        The current time.
+    k : int
+        The number of completed time steps.
+
+    Raises
+    ------
+    ValueError
+        If a free node has no mass, or a rod has no density.
+
+    Notes
+    -----
+    The scheme is only stable for time steps below the critical time step (see :meth:`critical_timestep`).
+    The critical time step decreases when the forces in the edges increase, or the edges of the splines get shorter,
+    so the time step of a simulation with large deformations should stay well below the initial estimate.
+
+    Prescribed lengths (``lpre``) are enforced as in the relaxation,
+    by updating the force density of the edge with the force of the previous step.
+
+    Examples
+    --------
+    >>> def loads(t):  # doctest: +SKIP
+    ...     p = p0.copy()
+    ...     p[node, 2] -= 100.0 * sin(2 * pi * 1.5 * t)
+    ...     return p
+    >>> transient = TransientSolver(network, density=7850.0, damping=0.05, loads=loads)  # doctest: +SKIP
+    >>> with ResultStore.create("trajectory", network, capacity=1000) as store:  # doctest: +SKIP
+    ...     result = transient.run(1000000, every=1000, store=store)
+
+    """
+
+    def __init__(
+        self,
+        network: BendNetwork,
+        cables: List[Dict] = None,
+        splines: List[Dict] = None,
+        density=7850.0,
+        linear_density=0.0,
+        masses=None,
+        damping=0.0,
+        loads=None,
+        config=None,
+    ):
+        from numpy import errstate
+        from numpy import float64
+        from numpy import zeros
+
+        self.network = network
+        self.solver = solver = BendSolver(network, cables, splines, config)
+        solver.alpha = 1
+        self.density = density
+        self.linear_density = linear_density
+        self.masses = masses or {}
+        self.damping = damping
+        self.loads = loads
+        self.mass = _lumped_masses(solver, density, linear_density, self.masses)
+        with errstate(all="ignore"):
+            self._inverse_mass = 1.0 / self.mass
+        self._inverse_mass[solver.fixed] = 0.0
+        if not (self.mass[solver.free] > 0).all():
+            raise ValueError("All free nodes should have a mass.")
+        self.inertia = _rotary_inertia(solver, density)
+        if solver._rods is not None and not (self.inertia[solver._rods["segments"]] > 0).all():
+            raise ValueError("All rods should have a density.")
+        self.v = zeros((solver.num_v, 3), dtype=float64)
+        self.vtheta = zeros(len(solver.theta), dtype=float64)
+        self.t = 0.0
+        self.k = 0
+
+    def critical_timestep(self):
+        """Estimate the critical time step of the integration, for the current state.
+
+        The estimate is based on an upper bound of the highest natural frequency
+        of the linearised system (Gershgorin's theorem),
+        with the axial stiffness and the force densities of the edges,
+        the bending stiffness of the splines, the torsional stiffness of the rods,
+        and the stiffness of the current contacts between splines.
+
+        Returns
+        -------
+        float
+
+        """
+        from numpy import errstate
+        from numpy import sqrt
+
+        solver = self.solver
+        with errstate(all="ignore"):
+            # the force densities of the current state, as assembled by the integration
+            self._forces(solver.p if self.loads is None else self.loads(self.t))
+            axial = solver.EA / solver.linit
+            axial[solver.linit == 0] = 0
+            stiffness = 2 * (abs(solver.q) + axial) + 8 * solver.EI / solver.l**3
+            stiffness = solver.Ct2.dot(stiffness) + 2 * solver._contact_stiffness[:, None]
+            omega = sqrt((stiffness * self._inverse_mass).max())
+            if solver._rods is not None:
+                free = solver._rods["free"]
+                omega = max(omega, sqrt((2 * solver._twist_stiffness[free] / self.inertia[free]).max()))
+        return 2.0 / omega
+
+    def energy(self):
+        """Compute the kinetic energy of the nodes, and of the twist of the rods.
+
+        Returns
+        -------
+        float
+
+        """
+        return 0.5 * float((self.mass * self.v**2).sum() + (self.inertia * self.vtheta**2).sum())
+
+    def _forces(self, p):
+        """Assemble the residual forces of the current coordinates."""
+        from numpy import sqrt
+
+        solver = self.solver
+        uv = solver.C.dot(solver.xyz)
+        solver.l = l = sqrt((uv**2).sum(axis=1))[:, None]  # noqa: E741
+        q_fpre, q_lpre, q_EA = solver.fdensity()
+        solver.q = q = solver.qpre + q_fpre + q_lpre + q_EA
+        solver.f = q * l
+        solver.shear()
+        solver._contact()
+        solver.r = p + solver.s + solver.c - solver.Ct.dot(q * uv)
+        return solver.r
+
+    def run(self, steps, dt=None, every=100, store=None, token=None):
+        """Simulate a number of time steps, starting from the current state and time.
+
+        The state at the end of the simulation is written to the network.
+
+        Parameters
+        ----------
+        steps : int
+            The number of time steps.
+        dt : float, optional
+            The time step, in s.
+            Default is half the critical time step of the initial state.
+        every : int, optional
+            The number of time steps between the frames of the trajectory.
+        store : :class:`compas_bender.files.ResultStore`, optional
+            A store for the frames of the trajectory.
+            The frames are appended with the number of the time step as identifier,
+            and with the residual forces (``r``) being the unbalanced forces that accelerate the nodes.
+        token : :class:`CancellationToken`, optional
+            A token for cancelling the simulation from another thread or process,
+            checked at every frame.
+
+        Returns
+        -------
+        dict
+            The result of the simulation, with the following items.
+
+            * ``"status"``: ``"completed"``, ``"diverged"`` (the coordinates are no longer finite),
+              or ``"cancelled"``.
+            * ``"dt"``: The time step.
+            * ``"steps"``: The number of completed time steps.
+            * ``"frames"``: The numbers of the time steps of the frames.
+            * ``"t"``: The times of the frames.
+            * ``"energy"``: The kinetic energy at the frames.
+            * ``"time"``: The wall-clock time of the simulation.
+
+        """
+        from numpy import errstate
+        from numpy import isfinite
+
+        start = perf_counter()
+        solver = self.solver
+        if dt is None:
+            dt = 0.5 * self.critical_timestep()
+        every = max(1, int(every))
+        ca = (1 - 0.5 * self.damping * dt) / (1 + 0.5 * self.damping * dt)
+        cb = dt / (1 + 0.5 * self.damping * dt)
+        scale = cb * self._inverse_mass
+        loads = self.loads
+        p = solver.p
+        xyz = solver.xyz
+        v = self.v
+        twist = None if solver._rods is None else solver._rods["free"]
+        if twist is not None:
+            twist_scale = cb / self.inertia[twist]
+        status = "completed"
+        frames = []
+        times = []
+        energy = []
+        k0 = self.k
+        with errstate(all="ignore"):
+            for i in range(int(steps)):
+                if loads is not None:
+                    p = loads(self.t)
+                r = self._forces(p)
+                v *= ca
+                v += scale * r
+                xyz += dt * v
+                if twist is not None:
+                    self.vtheta[twist] = ca * self.vtheta[twist] + twist_scale * solver._torques[twist]
+                    solver.theta[twist] += dt * self.vtheta[twist]
+                self.k += 1
+                self.t += dt
+                if self.k % every == 0 or i == steps - 1:
+                    if not isfinite(xyz).all():
+                        status = "diverged"
+                        break
+                    frames.append(self.k)
+                    times.append(self.t)
+                    energy.append(self.energy())
+                    if store is not None:
+                        store.append_arrays(
+                            self.k,
+                            xyz=xyz,
+                            r=r,
+                            s=solver.s,
+                            m=solver.m,
+                            q=solver.q[:, 0],
+                            f=solver.f[:, 0],
+                            l=solver.l[:, 0],
+                        )
+                    if token is not None and token.cancelled:
+                        status = "cancelled"
+                        break
+        solver.write()
+        return {
+            "status": status,
+            "dt": dt,
+            "steps": self.k - k0,
+            "frames": frames,
+            "t": times,
+            "energy": energy,
+            "time": perf_counter() - start,
+        }
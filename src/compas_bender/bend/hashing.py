@@ -0,0 +1,71 @@
+import hashlib
+import json
+
+from compas_bender.datastructures import BendNetwork
+
+NODE_INPUTS = ["x", "y", "z", "px", "py", "pz"]
+EDGE_INPUTS = ["qpre", "fpre", "lpre", "linit", "E", "radius", "thickness", "width", "height"]
+UNITS = {"unit.E": 1e9, "unit.radius": 1e-3, "unit.thickness": 1e-3}
+
+# the version of the hashed inputs, salted into every hash
+# bump it whenever the hashed inputs or their encoding change,
+# such that cached results of older versions are no longer found instead of being found under the wrong inputs
+# 2: added the edge attributes width and height
+HASH_VERSION = 2
+
+
+def _element(element):
+    if isinstance(element, dict):
+        return element
+    return element.__data__
+
+
+def solve_hash(network: BendNetwork, cables=None, splines=None, config=None):
+    """Compute a content hash of the inputs of a solve.
+
+    Two solves with the same hash produce the same results.
+    The hash covers the topology of the network, the coordinates, loads and anchors of the nodes,
+    the prestress, material and section properties of the edges,
+    the definitions of the cables and splines,
+    and the configuration of the solver, with the unit scaling factors resolved to their defaults.
+    The hash is salted with :attr:`HASH_VERSION`, such that it changes whenever the hashed inputs change.
+
+    Parameters
+    ----------
+    network : :class:`compas_bender.datastructures.BendNetwork`
+    cables : list[:class:`compas_bender.datastructures.Cable` | dict], optional
+        Default is the cables of the network.
+    splines : list[:class:`compas_bender.datastructures.Spline` | dict], optional
+        Default is the splines of the network.
+    config : dict, optional
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-256 digest of the inputs.
+
+    """
+    from numpy import ascontiguousarray
+    from numpy import float64
+    from numpy import int64
+
+    cables = network.cables if cables is None else cables
+    splines = network.splines if splines is None else splines
+    config = dict(UNITS, **(config or {}))
+
+    anchors = [network.node_attribute(node, "is_anchor") for node in network.nodes()]
+
+    h = hashlib.sha256()
+    h.update("compas_bender.solve_hash.v{}".format(HASH_VERSION).encode("utf-8"))
+    h.update(ascontiguousarray(network.edges_array(), dtype=int64).tobytes())
+    h.update(ascontiguousarray(network.nodes_attributes_array(NODE_INPUTS), dtype=float64).tobytes())
+    h.update(ascontiguousarray(network.edges_attributes_array(EDGE_INPUTS), dtype=float64).tobytes())
+    h.update(bytes(bytearray(bool(anchor) for anchor in anchors)))
+
+    elements = {
+        "cables": [_element(cable) for cable in cables],
+        "splines": [_element(spline) for spline in splines],
+        "config": config,
+    }
+    h.update(json.dumps(elements, sort_keys=True, default=repr).encode("utf-8"))
+    return h.hexdigest()
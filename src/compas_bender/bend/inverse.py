@@ -0,0 +1,326 @@
+from time import perf_counter
+from typing import Dict
+from typing import List
+
+from compas_bender.datastructures import BendNetwork
+
+from .sensitivity import Sensitivity
+from .sensitivity import _assign
+from .sensitivity import _parameters
+from .sensitivity import _restore
+from .sensitivity import _save
+from .sensitivity import _values
+from .solver import BendSolver
+
+
+class _Stop(Exception):
+    """Raised to stop the outer optimiser, with the status of the optimisation."""
+
+
+class InverseSolver(object):
+    """
+    Gradient-based inverse form finding of a network of nodes and edges, combined with cables and splines.
+
+    The solver searches the values of design parameters, such as the prescribed lengths of ties
+    and the force densities of cables, for which the equilibrium shape meets target coordinates and clearances.
+    Every evaluation of the objective is a warm-started solve of a single :class:`BendSolver`,
+    starting from the previous equilibrium and reusing its compiled connectivity,
+    and the derivatives of the residuals are computed with one adjoint solve per residual (see :class:`Sensitivity`).
+    The outer optimiser is a trust region least squares method, with the bounds of the parameters.
+
+    Parameters
+    ----------
+    network : :class:`BendNetwork`
+    parameters : list[tuple[str, object]]
+        The design parameters. See :class:`Sensitivity` for the supported parameters.
+    targets : dict[int, list[float | None]], optional
+        Target coordinates of nodes.
+        Coordinates that are None are not targeted.
+    clearances : dict[int, float], optional
+        Minimum heights of nodes.
+    bounds : list[tuple[float | None, float | None]], optional
+        The lower and upper bounds of the parameters.
+        Bounds that are None are not enforced.
+    cables : list[:class:`Cable` | dict], optional
+        Default is the cables of the network.
+    splines : list[:class:`Spline` | dict], optional
+        Default is the splines of the network.
+    config : dict, optional
+        The configuration of the inner solves. See :meth:`BendSolver.solve`.
+    alpha : int, optional
+        The shear scaling factor at the start of every warm-started inner solve.
+
+    Attributes
+    ----------
+    solver : :class:`BendSolver`
+        The solver of the inner solves.
+    parameters : list[tuple[str, int | tuple[int, int]]]
+        The design parameters, with the splines and cables replaced by their indices.
+
+    Notes
+    -----
+    The objective is half the sum of the squared deviations from the target coordinates,
+    plus half the sum of the squared violations of the clearances.
+    The inner solves restart the reduction of the shear scaling factor from ``alpha``,
+    instead of from ``config["alpha"]`` as in a cold solve.
+    Without the scaling, a warm-started relaxation stalls long before it reaches the equilibrium
+    of the new parameters, and the objective would depend on the history of the optimisation.
+
+    The gradients are computed for the exact equilibrium, and are only as accurate as the inner solves,
+    so tight tolerances in ``config`` make for fewer and more reliable outer iterations.
+
+    Examples
+    --------
+    >>> ties = list(network.edges_where(is_tie=True))  # doctest: +SKIP
+    >>> inverse = InverseSolver(
+    ...     network, [("lpre", edge) for edge in ties], targets={node: [None, None, 3.0]}
+    ... )  # doctest: +SKIP
+    >>> result = inverse.solve()  # doctest: +SKIP
+    >>> result["converged"], result["solves"], result["time"]  # doctest: +SKIP
+
+    """
+
+    def __init__(
+        self,
+        network: BendNetwork,
+        parameters,
+        targets=None,
+        clearances=None,
+        bounds=None,
+        cables: List[Dict] = None,
+        splines: List[Dict] = None,
+        config=None,
+        alpha=16,
+    ):
+        from numpy import array
+        from numpy import float64
+        from numpy import isnan
+
+        self.network = network
+        self.solver = BendSolver(network, cables, splines, config)
+        self.parameters = _parameters(self.solver, parameters)
+        self.alpha = alpha
+        if bounds is not None and len(bounds) != len(self.parameters):
+            raise ValueError("The number of bounds does not match the number of parameters.")
+        self.bounds = bounds
+        node_index = self.solver.node_index
+        targets = targets or {}
+        clearances = clearances or {}
+        self._target_nodes = [node_index[node] for node in targets]
+        self._targets = array(
+            [[float("nan") if value is None else value for value in xyz] for xyz in targets.values()], dtype=float64
+        ).reshape((-1, 3))
+        self._targeted = ~isnan(self._targets)
+        self._clearance_nodes = [node_index[node] for node in clearances]
+        self._clearances = array(list(clearances.values()), dtype=float64)
+        self._reset()
+
+    def _reset(self):
+        self._x = None
+        self._f = None
+        self._g = None
+        self._accepted = None
+        self._tol = 0.0
+        self._maxsolves = None
+        self.solves = 0
+        self.history = []
+        self.times = {"solve": 0.0, "gradient": 0.0}
+
+    # --------------------------------------------------------------------------
+    # objective
+    # --------------------------------------------------------------------------
+
+    def residuals(self):
+        """Compute the deviations from the targets and the violations of the clearances,
+        for the current state of the solver.
+
+        Returns
+        -------
+        numpy.ndarray
+            The deviations of the targeted coordinates, followed by the violations of the clearances.
+
+        """
+        from numpy import concatenate
+
+        xyz = self.solver.xyz
+        deviations = (xyz[self._target_nodes] - self._targets)[self._targeted]
+        violations = (self._clearances - xyz[self._clearance_nodes, 2]).clip(min=0)
+        return concatenate((deviations, violations))
+
+    def objective(self):
+        """Compute the objective for the current state of the solver.
+
+        Returns
+        -------
+        float
+            Half the sum of the squared residuals.
+
+        """
+        return 0.5 * (self.residuals() ** 2).sum()
+
+    def _solve(self, x):
+        """Solve for the given parameter values, warm-started from the previous equilibrium."""
+        solver = self.solver
+        start = perf_counter()
+        _assign(solver, self.parameters, x)
+        if solver.iterations is not None:
+            solver.alpha = self.alpha
+        iterations = solver.solve()
+        self.solves += 1
+        self.times["solve"] += perf_counter() - start
+        return iterations
+
+    def _evaluate(self, x):
+        """Solve for the given parameter values, and compute the residuals."""
+        from numpy import array_equal
+
+        if self._x is not None and array_equal(x, self._x):
+            return self._f
+        if self._maxsolves is not None and self.solves >= self._maxsolves:
+            raise _Stop("maxsolves")
+        iterations = self._solve(x)
+        if not iterations["converged"]:
+            self._x = None
+            raise _Stop(iterations["status"])
+        self._x = x.copy()
+        self._f = self.residuals()
+        self._g = None
+        self.history.append(0.5 * (self._f**2).sum())
+        if not len(self._f) or abs(self._f).max() <= self._tol:
+            raise _Stop("converged")
+        return self._f
+
+    def _jacobian(self, x):
+        """Compute the derivatives of the residuals with respect to the parameters, with one adjoint solve per row."""
+        from numpy import zeros
+
+        self._evaluate(x)
+        if self._g is not None:
+            return self._g
+        # the optimiser only computes the derivatives at the values of accepted steps,
+        # to which the solver returns at the end if a later step is rejected
+        self._accepted = x.copy(), _save(self.solver)
+        start = perf_counter()
+        n = self.solver.num_v
+        J = zeros((len(self._f), len(self.parameters)))
+        sensitivity = Sensitivity(self.solver, self.parameters)
+        row = 0
+        for node, targeted in zip(self._target_nodes, self._targeted):
+            for axis in targeted.nonzero()[0]:
+                weights = zeros((n, 3))
+                weights[node, axis] = 1.0
+                J[row] = sensitivity.gradient(xyz=weights)
+                row += 1
+        for node, violation in zip(self._clearance_nodes, self._f[row:]):
+            if violation > 0:
+                weights = zeros((n, 3))
+                weights[node, 2] = -1.0
+                J[row] = sensitivity.gradient(xyz=weights)
+            row += 1
+        self.times["gradient"] += perf_counter() - start
+        self._g = J
+        return J
+
+    # --------------------------------------------------------------------------
+    # solve
+    # --------------------------------------------------------------------------
+
+    def solve(self, tol=1e-3, maxsolves=50, ftol=1e-6, xtol=1e-6):
+        """Optimise the parameters with a trust region least squares method.
+
+        The network and the inputs of the solver are updated with the optimised values of the parameters
+        and the corresponding equilibrium,
+        or are returned to their initial state if no inner solve converged.
+
+        Parameters
+        ----------
+        tol : float, optional
+            The tolerance for the deviations from the targets and the violations of the clearances.
+        maxsolves : int, optional
+            The maximum number of inner solves.
+            The solver returns to the equilibrium of the final values without an additional solve.
+        ftol : float, optional
+            The relative tolerance for the change of the objective, if the targets cannot be met.
+        xtol : float, optional
+            The relative tolerance for the change of the parameters, if the targets cannot be met.
+
+        Returns
+        -------
+        dict
+            The result of the optimisation, with the following items.
+
+            * ``"status"``: ``"converged"`` (all residuals are within the tolerance),
+              ``"optimal"`` (the targets cannot be met and the objective is minimal),
+              ``"maxsolves"``, ``"failed"`` (the outer optimiser stopped),
+              or the status of an inner solve that did not converge.
+            * ``"converged"``: True if the status is ``"converged"``.
+            * ``"objective"``: The final value of the objective.
+            * ``"values"``: The final values of the parameters.
+            * ``"solves"``: The number of inner solves.
+            * ``"history"``: The value of the objective after every converged inner solve.
+            * ``"time"``, ``"time_solve"``, ``"time_gradient"``: The total time, and the time spent
+              in the inner solves and in the computation of the gradients.
+
+        """
+        from numpy import array
+        from numpy import array_equal
+        from numpy import inf
+        from scipy.optimize import least_squares
+
+        start = perf_counter()
+        self._reset()
+        self._tol = tol
+        self._maxsolves = maxsolves
+        initial = _save(self.solver)
+        x0 = _values(self.solver, self.parameters)
+        if self.bounds is None:
+            bounds = (-inf, inf)
+        else:
+            lower = array([-inf if lo is None else lo for lo, hi in self.bounds])
+            upper = array([inf if hi is None else hi for lo, hi in self.bounds])
+            bounds = (lower, upper)
+            x0 = x0.clip(lower, upper)
+        try:
+            result = least_squares(
+                self._evaluate,
+                x0,
+                jac=self._jacobian,
+                bounds=bounds,
+                method="trf",
+                x_scale="jac",
+                ftol=ftol,
+                xtol=xtol,
+                gtol=None,
+                max_nfev=maxsolves,
+            )
+        except _Stop as stop:
+            status = stop.args[0]
+            if status == "converged":
+                x = self._x
+            else:
+                x = x0 if self._accepted is None else self._accepted[0]
+        else:
+            x = result.x
+            if result.status > 0:
+                status = "optimal"
+            elif result.status == 0:
+                status = "maxsolves"
+            else:
+                status = "failed"
+        # the last solve is not necessarily the solve of the final values,
+        # which are those of the last accepted step, or the initial values if no step was accepted
+        if self._x is None or not array_equal(x, self._x):
+            state = initial if self._accepted is None else self._accepted[1]
+            _restore(self.solver, self.parameters, x, state)
+            self.solver.write()
+        return {
+            "status": status,
+            "converged": status == "converged",
+            "objective": self.objective(),
+            "values": x.tolist(),
+            "solves": self.solves,
+            "history": self.history,
+            "time": perf_counter() - start,
+            "time_solve": self.times["solve"],
+            "time_gradient": self.times["gradient"],
+        }
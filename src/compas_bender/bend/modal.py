@@ -0,0 +1,285 @@
+from .dynamics import _lumped_masses
+from .sensitivity import Sensitivity
+from .solver import BendSolver
+
+
+class Modes(object):
+    """
+    The lowest eigenpairs of a solved configuration, as computed by :class:`ModalAnalysis`.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The eigenvalues, in ascending order.
+    shapes : numpy.ndarray
+        The mode shapes, as an array of shape (number of modes, number of nodes, 3).
+    stable : bool
+        True if all eigenvalues of the tangent stiffness are positive.
+    frequencies : numpy.ndarray, optional
+        The natural frequencies, in Hz.
+
+    Attributes
+    ----------
+    values : numpy.ndarray
+        The eigenvalues, in ascending order.
+        For a stability analysis, the eigenvalues of the tangent stiffness, in N/m.
+        For a frequency analysis, the squares of the angular frequencies, in 1/s2.
+    shapes : numpy.ndarray
+        The mode shapes, as an array of single precision floats of shape (number of modes, number of nodes, 3),
+        scaled to a largest displacement of a node of 1, with zero displacements at the anchors.
+    stable : bool
+        True if all eigenvalues of the tangent stiffness are positive.
+    frequencies : numpy.ndarray | None
+        The natural frequencies, in Hz, or None for a stability analysis.
+        The frequencies of modes with a negative eigenvalue are NaN.
+
+    """
+
+    def __init__(self, values, shapes, stable, frequencies=None):
+        self.values = values
+        self.shapes = shapes
+        self.stable = stable
+        self.frequencies = frequencies
+
+    def __len__(self):
+        return len(self.values)
+
+    def displaced(self, xyz, index, scale=1.0):
+        """Compute the coordinates of the nodes displaced along a mode shape.
+
+        Parameters
+        ----------
+        xyz : array-like
+            The coordinates of the nodes.
+        index : int
+            The index of the mode.
+        scale : float, optional
+            The largest displacement of a node.
+
+        Returns
+        -------
+        numpy.ndarray
+
+        """
+        from numpy import asarray
+
+        return asarray(xyz) + scale * self.shapes[index]
+
+
+class ModalAnalysis(object):
+    """
+    Stability and frequency analysis of the equilibrium of a solved :class:`BendSolver`.
+
+    The tangent stiffness of the free coordinates is assembled at the final state of the solve,
+    with the axial and geometric stiffness of the edges and the bending stiffness of the splines,
+    and the lowest eigenpairs are computed with a sparse iterative eigensolver in shift-invert mode.
+    Edges with a prescribed length are inextensible in the analysis,
+    and are included as constraints on the coordinates instead of as stiffness.
+
+    Parameters
+    ----------
+    solver : :class:`BendSolver`
+        A solver with a converged solution.
+    density : float, optional
+        The density of the material of the edges with a section, in kg/m3.
+    linear_density : float, optional
+        An additional mass per unit of length of all edges, in kg/m.
+    masses : dict[int, float], optional
+        Additional masses of nodes, in kg.
+
+    Raises
+    ------
+    ValueError
+        If the solver has not converged, a spline uses the rod model, or splines are in contact.
+
+    Notes
+    -----
+    The tangent stiffness is the symmetric part of the derivative of the residual forces of the solver.
+    Because the bending moments of the solver are not derived from an energy,
+    the derivative is only symmetric up to the residual forces of the solve.
+
+    The eigenpairs are the ones nearest to a shift slightly below zero,
+    i.e. the lowest eigenpairs of a stable configuration,
+    and the negative eigenpairs closest to zero of an unstable one.
+
+    The eigensolver computes twice the requested number of eigenpairs,
+    because it can miss eigenpairs of repeated eigenvalues at the end of the requested range.
+
+    The masses are lumped at the nodes as in :class:`TransientSolver`.
+
+    Examples
+    --------
+    >>> solver = BendSolver(network, config=config)  # doctest: +SKIP
+    >>> solver.solve()  # doctest: +SKIP
+    >>> analysis = ModalAnalysis(solver, density=7850.0)  # doctest: +SKIP
+    >>> analysis.stability(k=3).stable  # doctest: +SKIP
+    >>> modes = analysis.frequencies(k=10)  # doctest: +SKIP
+    >>> modes.frequencies  # doctest: +SKIP
+    >>> modes.displaced(solver.xyz, 0, scale=0.5)  # doctest: +SKIP
+
+    """
+
+    def __init__(self, solver: BendSolver, density=7850.0, linear_density=0.0, masses=None):
+        self.solver = solver
+        self.density = density
+        self.linear_density = linear_density
+        self.masses = masses
+        self._sensitivity = Sensitivity(solver, parameters=[])
+        self._K = None
+        self._B = None
+
+    def stiffness(self):
+        """Assemble the tangent stiffness of the free coordinates of the nodes.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            The symmetric tangent stiffness, with the three coordinates of every free node
+            in the order of the free nodes of the solver.
+
+        """
+        if self._K is None:
+            free3 = self._sensitivity._free3
+            K = -self._sensitivity._Rx[free3][:, free3]
+            self._K = (0.5 * (K + K.T)).tocsr()
+        return self._K
+
+    def constraints(self):
+        """Assemble the constraints of the edges with a prescribed length on the free coordinates of the nodes.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            The derivatives of the lengths of the edges with respect to the free coordinates,
+            with one row per edge with a prescribed length between a free node and another node.
+
+        """
+        from scipy.sparse import csr_matrix
+        from scipy.sparse import diags
+
+        if self._B is None:
+            sensitivity = self._sensitivity
+            ties = sensitivity._ties
+            B = -diags(1.0 / sensitivity._l[ties]).dot(sensitivity._Rq[sensitivity._free3].T)
+            B = csr_matrix(B)
+            self._B = B[B.getnnz(axis=1) > 0]
+        return self._B
+
+    def mass(self):
+        """Assemble the lumped mass of the free coordinates of the nodes.
+
+        Returns
+        -------
+        scipy.sparse.dia_matrix
+
+        Raises
+        ------
+        ValueError
+            If a free node has no mass.
+
+        """
+        from numpy import repeat
+        from scipy.sparse import diags
+
+        solver = self.solver
+        mass = _lumped_masses(solver, self.density, self.linear_density, self.masses)[solver.free, 0]
+        if not (mass > 0).all():
+            raise ValueError("All free nodes should have a mass.")
+        return diags(repeat(mass, 3))
+
+    def _eigenpairs(self, M, k, sigma):
+        """Compute the eigenpairs of the constrained stiffness nearest to the shift."""
+        from numpy import argsort
+        from numpy import array
+        from numpy import float32
+        from numpy import zeros
+        from scipy.sparse import bmat
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.linalg import eigsh
+
+        solver = self.solver
+        K = self.stiffness()
+        B = self.constraints()
+        n = K.shape[0]
+        t = B.shape[0]
+        if t:
+            A = bmat([[K, B.T], [B, None]], format="csc")
+            M = bmat([[M, None], [None, csr_matrix((t, t))]], format="csc")
+        else:
+            A = K.tocsc()
+            M = M.tocsc()
+        # the eigensolver requires fewer eigenpairs than unknowns
+        k = min(k, n - t - 1)
+        values, vectors = eigsh(A, k=min(2 * k, n - t - 1), M=M, sigma=sigma, which="LM")
+        order = argsort(values)[:k]
+        values = values[order]
+        vectors = vectors[:n, order].T
+
+        shapes = zeros((k, solver.num_v, 3), dtype=float32)
+        free = array(solver.free, dtype=int)
+        for i, vector in enumerate(vectors):
+            vector = vector.reshape((-1, 3))
+            largest = (vector**2).sum(axis=1).argmax()
+            scale = (vector[largest] ** 2).sum() ** 0.5
+            # the largest coordinate of the largest displacement is positive
+            if vector[largest][abs(vector[largest]).argmax()] < 0:
+                scale = -scale
+            shapes[i, free] = vector / scale
+        return values, shapes
+
+    def stability(self, k=6, sigma=None):
+        """Compute the lowest eigenpairs of the tangent stiffness.
+
+        A configuration with a negative eigenvalue is unstable,
+        and its mode shape is the shape of the buckling.
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of eigenpairs.
+        sigma : float, optional
+            The shift of the eigenvalues.
+            Default is slightly below zero.
+
+        Returns
+        -------
+        :class:`Modes`
+
+        """
+        from scipy.sparse import identity
+
+        K = self.stiffness()
+        if sigma is None:
+            sigma = -1e-6 * abs(K.diagonal()).max()
+        values, shapes = self._eigenpairs(identity(K.shape[0], format="csr"), k, sigma)
+        return Modes(values, shapes, bool(values[0] > 0))
+
+    def frequencies(self, k=6, sigma=None):
+        """Compute the lowest natural frequencies and the corresponding mode shapes.
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of eigenpairs.
+        sigma : float, optional
+            The shift of the squared angular frequencies.
+            Default is slightly below zero.
+
+        Returns
+        -------
+        :class:`Modes`
+
+        """
+        from math import pi
+
+        from numpy import errstate
+        from numpy import sqrt
+
+        K = self.stiffness()
+        M = self.mass()
+        if sigma is None:
+            sigma = -1e-6 * abs(K.diagonal() / M.diagonal()).max()
+        values, shapes = self._eigenpairs(M, k, sigma)
+        with errstate(invalid="ignore"):
+            frequencies = sqrt(values) / (2 * pi)
+        return Modes(values, shapes, bool(values[0] > 0), frequencies)
@@ -0,0 +1,624 @@
+from .solver import PI
+from .solver import BendSolver
+
+SPLINE_PARAMETERS = ("E", "radius", "thickness")
+CABLE_PARAMETERS = ("qpre",)
+EDGE_PARAMETERS = ("lpre",)
+
+# the state of a solver that is restored to return to an earlier equilibrium
+STATE = ["xyz", "q", "f", "l", "r", "s", "m", "c", "theta", "_frames", "_tangents", "_torques", "_twist_stiffness"]
+
+
+def _curvature(a, b):
+    """Compute the curvature vectors of the circles through the origin and two other points, in bulk.
+
+    The curvature vector is the vector to the center of the circle divided by the squared radius,
+    written such that it is also defined, and differentiable, for collinear points.
+    """
+    from numpy import cross
+
+    axb = cross(a, b)
+    aa = (a * a).sum(axis=1)[:, None]
+    bb = (b * b).sum(axis=1)[:, None]
+    ab = ((a - b) * (a - b)).sum(axis=1)[:, None]
+    return 2 * cross(aa * b - bb * a, axb) / (aa * bb * ab)
+
+
+def _curvature_jacobians(a, b):
+    """Compute the curvature vectors and their derivatives with respect to both points, by complex step."""
+    from numpy import errstate
+    from numpy import zeros
+
+    step = 1e-30
+    n = len(a)
+    with errstate(all="ignore"):
+        kappa = _curvature(a, b)
+        ja = zeros((n, 3, 3))
+        jb = zeros((n, 3, 3))
+        for j in range(3):
+            ca = a.astype(complex)
+            ca[:, j] += 1j * step
+            ja[:, :, j] = _curvature(ca, b.astype(complex)).imag / step
+            cb = b.astype(complex)
+            cb[:, j] += 1j * step
+            jb[:, :, j] = _curvature(a.astype(complex), cb).imag / step
+    # the solver ignores the bending moments of coincident nodes
+    straight = ~(kappa == kappa).all(axis=1) | ~(abs(kappa) < float("inf")).all(axis=1)
+    kappa[straight] = 0.0
+    ja[straight] = 0.0
+    jb[straight] = 0.0
+    return kappa, ja, jb
+
+
+def _blocks(rows, cols, blocks, shape):
+    """Assemble a sparse matrix from 3x3 blocks at pairs of (node or edge) indices."""
+    from numpy import arange
+    from numpy import asarray
+    from numpy import repeat
+    from numpy import tile
+    from scipy.sparse import coo_matrix
+
+    rows = asarray(rows, dtype=int)
+    cols = asarray(cols, dtype=int)
+    i = (3 * rows)[:, None, None] + arange(3)[None, :, None]
+    j = (3 * cols)[:, None, None] + arange(3)[None, None, :]
+    i = repeat(i, 3, axis=2).ravel()
+    j = tile(j, (1, 3, 1)).ravel()
+    return coo_matrix((asarray(blocks).ravel(), (i, j)), shape=shape).tocsr()
+
+
+def _expand(C):
+    """Expand a connectivity matrix to act on the stacked coordinates of the nodes."""
+    from scipy.sparse import identity
+    from scipy.sparse import kron
+
+    return kron(C, identity(3), format="csr")
+
+
+def _element_index(item, elements, inputs, kind):
+    """Find the index of a cable or spline of a solver, given the element, its input or its index."""
+    if isinstance(item, int):
+        if not 0 <= item < len(elements):
+            raise ValueError("Invalid {} index: {}".format(kind, item))
+        return item
+    for index, (element, source) in enumerate(zip(elements, inputs)):
+        if item is element or item is source:
+            return index
+    raise ValueError("The {} is not part of the solver: {}".format(kind, item))
+
+
+def _parameters(solver, parameters=None):
+    """Validate design parameters, and replace their splines and cables by indices and their edges by edge keys."""
+    if parameters is None:
+        parameters = [(name, index) for index in range(len(solver.splines)) for name in ("radius", "thickness")]
+        parameters += [("qpre", index) for index in range(len(solver.cables))]
+        parameters += [("lpre", int(i)) for i in (solver.lpre[:, 0] != 0).nonzero()[0]]
+    index_edge = solver.network.index_edge()
+    result = []
+    for name, item in parameters:
+        if name in SPLINE_PARAMETERS:
+            item = _element_index(item, solver.splines, solver._spline_inputs, "spline")
+        elif name in CABLE_PARAMETERS:
+            item = _element_index(item, solver.cables, solver._cable_inputs, "cable")
+        elif name in EDGE_PARAMETERS:
+            if isinstance(item, (list, tuple)):
+                item = tuple(item)
+                if item not in solver.edge_index:
+                    raise ValueError("The edge is not in the network: {}".format(item))
+                item = solver.edge_index[item]
+            if solver.lpre[item, 0] == 0:
+                raise ValueError("The edge has no prescribed length: {}".format(index_edge[item]))
+            item = index_edge[item]
+        else:
+            raise ValueError("Unknown parameter: {}".format(name))
+        result.append((name, item))
+    return result
+
+
+def _values(solver, parameters):
+    """Get the current values of validated design parameters."""
+    from numpy import array
+
+    values = []
+    for name, item in parameters:
+        if name in SPLINE_PARAMETERS:
+            values.append(getattr(solver.splines[item], name))
+        elif name in CABLE_PARAMETERS:
+            values.append(solver.cables[item].qpre)
+        else:
+            values.append(solver.lpre[solver.edge_index[item], 0])
+    return array(values, dtype=float)
+
+
+def _assign(solver, parameters, values):
+    """Write new values of validated design parameters to the inputs of a solver, and update the solver."""
+    edges = []
+    cables = []
+    splines = []
+    for (name, item), value in zip(parameters, values):
+        value = float(value)
+        if name in SPLINE_PARAMETERS:
+            source = solver._spline_inputs[item]
+            if isinstance(source, dict):
+                source[name] = value
+            setattr(solver.splines[item], name, value)
+            splines.append(item)
+        elif name in CABLE_PARAMETERS:
+            source = solver._cable_inputs[item]
+            if isinstance(source, dict):
+                source["qpre"] = value
+            solver.cables[item].qpre = value
+            cables.append(item)
+        else:
+            solver.network.edge_attribute(item, "lpre", value)
+            edges.append(item)
+    solver.update(edges=edges, cables=cables, splines=splines)
+
+
+def _save(solver):
+    """Copy the state of a solver, to return to it with :func:`_restore`."""
+    state = {name: getattr(solver, name).copy() for name in STATE}
+    state["alpha"] = solver.alpha
+    state["iterations"] = solver.iterations
+    return state
+
+
+def _restore(solver, parameters, values, state):
+    """Restore a copied state of a solver, and the values of the design parameters of that state."""
+    for name in STATE:
+        setattr(solver, name, state[name].copy())
+    solver.alpha = state["alpha"]
+    solver.iterations = state["iterations"]
+    _assign(solver, parameters, values)
+    if solver.contact is not None:
+        solver.contact.reset()
+
+
+class Sensitivity(object):
+    """
+    Adjoint sensitivities of the equilibrium of a solved :class:`BendSolver` with respect to design parameters.
+
+    After a converged solve, the derivatives of an objective with respect to all parameters
+    are computed with a single sparse linear solve, regardless of the number of parameters.
+    The objective can depend on the coordinates of the nodes, the axial forces in the edges,
+    and the reaction forces at the anchors.
+
+    Parameters
+    ----------
+    solver : :class:`BendSolver`
+        A solver with a converged solution.
+    parameters : list[tuple[str, object]], optional
+        The design parameters, as pairs of a name and an item:
+
+        * ``("E", spline)``, ``("radius", spline)``, ``("thickness", spline)``,
+          with ``spline`` a :class:`compas_bender.datastructures.Spline` of the solver or its index.
+        * ``("qpre", cable)``,
+          with ``cable`` a :class:`compas_bender.datastructures.Cable` of the solver or its index.
+        * ``("lpre", edge)``,
+          with ``edge`` an edge of the network with a prescribed length.
+
+        Default is the radius and thickness of all splines, the force density of all cables,
+        and the prescribed length of all edges with a prescribed length.
+
+    Attributes
+    ----------
+    parameters : list[tuple[str, int | tuple[int, int]]]
+        The design parameters, with the splines and cables replaced by their indices.
+
+    Raises
+    ------
+    ValueError
+        If the solver has not converged, a parameter is invalid, a spline uses the rod model,
+        or splines are in contact.
+
+    Notes
+    -----
+    The equations are linearised around the state of the solver,
+    such that the accuracy of the sensitivities depends on the tolerances of the solve.
+    Edges with a prescribed length contribute an additional unknown (their force density)
+    and an additional equation (the stationarity of their force density) to the system.
+    The derivatives of the bending moments are computed with the complex step method, to machine precision.
+    As in the solver, splines that cross at an interior node each bend with their own moment at that node.
+
+    Examples
+    --------
+    >>> solver = BendSolver(network, config=config)  # doctest: +SKIP
+    >>> solver.solve()  # doctest: +SKIP
+    >>> sensitivity = Sensitivity(solver)  # doctest: +SKIP
+    >>> sensitivity.gradient(xyz={node: [0, 0, 1]})  # doctest: +SKIP
+
+    """
+
+    def __init__(self, solver: BendSolver, parameters=None):
+        if solver.iterations is None or not solver.iterations.get("converged"):
+            raise ValueError("Sensitivities require a converged solve.")
+        if solver._rods is not None:
+            raise ValueError("Sensitivities are not available for splines with the rod model.")
+        if solver.contact is not None and solver.contact.contacts:
+            raise ValueError("Sensitivities are not available for splines in contact.")
+        self.solver = solver
+        self.parameters = _parameters(solver, parameters)
+        self._lu = None
+        self._compile()
+
+    def values(self):
+        """Return the current values of the parameters.
+
+        Returns
+        -------
+        numpy.ndarray
+
+        """
+        return _values(self.solver, self.parameters)
+
+    # --------------------------------------------------------------------------
+    # linearisation
+    # --------------------------------------------------------------------------
+
+    def _compile(self):
+        """Linearise the equilibrium equations around the current state of the solver."""
+        from numpy import arange
+        from numpy import array
+        from numpy import concatenate
+        from numpy import einsum
+        from numpy import eye
+        from numpy import ones
+        from numpy import repeat
+        from numpy import where
+        from numpy import zeros
+        from scipy.sparse import bmat
+        from scipy.sparse import coo_matrix
+        from scipy.sparse import csr_matrix
+        from scipy.sparse import diags
+
+        solver = self.solver
+        n = solver.num_v
+        m = solver.num_e
+        xyz = solver.xyz
+        C = solver.C
+        C3 = _expand(C)
+        d = C.dot(xyz)
+        l = (d**2).sum(axis=1) ** 0.5  # noqa: E741
+        u = d / l[:, None]
+
+        qpre = solver.qpre[:, 0]
+        fpre = solver.fpre[:, 0]
+        lpre = solver.lpre[:, 0]
+        linit = solver.linit[:, 0]
+        EA = solver.EA[:, 0]
+        # axial stiffness per unit of strain, as applied by the solver
+        ka = zeros(m)
+        elastic = linit != 0
+        ka[elastic] = EA[elastic] / linit[elastic]
+
+        # ----------------------------------------------------------------------
+        # edges with a prescribed length have their force density as additional unknown
+        # ----------------------------------------------------------------------
+        ties = (lpre != 0).nonzero()[0]
+        normal = lpre == 0
+        t = len(ties)
+        self._ties = ties
+        self._tie_index = {e: i for i, e in enumerate(ties)}
+
+        # the force densities of the other edges follow from the lengths
+        q = solver.q[:, 0].copy()
+        q[normal] = qpre[normal] + fpre[normal] / l[normal] + ka[normal] * (l[normal] - linit[normal]) / l[normal]
+        f = q * l
+        # the derivative of the axial forces with respect to the lengths
+        df = qpre + ka
+        df[ties] = q[ties]
+
+        # ----------------------------------------------------------------------
+        # axial stiffness
+        # ----------------------------------------------------------------------
+        blocks = (f / l)[:, None, None] * eye(3)[None] + ((df - f / l)[:, None, None] * einsum("ei,ej->eij", u, u))
+        blocks[ties] = q[ties][:, None, None] * eye(3)[None]
+        edges = arange(m)
+        K = C3.T.dot(_blocks(edges, edges, blocks, (3 * m, 3 * m))).dot(C3)
+        Rx = -K
+
+        # ----------------------------------------------------------------------
+        # bending
+        # ----------------------------------------------------------------------
+        # every spline has its own stencil at each of its interior nodes,
+        # and the ends of the spline edges see the moments of the stencils that the solver applies to them:
+        # the last stencil at the node up to the spline itself, or the last stencil at the node of the previous
+        # evaluation, which is the same at a converged solution
+        stencils = solver._stencils
+        centers = stencils["center"]
+        prev = stencils["prev"]
+        succ = stencils["next"]
+        owner = stencils["spline"]
+        EI = solver._stencil_EI[:, 0]
+        spline_edges = stencils["edges"]
+        last = -ones(n, dtype=int)
+        last[stencils["last_node"]] = stencils["last"]
+        source = where(stencils["source"] < 0, last[stencils["ends"]], stencils["source"])
+        self._centers = centers
+        self._owner = owner
+
+        if len(centers):
+            kappa, ja, jb = _curvature_jacobians(xyz[prev] - xyz[centers], xyz[succ] - xyz[centers])
+            self._kappa = kappa
+            k = arange(len(centers))
+            M = _blocks(
+                concatenate((k, k, k)),
+                concatenate((prev, succ, centers)),
+                concatenate((EI[:, None, None] * ja, EI[:, None, None] * jb, -EI[:, None, None] * (ja + jb))),
+                (3 * len(k), 3 * n),
+            )
+            # the differences of the moments at the ends of the spline edges
+            rows = concatenate((arange(len(spline_edges)), arange(len(spline_edges))))
+            cols = concatenate((source[:, 1], source[:, 0]))
+            vals = concatenate((ones(len(spline_edges)), -ones(len(spline_edges))))
+            # ends without a stencil have no moment
+            known = cols >= 0
+            D = csr_matrix(coo_matrix((vals[known], (rows[known], cols[known])), shape=(len(spline_edges), len(k))))
+            D3 = _expand(D)
+            Cs = C[spline_edges]
+            Cs3 = _expand(Cs)
+            ls = l[spline_edges]
+            ds = d[spline_edges]
+            dm = D.dot(EI[:, None] * kappa)
+            e = arange(len(spline_edges))
+            W = diags(repeat(1.0 / ls, 3))
+            G = _blocks(e, e, -einsum("ki,kj->kij", dm, ds) / (ls**3)[:, None, None], (3 * len(e), 3 * len(e)))
+            Rx = Rx + Cs3.T.dot(W.dot(D3).dot(M) + G.dot(Cs3))
+            self._bending = Cs3.T.dot(W).dot(D3)
+        else:
+            self._kappa = zeros((0, 3))
+            self._bending = None
+
+        # ----------------------------------------------------------------------
+        # force densities of the edges with a prescribed length
+        # ----------------------------------------------------------------------
+        rows = []
+        cols = []
+        vals = []
+        for i, e in enumerate(ties):
+            for node, sign in zip(solver.edges[e], (1.0, -1.0)):
+                rows += [3 * node, 3 * node + 1, 3 * node + 2]
+                cols += [i, i, i]
+                vals += list(sign * d[e])
+        Rq = csr_matrix(coo_matrix((vals, (rows, cols)), shape=(3 * n, t)))
+
+        # the stationarity of the force densities: q (lpre - l) - lpre A(l) = 0
+        A = qpre + fpre / l + ka * (l - linit) / l
+        dA = -fpre / l**2 + ka * linit / l**2
+        dh = -q - lpre * dA
+        rows = []
+        cols = []
+        vals = []
+        for i, e in enumerate(ties):
+            for node, sign in zip(solver.edges[e], (-1.0, 1.0)):
+                rows += [i, i, i]
+                cols += [3 * node, 3 * node + 1, 3 * node + 2]
+                vals += list(sign * dh[e] * u[e])
+        Hx = csr_matrix(coo_matrix((vals, (rows, cols)), shape=(t, 3 * n)))
+        Hq = diags(lpre[ties] - l[ties])
+
+        # ----------------------------------------------------------------------
+        # the system of the free coordinates and the force densities of the ties
+        # ----------------------------------------------------------------------
+        free3 = (3 * array(solver.free, dtype=int)[:, None] + arange(3)[None, :]).ravel()
+        fixed3 = (3 * array(solver.fixed, dtype=int)[:, None] + arange(3)[None, :]).ravel()
+        self._free3 = free3
+        self._fixed3 = fixed3
+        self._system = bmat([[Rx[free3][:, free3], Rq[free3]], [Hx[:, free3], Hq]], format="csc")
+        self._Rx = Rx
+        self._Rq = Rq
+
+        self._d = d
+        self._l = l
+        self._u = u
+        self._q = q
+        self._df = df
+        self._A = A
+        self._ka = ka
+        self._Rp, self._Hp, self._Fp = self._parameter_derivatives()
+
+    def _section_derivatives(self, index, name):
+        """Compute the derivatives of the axial and bending stiffness of a spline with respect to a parameter."""
+        solver = self.solver
+        spline = solver.splines[index]
+        units = solver.units
+        if name == "E":
+            A, I = spline.section(*units)[:2]  # noqa: E741
+            return A * units.E, I * units.E
+        if spline.width and spline.height:
+            # rectangular sections do not depend on the radius and the thickness
+            return 0.0, 0.0
+        E = spline.E * units.E
+        R = spline.radius * units.radius
+        T = spline.thickness * units.thickness
+        if T >= R:
+            # solid sections do not depend on the thickness
+            if name == "radius":
+                return E * PI * 2 * R * units.radius, E * PI * R**3 * units.radius
+            return 0.0, 0.0
+        r = R - T
+        if name == "radius":
+            return E * PI * 2 * T * units.radius, E * PI * (R**3 - r**3) * units.radius
+        return E * PI * 2 * r * units.thickness, E * PI * r**3 * units.thickness
+
+    def _parameter_derivatives(self):
+        """Compute the derivatives of the residuals, tie equations and forces with respect to the parameters."""
+        from numpy import zeros
+
+        solver = self.solver
+        n = solver.num_v
+        m = solver.num_e
+        P = len(self.parameters)
+        ties = self._tie_index
+        l = self._l  # noqa: E741
+        u = self._u
+        lpre = solver.lpre[:, 0]
+        linit = solver.linit[:, 0]
+
+        Rp = zeros((3 * n, P))
+        Hp = zeros((len(self._ties), P))
+        Fp = zeros((m, P))
+
+        def axial(column, edges, df):
+            # the residuals change with the axial forces of normal edges,
+            # the tie equations with the force densities of the edges with a prescribed length
+            for e, value in zip(edges, df):
+                if e in ties:
+                    Hp[ties[e], column] -= lpre[e] * value / l[e]
+                    continue
+                a, b = solver.edges[e]
+                Rp[3 * a : 3 * a + 3, column] += value * u[e]
+                Rp[3 * b : 3 * b + 3, column] -= value * u[e]
+                Fp[e, column] += value
+
+        for column, (name, item) in enumerate(self.parameters):
+            if name in SPLINE_PARAMETERS:
+                dEA, dEI = self._section_derivatives(item, name)
+                edges = solver._spline_data[item]["ei"]
+                strain = [(l[e] - linit[e]) / linit[e] if linit[e] != 0 else 0.0 for e in edges]
+                axial(column, edges, [dEA * value for value in strain])
+                if self._bending is not None:
+                    dm = zeros((len(self._centers), 3))
+                    selected = self._owner == item
+                    dm[selected] = dEI * self._kappa[selected]
+                    Rp[:, column] += self._bending.dot(dm.ravel())
+            elif name in CABLE_PARAMETERS:
+                edges = solver._cable_ei[item]
+                axial(column, edges, [l[e] for e in edges])
+            else:
+                e = solver.edge_index[item]
+                Hp[ties[e], column] = self._q[e] - self._A[e]
+        return Rp, Hp, Fp
+
+    # --------------------------------------------------------------------------
+    # gradients
+    # --------------------------------------------------------------------------
+
+    def _weights(self, values, shape, index):
+        from numpy import asarray
+        from numpy import zeros
+
+        if values is None:
+            return None
+        if isinstance(values, dict):
+            weights = zeros(shape)
+            for key, value in values.items():
+                weights[index[key]] = value
+            return weights
+        return asarray(values, dtype=float).reshape(shape)
+
+    def gradient(self, xyz=None, f=None, reactions=None):
+        """Compute the gradient of an objective with respect to the parameters, with one adjoint solve.
+
+        The objective is defined by its partial derivatives with respect to the results of the solve.
+        For a linear objective, these are the weights of the results.
+        For a nonlinear objective, they are the derivatives at the current solution.
+
+        Parameters
+        ----------
+        xyz : array-like | dict[int, list[float]], optional
+            The derivatives with respect to the coordinates of the nodes,
+            as an array of shape (number of nodes, 3), or a dict mapping nodes to three values.
+        f : array-like | dict[tuple[int, int], float], optional
+            The derivatives with respect to the axial forces in the edges,
+            as an array of shape (number of edges,), or a dict mapping edges to values.
+        reactions : array-like | dict[int, list[float]], optional
+            The derivatives with respect to the reaction forces at the nodes,
+            as an array of shape (number of nodes, 3), or a dict mapping nodes to three values.
+
+        Returns
+        -------
+        numpy.ndarray
+            The derivatives of the objective with respect to the parameters, in the order of :attr:`parameters`.
+
+        Examples
+        --------
+        The gradient of the height of a node.
+
+        >>> sensitivity.gradient(xyz={node: [0, 0, 1]})  # doctest: +SKIP
+
+        The gradient of the sum of the squared axial forces.
+
+        >>> sensitivity.gradient(f=2 * network.edge_forces_array())  # doctest: +SKIP
+
+        """
+        from numpy import zeros
+
+        solver = self.solver
+        n = solver.num_v
+        m = solver.num_e
+        ties = self._ties
+        free3 = self._free3
+        fixed3 = self._fixed3
+
+        gx = self._weights(xyz, (n, 3), solver.node_index)
+        gf = self._weights(f, (m,), solver.edge_index)
+        gr = self._weights(reactions, (n, 3), solver.node_index)
+
+        # partial derivatives with respect to the unknowns and the parameters
+        dz = zeros(len(free3) + len(ties))
+        dp = zeros(len(self.parameters))
+        if gx is not None:
+            dz[: len(free3)] += gx.ravel()[free3]
+        if gf is not None:
+            # the axial forces depend on the lengths, and on the force densities of the ties
+            weights = gf * self._df
+            gxf = _expand(solver.C).T.dot((weights[:, None] * self._u).ravel())
+            dz[: len(free3)] += gxf[free3]
+            dz[len(free3) :] += gf[ties] * self._l[ties]
+            dp += gf.dot(self._Fp)
+        if gr is not None:
+            # the reactions are the negative residuals at the anchors
+            g = gr.ravel()[fixed3]
+            dz[: len(free3)] -= self._Rx[fixed3][:, free3].T.dot(g)
+            dz[len(free3) :] -= self._Rq[fixed3].T.dot(g)
+            dp -= self._Rp[fixed3].T.dot(g)
+
+        adjoint = self._factor().solve(dz, trans="T")
+        return dp - adjoint[: len(free3)].dot(self._Rp[free3]) - adjoint[len(free3) :].dot(self._Hp)
+
+    def _factor(self):
+        """Factorise the linearised system once, for the adjoint and the tangent solves."""
+        from scipy.sparse.linalg import splu
+
+        if self._lu is None:
+            self._lu = splu(self._system)
+        return self._lu
+
+    def _tangent(self, dp):
+        """Compute the first-order changes of the free coordinates and the force densities of the ties."""
+        from numpy import asarray
+
+        dp = asarray(dp, dtype=float).reshape(len(self.parameters))
+        rhs = self._Rp[self._free3].dot(dp)
+        if len(self._ties):
+            rhs = rhs.tolist() + self._Hp.dot(dp).tolist()
+        return -self._factor().solve(asarray(rhs, dtype=float))
+
+    def tangent(self, dp):
+        """Compute the first-order changes of the coordinates of the nodes for given changes of the parameters,
+        with one linear solve.
+
+        Parameters
+        ----------
+        dp : array-like
+            The changes of the parameters, in the order of :attr:`parameters`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The changes of the coordinates, as an array of shape (number of nodes, 3).
+
+        Examples
+        --------
+        The predicted shape after shortening the prescribed length of a tie by 1 cm.
+
+        >>> sensitivity = Sensitivity(solver, parameters=[("lpre", edge)])  # doctest: +SKIP
+        >>> xyz = network.nodes_xyz_array() + sensitivity.tangent([-0.01])  # doctest: +SKIP
+
+        """
+        from numpy import zeros
+
+        dxyz = zeros(3 * self.solver.num_v)
+        dxyz[self._free3] = self._tangent(dp)[: len(self._free3)]
+        return dxyz.reshape((-1, 3))
@@ -0,0 +1,283 @@
+import copy
+import inspect
+import queue
+
+from compas_bender.datastructures import BendNetwork
+
+from .cache import UNCACHEABLE
+from .hashing import solve_hash
+from .solver import EDGE_RESULTS
+from .solver import NODE_RESULTS
+from .solver import BendSolver
+from .solver import CancellationToken
+
+
+def _solve(network, cables, splines, config, progress, event, every):
+    """Run a solve in a worker process, and return the results as arrays."""
+    token = CancellationToken(event) if event is not None else None
+    solver = BendSolver(network, cables, splines, config)
+    for snapshot in solver.iterate(every=every, token=token):
+        if progress is not None:
+            progress.put(
+                {
+                    "k": snapshot.k,
+                    "alpha": snapshot.alpha,
+                    "crit1": float(snapshot.crit1),
+                    "crit2": float(snapshot.crit2),
+                    "crit3": float(snapshot.crit3),
+                }
+            )
+    nodes = network.nodes_attributes_array(NODE_RESULTS)
+    edges = network.edges_attributes_array(EDGE_RESULTS)
+    return nodes, edges, solver.iterations
+
+
+def _drain(progress):
+    """Get the progress reports of a solve that are available, without waiting for more."""
+    reports = []
+    while True:
+        try:
+            reports.append(progress.get_nowait())
+        except (queue.Empty, EOFError, OSError):
+            return reports
+
+
+def _shutdown(jobs, executor, manager):
+    """Cancel the solves of jobs and shut down the worker processes."""
+    for job in jobs:
+        if job.event is not None:
+            job.event.set()
+    if executor is not None:
+        executor.shutdown(wait=True)
+        manager.shutdown()
+
+
+class _Job(object):
+    __slots__ = ("key", "future", "progress", "event", "cancelled", "listeners", "waiters")
+
+    def __init__(self, key):
+        self.key = key
+        self.future = None
+        self.progress = None
+        self.event = None
+        self.cancelled = False
+        self.listeners = []
+        self.waiters = 0
+
+
+class SolveService(object):
+    """
+    Asyncio-friendly service for solving bend networks in a pool of worker processes.
+
+    Solves run in separate processes, such that they don't block the event loop
+    and don't compete for the GIL of the calling process.
+    Concurrent requests with identical inputs (see :func:`solve_hash`) share a single solve.
+    Starting and stopping the worker processes, polling for progress and reading and writing the cache
+    run in the default executor of the event loop.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        The maximum number of worker processes.
+        Default is the number of processors.
+    every : int, optional
+        The number of iterations between progress reports.
+        Default is ``config["kdiv"]``.
+    interval : float, optional
+        The polling interval for progress reports, in seconds.
+    cache : :class:`SolveCache`, optional
+        A cache of solve results, checked before submitting a solve,
+        and updated when a solve completes.
+
+    Examples
+    --------
+    >>> async def main():  # doctest: +SKIP
+    ...     async with SolveService(max_workers=4) as service:
+    ...         iterations = await service.solve(network, config=config, progress=print)
+
+    """
+
+    def __init__(self, max_workers=None, every=None, interval=0.1, cache=None):
+        import threading
+
+        self.max_workers = max_workers
+        self.every = every
+        self.interval = interval
+        self.cache = cache
+        self._executor = None
+        self._manager = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    def _start(self):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                self._manager = multiprocessing.Manager()
+            return self._manager.Queue(), self._manager.Event()
+
+    def _detach(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+            executor = self._executor
+            manager = self._manager
+            self._executor = None
+            self._manager = None
+            self._jobs = {}
+        for job in jobs:
+            job.cancelled = True
+        return jobs, executor, manager
+
+    def close(self):
+        """Cancel the running solves and shut down the worker processes.
+
+        This waits for the worker processes to exit.
+        In a coroutine, use :meth:`aclose` instead.
+
+        Returns
+        -------
+        None
+
+        """
+        _shutdown(*self._detach())
+
+    async def aclose(self):
+        """Cancel the running solves and shut down the worker processes, without blocking the event loop.
+
+        Returns
+        -------
+        None
+
+        """
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(None, _shutdown, *self._detach())
+
+    @property
+    def running(self):
+        """int : The number of solves in progress."""
+        return len(self._jobs)
+
+    # --------------------------------------------------------------------------
+    # Jobs
+    # --------------------------------------------------------------------------
+
+    def _submit(self, key, network, cables, splines, config):
+        import asyncio
+
+        job = _Job(key)
+        job.future = asyncio.ensure_future(self._run(job, network, cables, splines, config))
+        job.future.add_done_callback(lambda _: self._release(job))
+        self._jobs[key] = job
+        return job
+
+    def _release(self, job):
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+
+    def _cancel(self, job):
+        import asyncio
+
+        job.cancelled = True
+        if job.event is not None:
+            asyncio.get_running_loop().run_in_executor(None, job.event.set)
+
+    async def _run(self, job, network, cables, splines, config):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        job.progress, job.event = await loop.run_in_executor(None, self._start)
+        if job.cancelled:
+            raise asyncio.CancelledError
+        future = self._executor.submit(_solve, network, cables, splines, config, job.progress, job.event, self.every)
+        future = asyncio.wrap_future(future)
+        while not future.done():
+            await self._report(job)
+            await asyncio.wait([future], timeout=self.interval)
+        await self._report(job)
+        nodes, edges, iterations = future.result()
+        if self.cache is not None and iterations.get("status") not in UNCACHEABLE:
+            await loop.run_in_executor(None, self.cache.put, job.key, nodes, edges, iterations)
+        return nodes, edges, iterations
+
+    async def _report(self, job):
+        import asyncio
+
+        reports = await asyncio.get_running_loop().run_in_executor(None, _drain, job.progress)
+        for report in reports:
+            for listener in list(job.listeners):
+                result = listener(dict(report, key=job.key))
+                if inspect.isawaitable(result):
+                    await result
+
+    # --------------------------------------------------------------------------
+    # Solve
+    # --------------------------------------------------------------------------
+
+    async def solve(self, network: BendNetwork, cables=None, splines=None, config=None, progress=None):
+        """Solve a bend network in a worker process, and write the results to the network.
+
+        Parameters
+        ----------
+        network : :class:`compas_bender.datastructures.BendNetwork`
+        cables : list[:class:`compas_bender.datastructures.Cable` | dict], optional
+            Default is the cables of the network.
+        splines : list[:class:`compas_bender.datastructures.Spline` | dict], optional
+            Default is the splines of the network.
+        config : dict, optional
+        progress : callable, optional
+            A function or coroutine function that is called with a progress report,
+            a dict with the hash of the solve (``"key"``), the iteration number (``"k"``),
+            the shear scaling factor (``"alpha"``),
+            and the convergence criteria (``"crit1"``, ``"crit2"``, ``"crit3"``).
+
+        Returns
+        -------
+        dict
+            The convergence history, see :func:`compas_bender.bend.bend_splines`.
+
+        Notes
+        -----
+        The inputs are copied to the worker process when the solve is submitted.
+        If the request is cancelled, the solve is cancelled as well,
+        unless other requests are waiting for the same solve.
+
+        """
+        import asyncio
+
+        key = solve_hash(network, cables, splines, config)
+        if self.cache is not None:
+            result = await asyncio.get_running_loop().run_in_executor(None, self.cache.get, key)
+            if result is not None:
+                nodes, edges, iterations = result
+                network.nodes_attributes_array(NODE_RESULTS, nodes)
+                network.edges_attributes_array(EDGE_RESULTS, edges)
+                return iterations
+        job = self._jobs.get(key)
+        if job is None or job.cancelled:
+            job = self._submit(key, network, cables, splines, config)
+        if progress is not None:
+            job.listeners.append(progress)
+        job.waiters += 1
+        try:
+            nodes, edges, iterations = await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            if job.waiters == 1 and not job.future.done():
+                self._cancel(job)
+            raise
+        finally:
+            job.waiters -= 1
+            if progress is not None:
+                job.listeners.remove(progress)
+        network.nodes_attributes_array(NODE_RESULTS, nodes)
+        network.edges_attributes_array(EDGE_RESULTS, edges)
+        return copy.deepcopy(iterations)
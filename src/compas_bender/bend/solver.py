@@ -0,0 +1,1518 @@
+import threading
+from math import ceil
+from time import perf_counter
+from typing import Dict
+from typing import List
+from typing import Union
+
+from compas_bender.datastructures import BendNetwork
+from compas_bender.datastructures import Cable
+from compas_bender.datastructures import SectionUnits
+from compas_bender.datastructures import Spline
+
+from .contact import SplineContact
+
+PI = 3.14159
+NODE_RESULTS = ["x", "y", "z", "rx", "ry", "rz", "sx", "sy", "sz", "mx", "my", "mz"]
+EDGE_RESULTS = ["q", "f", "l", "linit"]
+
+
+def _cross(u, v):
+    """Compute the cross products of two arrays of vectors."""
+    from numpy import stack
+
+    return stack(
+        (
+            u[:, 1] * v[:, 2] - u[:, 2] * v[:, 1],
+            u[:, 2] * v[:, 0] - u[:, 0] * v[:, 2],
+            u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0],
+        ),
+        axis=1,
+    )
+
+
+def _length_sqrd(u):
+    """Compute the squared lengths of an array of vectors."""
+    return u[:, 0] ** 2 + u[:, 1] ** 2 + u[:, 2] ** 2
+
+
+def _dot(u, v):
+    """Compute the dot products of two arrays of vectors."""
+    return u[:, 0] * v[:, 0] + u[:, 1] * v[:, 1] + u[:, 2] * v[:, 2]
+
+
+def _transport(a, b, v):
+    """Parallel transport an array of vectors from an array of unit tangents to another."""
+    axb = _cross(a, b)
+    c = _dot(a, b)[:, None]
+    return c * v + _cross(axb, v) + axb * (_dot(axb, v)[:, None] / (1 + c))
+
+
+class BendSolver(object):
+    """
+    Dynamic relaxation solver for networks of nodes and edges, combined with cables and splines.
+
+    The solver keeps all precomputed structures (maps, free set, connectivity matrices, per-edge constants)
+    and the state of the relaxation (coordinates, velocities, force densities) between solves.
+    After local edits to the network, the cables or the splines,
+    only the affected structures have to be updated with :meth:`update`,
+    and the next call to :meth:`solve` relaxes the system starting from the previous equilibrium.
+
+    Parameters
+    ----------
+    network : :class:`BendNetwork`
+    cables : list[:class:`Cable` | dict], optional
+        Default is the cables of the network.
+    splines : list[:class:`Spline` | dict], optional
+        Default is the splines of the network.
+    config : dict, optional
+
+    Notes
+    -----
+    Changes to the topology of the network, or to the edges of the cables and splines,
+    are not supported by :meth:`update`. In that case, a new solver has to be created.
+
+    Splines with the rod model (``Spline.rod``) are discrete elastic rods,
+    with a material frame and an angle of twist (``theta``) per edge.
+    The angles of twist are relaxed together with the coordinates of the nodes,
+    and the residual torques are included in the convergence criterion of the splines.
+    The twist of the end edges of a rod is fixed at anchors.
+
+    Examples
+    --------
+    >>> solver = BendSolver(network, cables, splines, config)  # doctest: +SKIP
+    >>> solver.solve()  # doctest: +SKIP
+    >>> network.node_attribute(node, "is_anchor", True)  # doctest: +SKIP
+    >>> solver.update(nodes=[node])  # doctest: +SKIP
+    >>> solver.solve()  # doctest: +SKIP
+
+    """
+
+    def __init__(
+        self,
+        network: BendNetwork,
+        cables: List[Union[Cable, Dict]] = None,
+        splines: List[Union[Spline, Dict]] = None,
+        config=None,
+    ):
+        from numpy import all
+        from numpy import errstate
+        from numpy import float64
+        from numpy import ones
+        from numpy import zeros
+
+        from compas.linalg import normrow
+
+        self.network = network
+        # cables and splines defined as dicts are converted to elements
+        # the original objects are kept for identifying them in updates
+        self._cable_inputs = list(network.cables if cables is None else cables)
+        self._spline_inputs = list(network.splines if splines is None else splines)
+        self.cables = [self._as_cable(cable) for cable in self._cable_inputs]
+        self.splines = [self._as_spline(spline) for spline in self._spline_inputs]
+        # ----------------------------------------------------------------------
+        # initialise configuration options
+        # ----------------------------------------------------------------------
+        self.config = config if config else {}
+        self.units = SectionUnits(
+            self.config.get("unit.E", 1e9),
+            self.config.get("unit.radius", 1e-3),
+            self.config.get("unit.thickness", 1e-3),
+        )
+        self.alpha = self.config.get("alpha", 10000)
+        self.iterations = None
+        self.contact = None
+        with errstate(all="ignore"):
+            # ------------------------------------------------------------------
+            # precompute
+            # ------------------------------------------------------------------
+            self._compile()
+            self._read_nodes()
+            self._read_edges()
+            self._update_free()
+            # ------------------------------------------------------------------
+            # if none of the initial lengths are set,
+            # set the initial lengths to the current lengths
+            # ------------------------------------------------------------------
+            if all(self.linit == 0):
+                self.linit = normrow(self.C.dot(self.xyz))
+        # ----------------------------------------------------------------------
+        # initial values
+        # q: force densities
+        # f: edge forces
+        # l: edge lengths
+        # v: velocities
+        # r: residual forces
+        # s: shear forces
+        # m: bending moment vectors
+        # c: contact forces
+        # ----------------------------------------------------------------------
+        self.q = ones((self.num_e, 1), dtype=float64)
+        self.l = normrow(self.C.dot(self.xyz))  # noqa: E741
+        self.f = self.q * self.l
+        self.v = zeros((self.num_v, 3), dtype=float64)
+        self.r = zeros((self.num_v, 3), dtype=float64)
+        self.s = zeros((self.num_v, 3), dtype=float64)
+        self.m = zeros((self.num_v, 3), dtype=float64)
+        self.c = zeros((self.num_v, 3), dtype=float64)
+        self._contact_stiffness = zeros(self.num_v, dtype=float64)
+        if self.config.get("contact", False):
+            self._compile_contact()
+
+    # --------------------------------------------------------------------------
+    # precomputation
+    # --------------------------------------------------------------------------
+
+    def _compile(self):
+        """Compile the maps, the (aligned) edge list and the connectivity matrices of the network."""
+        from compas.matrices import connectivity_matrix
+
+        network = self.network
+        # ----------------------------------------------------------------------
+        # maps
+        # ----------------------------------------------------------------------
+        # the maps are cached by the network
+        # and edges can be looked up regardless of their orientation
+        self.topology = network.topology
+        self.node_index = node_index = network.node_index()
+        self.edge_index = network.edge_index(undirected=True)
+        edges = network.edges_array().tolist()
+        self.num_v = len(node_index)
+        self.num_e = len(edges)
+        # ----------------------------------------------------------------------
+        # cables
+        # ----------------------------------------------------------------------
+        self._cable_ei = []
+        self._edge_cable = {}
+        for index, cable in enumerate(self.cables):
+            ei = cable.edge_indices
+            for i in ei:
+                self._edge_cable[i] = index
+            self._cable_ei.append(ei)
+        # ----------------------------------------------------------------------
+        # splines
+        # align the spline edges with the direction of the spline
+        # ----------------------------------------------------------------------
+        self._spline_data = []
+        self._edge_spline = {}
+        spline_nodes = []
+        for index, spline in enumerate(self.splines):
+            vi = spline.node_indices
+            ei = spline.edge_indices
+            for i, is_reversed in zip(ei, spline.reversed):
+                self._edge_spline[i] = index
+                if is_reversed:
+                    edges[i] = edges[i][::-1]
+            spline_nodes += vi
+            self._spline_data.append({"vi": vi, "ei": ei})
+        self.edges = edges
+        self._spline_nodes = set(spline_nodes)
+        # ----------------------------------------------------------------------
+        # create the connectivity matrices
+        # after spline edges have been aligned
+        # ----------------------------------------------------------------------
+        self.C = connectivity_matrix(edges, "csr")
+        self.Ct = self.C.transpose()
+        self.Ct2 = self.Ct.tocsr()
+        self.Ct2.data **= 2
+        self._compile_stencils()
+
+    def _compile_stencils(self):
+        """Compile the index arrays for evaluating the bending moments and shear forces of all splines in bulk."""
+        from bisect import bisect_left
+
+        from numpy import array
+        from numpy import float64
+        from numpy import ones
+        from numpy import zeros
+        from scipy.sparse import coo_matrix
+
+        center = []
+        prev = []
+        succ = []
+        spline = []
+        edges = []
+        edge_spline = []
+        # the spline edges as segments in the direction of the spline,
+        # and the segments before and after every stencil
+        segment_from = []
+        segment_to = []
+        segment_prev = []
+        segment_next = []
+        for index, data in enumerate(self._spline_data):
+            vi = data["vi"]
+            start = len(center)
+            center += vi[1:-1]
+            prev += vi[:-2]
+            succ += vi[2:]
+            spline += [index] * (len(vi) - 2)
+            data["stencils"] = slice(start, len(center))
+            start = len(edges)
+            segment_from += vi[:-1]
+            segment_to += vi[1:]
+            segment_prev += range(start, start + len(vi) - 2)
+            segment_next += range(start + 1, start + len(vi) - 1)
+            edges += data["ei"]
+            edge_spline += [index] * len(data["ei"])
+            data["segments"] = slice(start, len(edges))
+        # the stencils that set the moment of a node, in order of evaluation
+        writers = {}
+        for k, node in enumerate(center):
+            writers.setdefault(node, []).append(k)
+        # the stencil of the moment at both ends of every spline edge, as seen by the spline,
+        # or -1 if the moment is the one of the previous evaluation
+        ends = [self.edges[i] for i in edges]
+        source = []
+        for (u, v), index in zip(ends, edge_spline):
+            stop = self._spline_data[index]["stencils"].stop
+            source.append([bisect_left(writers.get(node, []), stop) - 1 for node in (u, v)])
+            source[-1] = [writers[node][i] if i >= 0 else -1 for node, i in zip((u, v), source[-1])]
+        self._stencils = {
+            "center": array(center, dtype=int),
+            "prev": array(prev, dtype=int),
+            "next": array(succ, dtype=int),
+            "spline": array(spline, dtype=int),
+            "edges": array(edges, dtype=int),
+            "edge_spline": array(edge_spline, dtype=int),
+            "ends": array(ends, dtype=int).reshape((-1, 2)),
+            "source": array(source, dtype=int).reshape((-1, 2)),
+            "last_node": array(list(writers), dtype=int),
+            "last": array([ks[-1] for ks in writers.values()], dtype=int),
+            "S": self.C[edges].transpose().tocsr(),
+            "segment_from": array(segment_from, dtype=int),
+            "segment_to": array(segment_to, dtype=int),
+            "segment_prev": array(segment_prev, dtype=int),
+            "segment_next": array(segment_next, dtype=int),
+        }
+        # the forces of the gradients with respect to the segments before and after every stencil
+        k = list(range(len(center)))
+        vals = ones(2 * len(k), dtype=float64)
+        vals[len(k) :] = -1.0
+        shape = (self.num_v, len(center))
+        self._stencils["Sp"] = coo_matrix((vals, (prev + center, k + k)), shape=shape).tocsr()
+        self._stencils["Sn"] = coo_matrix((vals, (center + succ, k + k)), shape=shape).tocsr()
+        self._stencil_EI = zeros((len(center), 1), dtype=float64)
+        # the bending moment vectors of the stencils of the last evaluation
+        self._moments = zeros((len(center), 3), dtype=float64)
+        # ----------------------------------------------------------------------
+        # rods
+        # ----------------------------------------------------------------------
+        self._stencil_rod = zeros(len(center), dtype=bool)
+        self._stencil_EI1 = zeros(len(center), dtype=float64)
+        self._stencil_EI2 = zeros(len(center), dtype=float64)
+        self._stencil_GJ = zeros(len(center), dtype=float64)
+        self._segment_rod = zeros(len(edges), dtype=bool)
+        self._segment_radius = zeros(len(edges), dtype=float64)
+        self.theta = zeros(len(edges), dtype=float64)
+        self._vtheta = zeros(len(edges), dtype=float64)
+        self._frames = zeros((len(edges), 3), dtype=float64)
+        self._tangents = zeros((len(edges), 3), dtype=float64)
+        self._torques = zeros(len(edges), dtype=float64)
+        self._twist_stiffness = zeros(len(edges), dtype=float64)
+        self._rods = None
+
+    def _read_nodes(self, nodes=None):
+        """Read the node attributes from the network.
+
+        Parameters
+        ----------
+        nodes : list[int], optional
+            The identifiers of the nodes that should be read.
+            Default is all nodes.
+
+        Returns
+        -------
+        bool
+            True if the set of anchored nodes has changed.
+
+        """
+        network = self.network
+        if nodes is None:
+            self.is_anchor = [False] * self.num_v
+            self.xyz = network.nodes_xyz_array()  # m
+            self.p = network.loads_array()  # kN
+            nodes = network.nodes()
+            changed = True
+        else:
+            changed = False
+            for node in nodes:
+                index = self.node_index[node]
+                self.xyz[index] = network.node_attributes(node, "xyz")
+                self.p[index] = network.node_attributes(node, ["px", "py", "pz"])
+        for node in nodes:
+            index = self.node_index[node]
+            is_anchor = bool(network.node_attribute(node, "is_anchor"))
+            if is_anchor != self.is_anchor[index]:
+                self.is_anchor[index] = is_anchor
+                changed = True
+        return changed
+
+    def _read_edges(self, edges=None):
+        """Read the edge attributes from the network and the sectional properties of the edges.
+
+        The sectional properties are cached by the network,
+        and only recomputed for edges of which the section attributes have changed.
+
+        Parameters
+        ----------
+        edges : list[tuple[int, int]], optional
+            The identifiers of the edges that should be read.
+            Default is all edges.
+
+        Returns
+        -------
+        None
+
+        """
+        from numpy import arange
+        from numpy import array
+        from numpy import float64
+
+        from compas.linalg import normrow
+
+        network = self.network
+        names = ["qpre", "fpre", "lpre", "linit"]
+        if edges is None:
+            values = network.edges_attributes_array(names)
+            self.qpre = values[:, [0]]
+            self.fpre = values[:, [1]]  # kN
+            self.lpre = values[:, [2]]  # m
+            self.linit = values[:, [3]]  # m
+            sections = network.section_properties(self.units)
+            self.A = sections.A[:, None].copy()  # m2
+            self.EA = sections.EA[:, None].copy()  # N
+            self.EI = sections.EI[:, None].copy()  # Nm2
+            indices = arange(self.num_e)
+        else:
+            edges = [network.edge_oriented(edge) for edge in edges]
+            indices = array([self.edge_index[edge] for edge in edges], dtype=int)
+            values = array([network.edge_attributes(edge, names) for edge in edges], dtype=float64).reshape((-1, 4))
+            self.qpre[indices, 0] = values[:, 0]
+            self.fpre[indices, 0] = values[:, 1]
+            self.lpre[indices, 0] = values[:, 2]
+            # initial lengths that are not set keep the value of the solver,
+            # or the current length of the edge if the solver has none
+            linit = values[:, 3]
+            unset = linit == 0
+            linit[unset] = self.linit[indices[unset], 0]
+            unset = linit == 0
+            linit[unset] = normrow(self.C[indices[unset]].dot(self.xyz))[:, 0]
+            self.linit[indices, 0] = linit
+            # the cached properties of the edges may have been updated by another solver of the network
+            sections = network.section_properties(self.units, edges)
+            self.A[indices, 0] = sections.A[indices]
+            self.EA[indices, 0] = sections.EA[indices]
+            self.EI[indices, 0] = sections.EI[indices]
+        # ----------------------------------------------------------------------
+        # reapply the overwrites of cables and splines
+        # ----------------------------------------------------------------------
+        indices = indices.tolist()
+        cables = set(self._edge_cable[i] for i in indices if i in self._edge_cable)
+        splines = set(self._edge_spline[i] for i in indices if i in self._edge_spline)
+        self._read_cables(cables)
+        self._read_splines(splines)
+
+    def _read_cables(self, cables):
+        """Overwrite the force densities of the edges of cables.
+
+        Parameters
+        ----------
+        cables : iterable[int]
+            The indices of the cables.
+
+        Returns
+        -------
+        None
+
+        """
+        for index in cables:
+            cable = self.cables[index]
+            if isinstance(self._cable_inputs[index], dict):
+                cable.qpre = self._cable_inputs[index]["qpre"]
+            self.qpre[self._cable_ei[index], 0] = cable.qpre
+
+    def _read_splines(self, splines):
+        """Compute the sectional properties of splines and overwrite the properties of the spline edges.
+        The force density, prescribed length and prescribed force of spline edges are set to zero.
+
+        Parameters
+        ----------
+        splines : iterable[int]
+            The indices of the splines.
+
+        Returns
+        -------
+        None
+
+        """
+        from numpy import float64
+        from numpy import isin
+        from numpy import zeros
+
+        splines = list(splines)
+        if not splines:
+            return
+        # the properties of the splines are computed per spline,
+        # and then scattered to their edges, stencils and segments in bulk
+        properties = zeros((len(self.splines), 8), dtype=float64)
+        for index in splines:
+            spline = self.splines[index]
+            source = self._spline_inputs[index]
+            if isinstance(source, dict):
+                spline.E = source["E"]
+                spline.radius = source["radius"]
+                spline.thickness = source["thickness"]
+                for name in ("rod", "width", "height", "G", "normal"):
+                    if name in source:
+                        setattr(spline, name, source[name])
+            data = self._spline_data[index]
+            data["A"], data["I"], data["EA"], data["EI"] = spline.section(*self.units)
+            data["rod"] = bool(spline.rod)
+            if spline.width and spline.height:
+                radius = 0.5 * max(spline.width, spline.height) * self.units.radius
+            else:
+                radius = spline.radius * self.units.radius
+            properties[index, :5] = data["A"], data["EA"], data["EI"], data["EI"], radius
+            if data["rod"]:
+                data["EI1"], data["EI2"], data["GJ"], data["Ip"] = spline.rod_section(*self.units)
+                properties[index, 2] = max(data["EI1"], data["EI2"])
+                properties[index, 5:] = data["EI1"], data["EI2"], data["GJ"]
+            else:
+                data.pop("frame", None)
+        rod = zeros(len(self.splines), dtype=bool)
+        rod[splines] = [self._spline_data[index]["rod"] for index in splines]
+        stencils = self._stencils
+        # the spline edges
+        segments = isin(stencils["edge_spline"], splines).nonzero()[0]
+        owner = stencils["edge_spline"][segments]
+        ei = stencils["edges"][segments]
+        self.qpre[ei, 0] = 0.0
+        self.lpre[ei, 0] = 0.0
+        self.fpre[ei, 0] = 0.0
+        self.A[ei, 0] = properties[owner, 0]
+        self.EA[ei, 0] = properties[owner, 1]
+        self.EI[ei, 0] = properties[owner, 2]
+        self._segment_radius[segments] = properties[owner, 4]
+        self._segment_rod[segments] = rod[owner]
+        # the stencils
+        k = isin(stencils["spline"], splines).nonzero()[0]
+        owner = stencils["spline"][k]
+        self._stencil_EI[k, 0] = properties[owner, 3]
+        self._stencil_rod[k] = rod[owner]
+        self._stencil_EI1[k] = properties[owner, 5]
+        self._stencil_EI2[k] = properties[owner, 6]
+        self._stencil_GJ[k] = properties[owner, 7]
+        # the material frames are only reset if a spline becomes a rod, or its normal changes
+        for index in splines:
+            if rod[index]:
+                spline = self.splines[index]
+                data = self._spline_data[index]
+                frame = None if spline.normal is None else tuple(spline.normal)
+                if data.get("frame", False) != frame:
+                    self._reset_frames(index, spline.normal)
+                    data["frame"] = frame
+        self._update_rods()
+        if self.contact is not None:
+            self.contact.reset()
+
+    def _reset_frames(self, index, normal=None):
+        """Align the height of the cross sections of the segments of a rod with a normal, and reset the twist.
+
+        Parameters
+        ----------
+        index : int
+            The index of the spline.
+        normal : list[float], optional
+            The direction of the height of the cross sections.
+            Default is the Z axis, or the X axis for segments parallel to it.
+
+        Returns
+        -------
+        None
+
+        """
+        from numpy import abs
+        from numpy import array
+        from numpy import float64
+        from numpy import sqrt
+
+        stencils = self._stencils
+        segments = self._spline_data[index]["segments"]
+        e = self.xyz[stencils["segment_to"][segments]] - self.xyz[stencils["segment_from"][segments]]
+        t = e / sqrt(_length_sqrd(e))[:, None]
+        normal = array([0.0, 0.0, 1.0] if normal is None else normal, dtype=float64)
+        normal = normal / sqrt((normal**2).sum())
+        n = normal[None, :].repeat(len(t), axis=0)
+        # segments parallel to the normal use the coordinate axis that is least aligned with it
+        parallel = _length_sqrd(_cross(n, t)) < 1e-12
+        n[parallel] = [1.0, 0.0, 0.0] if abs(normal[0]) < 0.5 else [0.0, 0.0, 1.0]
+        m2 = n - _dot(n, t)[:, None] * t
+        m2 /= sqrt(_length_sqrd(m2))[:, None]
+        self._tangents[segments] = t
+        self._frames[segments] = _cross(m2, t)
+        self.theta[segments] = 0.0
+        self._vtheta[segments] = 0.0
+
+    def _update_rods(self):
+        """Update the index arrays of the rods, and the segments with a free twist."""
+        from numpy import array
+        from numpy import flatnonzero
+        from numpy import zeros
+
+        if not self._segment_rod.any():
+            self._rods = None
+            return
+        stencils = self._stencils
+        k = flatnonzero(self._stencil_rod)
+        segments = flatnonzero(self._segment_rod)
+        # the twist of the end segments of a rod is fixed at anchors
+        fixed = zeros(len(self._segment_rod), dtype=bool)
+        for data in self._spline_data:
+            if data["rod"]:
+                first, last = data["segments"].start, data["segments"].stop - 1
+                fixed[first] |= bool(self.is_anchor[data["vi"][0]])
+                fixed[last] |= bool(self.is_anchor[data["vi"][-1]])
+        edges = flatnonzero(~self._segment_rod)
+        self._rods = {
+            "stencils": k,
+            "segments": segments,
+            "free": array([i for i in segments if not fixed[i]], dtype=int),
+            "edges": edges,
+            "S": stencils["S"][:, edges],
+            "Sp": stencils["Sp"][:, k],
+            "Sn": stencils["Sn"][:, k],
+        }
+
+    def _compile_contact(self):
+        """Set up the contact between the segments of the splines."""
+        from numpy import concatenate
+
+        stencils = self._stencils
+        segments = concatenate((stencils["segment_from"][:, None], stencils["segment_to"][:, None]), axis=1)
+        edges = stencils["edges"]
+        linit = self.linit[edges, 0].copy()
+        linit[linit == 0] = self.l[edges, 0][linit == 0]
+        stiffness = self.config.get("contact.stiffness")
+        if stiffness is None:
+            stiffness = self.EA[edges, 0] / linit
+        skin = self.config.get("contact.skin")
+        if skin is None:
+            skin = 0.1 * linit.mean() if len(edges) else 0.0
+        self.contact = SplineContact(segments, self._segment_radius, stiffness, skin, self.num_v)
+
+    def _contact(self):
+        """Compute the contact forces between the segments of the splines."""
+        if self.contact is not None:
+            self.c, self._contact_stiffness = self.contact.forces(self.xyz)
+
+    def _update_free(self):
+        """Update the free and fixed nodes, and the matrices and node sets that depend on them."""
+        self.fixed = [index for index, is_anchor in enumerate(self.is_anchor) if is_anchor]
+        self.free = list(set(range(self.num_v)) - set(self.fixed))
+        if self._rods is not None:
+            self._update_rods()
+        self.Cit = self.C[:, self.free].transpose()
+        self.Ct2i = self.Ct2[self.free]
+        self.membrane_nodes = list(set(self.free) - self._spline_nodes)
+        self.spline_nodes = list(set(self.free) & self._spline_nodes)
+
+    def _as_cable(self, cable):
+        if isinstance(cable, Cable):
+            return cable
+        return Cable(self.network, cable["edges"], qpre=cable["qpre"])
+
+    def _as_spline(self, spline):
+        if isinstance(spline, Spline):
+            return spline
+        return Spline(
+            self.network,
+            spline["edges"],
+            start=spline.get("start"),
+            E=spline["E"],
+            radius=spline["radius"],
+            thickness=spline["thickness"],
+            rod=spline.get("rod", False),
+            width=spline.get("width", 0.0),
+            height=spline.get("height", 0.0),
+            G=spline.get("G", 0.0),
+            normal=spline.get("normal"),
+        )
+
+    def _spline_indices(self, splines):
+        indices = []
+        for spline in splines:
+            if isinstance(spline, int):
+                indices.append(spline)
+            else:
+                indices.append(next(i for i, other in enumerate(self._spline_inputs) if other is spline))
+        return indices
+
+    def _cable_indices(self, cables):
+        indices = []
+        for cable in cables:
+            if isinstance(cable, int):
+                indices.append(cable)
+            else:
+                indices.append(next(i for i, other in enumerate(self._cable_inputs) if other is cable))
+        return indices
+
+    # --------------------------------------------------------------------------
+    # incremental updates
+    # --------------------------------------------------------------------------
+
+    def update(self, nodes=None, edges=None, cables=None, splines=None):
+        """Update the precomputed structures after local changes.
+
+        Only the attributes of the listed items are read again.
+        The state of the relaxation is kept,
+        such that the next call to :meth:`solve` starts from the previous equilibrium.
+
+        Parameters
+        ----------
+        nodes : list[int], optional
+            Nodes with modified attributes (``is_anchor``, ``px``, ``py``, ``pz``, ``x``, ``y``, ``z``).
+        edges : list[tuple[int, int]], optional
+            Edges with modified attributes (``qpre``, ``fpre``, ``lpre``, ``linit``, ``E``, ``radius``, ``thickness``).
+            Edges with a ``linit`` of zero keep the initial length of the solver.
+        cables : list[:class:`Cable` | dict | int], optional
+            Cables (or their indices) with a modified ``qpre``.
+        splines : list[:class:`Spline` | dict | int], optional
+            Splines (or their indices) with a modified ``E``, ``radius``, ``thickness``,
+            or properties of the rod model (``rod``, ``width``, ``height``, ``G``, ``normal``).
+            The material frames of a rod are only reset if it was not a rod before, or its normal has changed.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If the topology of the network has changed.
+
+        """
+        from numpy import errstate
+
+        if self.network.topology != self.topology:
+            raise ValueError("The topology of the network has changed. Create a new solver instead.")
+        with errstate(all="ignore"):
+            if nodes:
+                if self._read_nodes(nodes):
+                    self._update_free()
+            if edges:
+                self._read_edges(edges)
+            if cables:
+                self._read_cables(self._cable_indices(cables))
+            if splines:
+                self._read_splines(self._spline_indices(splines))
+        self.v[:] = 0.0
+        self._vtheta[:] = 0.0
+
+    # --------------------------------------------------------------------------
+    # helpers
+    # --------------------------------------------------------------------------
+
+    def fdensity(self, edges=None):
+        """Compute the force density contributions of prescribed forces, prescribed lengths and axial stiffness.
+
+        Parameters
+        ----------
+        edges : array-like, optional
+            The indices of the edges.
+            Default is all edges.
+
+        Returns
+        -------
+        tuple[array, array, array]
+
+        """
+        from numpy import isinf
+        from numpy import isnan
+
+        e = slice(None) if edges is None else edges
+        l = self.l[e]  # noqa: E741
+        linit = self.linit[e]
+        q_fpre = self.fpre[e] / l
+        q_lpre = self.f[e] / self.lpre[e]
+        q_EA = self.EA[e] * (l - linit) / (linit * l)
+        q_lpre[isinf(q_lpre)] = 0
+        q_lpre[isnan(q_lpre)] = 0
+        q_EA[isinf(q_EA)] = 0
+        q_EA[isnan(q_EA)] = 0
+        return q_fpre, q_lpre, q_EA
+
+    def shear(self):
+        """Compute the shear forces in the splines, and update the bending moment vectors.
+
+        The forces of splines with the rod model are computed from the bending and twisting of their material frames
+        (see :meth:`_rod`), and their bending moment vectors are the moments about the two axes of their sections.
+
+        Returns
+        -------
+        None
+
+        """
+        from numpy import float64
+        from numpy import zeros
+
+        if not self.splines:
+            return
+        stencils = self._stencils
+        rods = self._rods
+        e = slice(None) if rods is None else rods["edges"]
+        self.s = zeros((self.num_v, 3), dtype=float64)
+        m = self.m
+        mvec = self._bending(slice(None))
+        # ----------------------------------------------------------------------
+        # the forces and moments of the rods
+        # ----------------------------------------------------------------------
+        if rods is not None:
+            forces, rod_moments = self._rod(rods["stencils"], rods["segments"], rods["Sp"], rods["Sn"])
+            mvec[rods["stencils"]] = rod_moments
+            self.s += self.alpha * forces
+        # ----------------------------------------------------------------------
+        # every spline sees its own moments at its interior nodes,
+        # and the moments of the previous splines, or of the previous evaluation, at its other nodes
+        # ----------------------------------------------------------------------
+        self._moments = mvec
+        source = stencils["source"][e]
+        ends = stencils["ends"][e]
+        view = mvec[source]
+        old = source < 0
+        if old.any():
+            view[old] = m[ends[old]]
+        m[stencils["last_node"]] = mvec[stencils["last"]]
+        # multiply the shear force with alpha
+        # this scales up the shear force to allow it to compete with
+        # the axial forces in the system
+        # note that this results in fast convergence far from the target
+        # but slow convergence towards the end...
+        #
+        # view[:, 1] - view[:, 0] => mvec difference vectors of spline edges
+        # _ / l => mvec difference over length of spline edges
+        # S.dot(_) => sum of mvec difference over length of spline edges at nodes
+        dm = (view[:, 1] - view[:, 0]) / self.l[stencils["edges"][e]]
+        S = stencils["S"] if rods is None else rods["S"]
+        self.s += self.alpha * S.dot(dm)
+
+    def _bending(self, k):
+        """Compute the bending moment vectors of stencils of the splines,
+        from the circle through the center of every stencil and its neighbours.
+
+        Parameters
+        ----------
+        k : array-like | slice
+            The indices of the stencils.
+
+        Returns
+        -------
+        array
+
+        """
+        from numpy import isinf
+        from numpy import isnan
+        from numpy import sqrt
+
+        stencils = self._stencils
+        xyz = self.xyz
+        center = xyz[stencils["center"][k]]
+        a = xyz[stencils["prev"][k]] - center
+        b = xyz[stencils["next"][k]] - center
+        axb = _cross(a, b)
+        la2 = _length_sqrd(a)[:, None]
+        lb2 = _length_sqrd(b)[:, None]
+        o = 0.5 * _cross(la2 * b - lb2 * a, axb) / _length_sqrd(axb)[:, None]
+        lo = sqrt(_length_sqrd(o))[:, None]
+        uo = o / lo
+        bending = self._stencil_EI[k] / lo
+        # straight stencils have no bending moment
+        straight = (isnan(bending) | isinf(bending))[:, 0]
+        bending[straight] = 0
+        uo[straight] = 0
+        return bending * uo
+
+    def _rod(self, k, segments, Sp, Sn):
+        """Compute the forces of the bending and twisting of the segments of rods.
+
+        The rods are discrete elastic rods, with a material frame per segment
+        given by the angle of twist (:attr:`theta`) relative to a reference frame.
+        The reference frames are transported in time along the changes of the tangents of the segments,
+        and the moments of the stencils are the products of the stiffnesses of the sections
+        and the curvatures and twist of the material frames.
+
+        Parameters
+        ----------
+        k : numpy.ndarray
+            The indices of the stencils of the rods.
+        segments : numpy.ndarray
+            The indices of the segments of the same rods.
+        Sp : scipy.sparse.csr_matrix
+            The distribution of the gradients with respect to the previous segments of the stencils over the nodes.
+        Sn : scipy.sparse.csr_matrix
+            The distribution of the gradients with respect to the next segments of the stencils over the nodes.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The forces at the nodes, and the bending moment vectors of the stencils.
+
+        """
+        from numpy import arctan2
+        from numpy import bincount
+        from numpy import cos
+        from numpy import sin
+        from numpy import sqrt
+        from numpy import zeros
+
+        stencils = self._stencils
+        xyz = self.xyz
+        n = len(segments)
+        # ----------------------------------------------------------------------
+        # the material frames of the segments
+        # ----------------------------------------------------------------------
+        e = xyz[stencils["segment_to"][segments]] - xyz[stencils["segment_from"][segments]]
+        le = sqrt(_length_sqrd(e))
+        t = e / le[:, None]
+        d1 = _transport(self._tangents[segments], t, self._frames[segments])
+        d1 -= _dot(d1, t)[:, None] * t
+        d1 /= sqrt(_length_sqrd(d1))[:, None]
+        self._tangents[segments] = t
+        self._frames[segments] = d1
+        d2 = _cross(t, d1)
+        theta = self.theta[segments]
+        c = cos(theta)[:, None]
+        s = sin(theta)[:, None]
+        m1 = c * d1 + s * d2
+        m2 = c * d2 - s * d1
+        lrest = self.linit[stencils["edges"][segments], 0]
+        lrest[lrest == 0] = le[lrest == 0]
+        # ----------------------------------------------------------------------
+        # the curvatures and twist of the stencils
+        # ----------------------------------------------------------------------
+        local = zeros(len(self.theta), dtype=int)
+        local[segments] = range(n)
+        p = local[stencils["segment_prev"][k]]
+        q = local[stencils["segment_next"][k]]
+        tp = t[p]
+        tn = t[q]
+        chi = (1 + _dot(tp, tn))[:, None]
+        kb = 2 * _cross(tp, tn) / chi
+        tt = (tp + tn) / chi
+        mm1 = (m1[p] + m1[q]) / chi
+        mm2 = (m2[p] + m2[q]) / chi
+        k1 = 0.5 * _dot(kb, m2[p] + m2[q])
+        k2 = -0.5 * _dot(kb, m1[p] + m1[q])
+        u = _transport(tp, tn, d1[p])
+        twist = theta[q] - theta[p] + arctan2(_dot(_cross(u, d1[q]), tn), _dot(u, d1[q]))
+        lbar = 0.5 * (lrest[p] + lrest[q])
+        M1 = (self._stencil_EI1[k] * k1 / lbar)[:, None]
+        M2 = (self._stencil_EI2[k] * k2 / lbar)[:, None]
+        T = self._stencil_GJ[k] * twist / lbar
+        # ----------------------------------------------------------------------
+        # the gradients of the energy with respect to the segments,
+        # and with respect to the angles of twist
+        # ----------------------------------------------------------------------
+        k1 = k1[:, None]
+        k2 = k2[:, None]
+        gp = M1 * (-k1 * tt + _cross(tn, mm2)) + M2 * (-k2 * tt - _cross(tn, mm1)) + 0.5 * T[:, None] * kb
+        gn = M1 * (-k1 * tt - _cross(tp, mm2)) + M2 * (-k2 * tt + _cross(tp, mm1)) + 0.5 * T[:, None] * kb
+        gp /= le[p][:, None]
+        gn /= le[q][:, None]
+        forces = Sp.dot(gp) + Sn.dot(gn)
+        torques = bincount(p, 0.5 * (M1[:, 0] * _dot(kb, m1[p]) + M2[:, 0] * _dot(kb, m2[p])) + T, minlength=n)
+        torques += bincount(q, 0.5 * (M1[:, 0] * _dot(kb, m1[q]) + M2[:, 0] * _dot(kb, m2[q])) - T, minlength=n)
+        self._torques[segments] = torques
+        stiffness = (self._stencil_GJ[k] + (self._stencil_EI1[k] + self._stencil_EI2[k]) * _length_sqrd(kb)) / lbar
+        self._twist_stiffness[segments] = bincount(p, stiffness, minlength=n) + bincount(q, stiffness, minlength=n)
+        # the bending moment vectors, perpendicular to the average tangent
+        axis = 0.5 * (M1 * (m2[p] + m2[q]) - M2 * (m1[p] + m1[q]))
+        tm = tp + tn
+        moments = _cross(axis, tm / sqrt(_length_sqrd(tm))[:, None])
+        return forces, moments
+
+    def rk4(self, free, xyz0, v0, D, mass, dt, cb):
+        """Compute the change in velocity of the free nodes with a fourth-order Runge-Kutta scheme."""
+        xyz = self.xyz
+        p = self.p[free]
+        s = self.s[free] + self.c[free]
+
+        def acceleration(t, v):
+            # update shear forces based on the updated geometry!
+            dx = v * t
+            xyz[free] = xyz0 + dx
+            r = p + s - D.dot(xyz)
+            a = cb * r / mass
+            return a
+
+        K0 = dt * acceleration(0.0 * dt, v0)
+        K1 = dt * acceleration(0.5 * dt, v0 + 0.5 * K0)
+        K2 = dt * acceleration(0.5 * dt, v0 + 0.5 * K1)
+        K3 = dt * acceleration(1.0 * dt, v0 + 1.0 * K2)
+        dv = (1.0 * K0 + 2.0 * K1 + 2.0 * K2 + 1.0 * K3) / 6.0
+        return dv
+
+    def _evaluate(self):
+        """Evaluate the lengths, forces, shear forces and residual forces of the entire system."""
+        from numpy import errstate
+        from scipy.sparse import diags
+
+        from compas.linalg import normrow
+
+        with errstate(all="ignore"):
+            self.l = normrow(self.C.dot(self.xyz))  # noqa: E741
+            self.f = self.q * self.l
+            self.shear()
+            self._contact()
+            Q = diags([self.q.ravel()], [0])
+            self.r = self.p + self.s + self.c - self.Ct.dot(Q).dot(self.C).dot(self.xyz)
+
+    # --------------------------------------------------------------------------
+    # solve
+    # --------------------------------------------------------------------------
+
+    def step(self, dt, ca, cb):
+        """Perform one iteration of the dynamic relaxation process.
+
+        Parameters
+        ----------
+        dt : float
+            The time step.
+        ca : float
+            The damping factor of the velocities.
+        cb : float
+            The scaling factor of the accelerations.
+
+        Returns
+        -------
+        array
+            The displacements of the free nodes.
+
+        """
+        from numpy import errstate
+        from scipy.sparse import diags
+
+        from compas.linalg import normrow
+
+        free = self.free
+        C = self.C
+        with errstate(all="ignore"):
+            if self._rods is not None:
+                self._twist(dt, ca, cb)
+            qpre = self.qpre
+            q_fpre, q_lpre, q_EA = self.fdensity()
+            q = qpre + q_fpre + q_lpre + q_EA
+            self.q[:] = q
+            Q = diags([q.ravel()], [0])
+            D = self.Cit.dot(Q).dot(C)
+            # relax
+            stiffness = qpre + q_fpre + q_lpre + self.EA / self.linit + 4 * self.EI / self.l**3
+            mass = 0.5 * dt**2 * self.Ct2i.dot(stiffness)
+            if self.contact is not None:
+                mass += 0.5 * dt**2 * self._contact_stiffness[free][:, None]
+            xyz0 = self.xyz[free]
+            v0 = ca * self.v[free]
+            dv = self.rk4(free, xyz0, v0, D, mass, dt, cb)
+            v = v0 + dv
+            dx = v * dt
+            if self.contact is not None:
+                # the segments of the splines cannot pass through each other in a single step
+                scale = (self.contact.limits[free] / normrow(dx)[:, 0]).clip(max=1.0)[:, None]
+                dx *= scale
+                v *= scale
+            self.v[free] = v
+            self.xyz[free] = xyz0 + dx
+            # update
+            self.l[:] = normrow(C.dot(self.xyz))
+            self.f[:] = q * self.l
+            self.shear()
+            self._contact()
+            self.r[:] = self.p + self.s + self.c - self.Ct.dot(Q).dot(C).dot(self.xyz)
+        return dx
+
+    # --------------------------------------------------------------------------
+    # active regions
+    # --------------------------------------------------------------------------
+
+    def _active_region(self, tol, halo):
+        """Select the free nodes that are not in equilibrium, plus a halo of neighbours,
+        and compile the structures for relaxing only those nodes.
+
+        The nodes with the smallest residual forces are inactive,
+        as long as the norm of their residual forces is below the tolerance.
+
+        Parameters
+        ----------
+        tol : float
+            The tolerance for the norm of the residual forces of the inactive nodes.
+        halo : int
+            The number of rings of neighbours added to the active nodes.
+
+        Returns
+        -------
+        dict | None
+            The active region, or None if it is too large for a localized relaxation to pay off.
+
+        """
+        from numpy import abs
+        from numpy import argsort
+        from numpy import bool_
+        from numpy import cumsum
+        from numpy import flatnonzero
+        from numpy import zeros
+
+        free = zeros(self.num_v, dtype=bool_)
+        free[self.free] = True
+        residuals = _length_sqrd(self.r[self.free])
+        order = argsort(residuals)
+        active = zeros(self.num_v, dtype=bool_)
+        active[[self.free[i] for i in order[cumsum(residuals[order]) > tol**2]]] = True
+        incidence = abs(self.C)
+        for _ in range(halo):
+            active |= incidence.T.dot(incidence.dot(active)) > 0
+        active &= free
+        nodes = flatnonzero(active)
+        # the localized iterations have an overhead per iteration,
+        # and only pay off if the active region is a small part of the network
+        if len(nodes) > 0.5 * len(self.free):
+            return None
+        edges = flatnonzero(incidence.dot(active))
+        C = self.C[edges]
+        stencils = self._stencils
+        k = flatnonzero(active[stencils["center"]] | active[stencils["prev"]] | active[stencils["next"]])
+        segments = flatnonzero(active[stencils["segment_from"]] | active[stencils["segment_to"]])
+        changed = zeros(len(stencils["center"]), dtype=bool_)
+        changed[k] = True
+        last = changed[stencils["last"]]
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "C": C,
+            "Cit": C[:, nodes].transpose().tocsr(),
+            "Ct2i": self.Ct2[nodes][:, edges],
+            "stencils": k,
+            "segments": segments,
+            "S": stencils["S"][nodes][:, segments],
+            "last_node": stencils["last_node"][last],
+            "last": stencils["last"][last],
+        }
+
+    def _local_step(self, region, dt, ca, cb):
+        """Perform one iteration of the dynamic relaxation process, restricted to an active region.
+
+        Only the edges and the stencils of the splines with a node in the region are evaluated.
+        The residual forces, shear forces and velocities of the other nodes are those of the last full iteration.
+
+        Parameters
+        ----------
+        region : dict
+            The active region, see :meth:`_active_region`.
+        dt : float
+            The time step.
+        ca : float
+            The damping factor of the velocities.
+        cb : float
+            The scaling factor of the accelerations.
+
+        Returns
+        -------
+        array
+            The displacements of the nodes of the region.
+
+        """
+        from numpy import errstate
+        from scipy.sparse import diags
+
+        from compas.linalg import normrow
+
+        nodes = region["nodes"]
+        edges = region["edges"]
+        C = region["C"]
+        with errstate(all="ignore"):
+            qpre = self.qpre[edges]
+            q_fpre, q_lpre, q_EA = self.fdensity(edges)
+            q = qpre + q_fpre + q_lpre + q_EA
+            self.q[edges] = q
+            Q = diags([q.ravel()], [0])
+            D = region["Cit"].dot(Q).dot(C)
+            # relax
+            stiffness = (
+                qpre + q_fpre + q_lpre + self.EA[edges] / self.linit[edges] + 4 * self.EI[edges] / self.l[edges] ** 3
+            )
+            mass = 0.5 * dt**2 * region["Ct2i"].dot(stiffness)
+            xyz0 = self.xyz[nodes]
+            v0 = ca * self.v[nodes]
+            dv = self.rk4(nodes, xyz0, v0, D, mass, dt, cb)
+            v = v0 + dv
+            dx = v * dt
+            self.v[nodes] = v
+            self.xyz[nodes] = xyz0 + dx
+            # update
+            self.l[edges] = normrow(C.dot(self.xyz))
+            self.f[edges] = q * self.l[edges]
+            self._local_shear(region)
+            self.r[nodes] = self.p[nodes] + self.s[nodes] + self.c[nodes] - D.dot(self.xyz)
+        return dx
+
+    def _local_shear(self, region):
+        """Compute the shear forces at the nodes of an active region,
+        from the bending moments of the stencils with a node in the region.
+
+        Parameters
+        ----------
+        region : dict
+            The active region, see :meth:`_active_region`.
+
+        Returns
+        -------
+        None
+
+        """
+        if not self.splines:
+            return
+        stencils = self._stencils
+        segments = region["segments"]
+        self._moments[region["stencils"]] = self._bending(region["stencils"])
+        source = stencils["source"][segments]
+        ends = stencils["ends"][segments]
+        view = self._moments[source]
+        old = source < 0
+        if old.any():
+            view[old] = self.m[ends[old]]
+        self.m[region["last_node"]] = self._moments[region["last"]]
+        dm = (view[:, 1] - view[:, 0]) / self.l[stencils["edges"][segments]]
+        self.s[region["nodes"]] = self.alpha * region["S"].dot(dm)
+
+    def _twist(self, dt, ca, cb):
+        """Relax the angles of twist of the free segments of the rods, with the torques of the last evaluation."""
+        segments = self._rods["free"]
+        # segments without stencils have no torque
+        segments = segments[self._twist_stiffness[segments] > 0]
+        mass = 0.5 * dt**2 * self._twist_stiffness[segments]
+        self._vtheta[segments] = ca * self._vtheta[segments] + cb * dt * self._torques[segments] / mass
+        self.theta[segments] += self._vtheta[segments] * dt
+
+    def solve(self, token=None):
+        """Relax the system towards equilibrium, starting from the current state,
+        and write the results to the network.
+
+        With ``config["contact"]`` set to True, the segments of the splines repel each other
+        when they are closer than the sum of the radii of their sections (see :class:`SplineContact`).
+        The contact forces (``c``) are penalty forces with a stiffness of ``config["contact.stiffness"]``,
+        by default the smaller axial stiffness of the two edges in contact,
+        and the candidate pairs of segments are updated when a segment has moved more than
+        half of ``config["contact.skin"]``, by default a tenth of the average length of the edges of the splines.
+
+        The solve can be limited with the following budgets, checked every ``config["kdiv"]`` iterations.
+
+        * ``config["tmax"]``: the maximum wall-clock time in seconds.
+        * ``config["kalpha"]``: the maximum number of iterations per level of the shear scaling factor (alpha).
+          When the budget of a level is exhausted, alpha is reduced to the next level,
+          or the solve is stopped if alpha is already 1.
+
+        If the solve is stopped before convergence, the current state is written to the network,
+        and the reason is recorded in the convergence history.
+
+        With ``config["active"]`` set to True, the iterations are restricted to the active region of the network,
+        once most of the network is in equilibrium.
+        The inactive nodes are the free nodes with the smallest residual forces,
+        such that the norm of their residual forces stays below ``config["active.tol"]``
+        (by default half of the smaller of ``tol1`` and ``tol2``).
+        The active region consists of all other free nodes, plus ``config["active.halo"]`` rings of neighbours (2).
+        Only the edges of the region and the stencils of the splines through it are evaluated,
+        such that the cost of an iteration is proportional to the size of the region.
+        Inactive nodes keep their velocities, and continue moving when they become active again.
+        The last iteration of every ``config["kdiv"]`` iterations relaxes the entire network,
+        for checking the convergence and selecting a new active region.
+        The active region is not used for splines with the rod model or with contact.
+
+        Parameters
+        ----------
+        token : :class:`CancellationToken`, optional
+            A token for cancelling the solve from another thread or process.
+
+        Returns
+        -------
+        iterations : dict
+            The convergence history,
+            with ``iterations["converged"]`` a flag indicating if the solve converged,
+            and ``iterations["status"]`` one of
+            ``"converged"``, ``"kmax"``, ``"kalpha"``, ``"tmax"``, ``"cancelled"``.
+
+        See Also
+        --------
+        :meth:`iterate`
+
+        """
+        for _ in self.iterate(token=token):
+            pass
+        return self.iterations
+
+    def iterate(self, every=None, token=None):
+        """Relax the system towards equilibrium, like :meth:`solve`,
+        but yield a snapshot of the state of the relaxation at regular intervals.
+
+        The results are written to the network when the iterations are complete.
+        If the consumer stops iterating early, the network is not modified,
+        but the current state can still be written with :meth:`write`.
+
+        Parameters
+        ----------
+        every : int, optional
+            The number of iterations between snapshots.
+            Default is ``config["kdiv"]``.
+        token : :class:`CancellationToken`, optional
+            A token for cancelling the solve from another thread or process.
+
+        Yields
+        ------
+        :class:`SolverSnapshot`
+            A read-only view on the current state of the solver.
+            The view is only valid until the next snapshot.
+
+        Examples
+        --------
+        >>> solver = BendSolver(network, config=config)  # doctest: +SKIP
+        >>> for snapshot in solver.iterate(every=10):  # doctest: +SKIP
+        ...     viewer.update(snapshot.xyz)
+        ...     if snapshot.crit1 < 1e-2:
+        ...         break
+        >>> solver.write()  # doctest: +SKIP
+
+        Notes
+        -----
+        Floating point errors of NumPy are ignored during the iterations,
+        but the error state is not changed while a snapshot is handed to the consumer.
+        With ``config["active"]``, the residual forces of the inactive nodes in a snapshot
+        are those of the last iteration over the entire network.
+
+        """
+        from numpy import float64
+        from numpy import hypot
+        from numpy import zeros
+        from numpy.linalg import norm
+
+        config = self.config
+        # ----------------------------------------------------------------------
+        # solver parameters
+        # ----------------------------------------------------------------------
+        kmax = config.get("kmax", 10000)
+        kmax = int(kmax)
+        kdiv = config.get("kdiv", 100)
+        kdiv = int(kdiv)
+        every = int(every or kdiv)
+        dt = 1.0
+        cc = 0.1
+        ca = (1 - cc * 0.5) / (1 + cc * 0.5)
+        cb = 0.5 * (1 + ca)
+        tol1 = config.get("tol1", 1e-3)
+        tol2 = config.get("tol2", 1e-2)
+        tol3 = config.get("tol3", 1e-6)
+        tmax = config.get("tmax")
+        kalpha = config.get("kalpha")
+        active = config.get("active", False) and self._rods is None and self.contact is None
+        atol = config.get("active.tol", 0.5 * min(tol1, tol2))
+        halo = config.get("active.halo", 2)
+        # ----------------------------------------------------------------------
+        # bracket the iterations
+        # ----------------------------------------------------------------------
+        kmax = max(1, kmax // kdiv)
+        kalpha = max(1, int(kalpha) // kdiv) if kalpha else None
+        # ----------------------------------------------------------------------
+        # start iterating
+        # ----------------------------------------------------------------------
+        crit1 = 1000
+        crit2 = 1000
+        crit3 = 1000
+        dx = zeros((self.num_v, 3), dtype=float64)
+        iterations = self.iterations = {"membrane": {}, "spline": {}, "displacements": {}}
+        status = "kmax"
+        start = perf_counter()
+        level = 0
+        region = None
+        if active:
+            # after local changes, the iterations can be restricted to the region around the changes right away
+            self._evaluate()
+            region = self._active_region(atol, halo)
+        for i in range(kmax):
+            alpha = self.alpha
+            if crit1 < tol1 and crit2 < tol2:
+                if self.alpha == 1:
+                    break
+                self.alpha = ceil(0.5 * self.alpha)
+            if crit3 < tol3:
+                if self.alpha == 1:
+                    break
+                self.alpha = ceil(0.5 * self.alpha)
+            # budgets and cancellation
+            if self.alpha != alpha:
+                level = 0
+            if kalpha and level >= kalpha:
+                if self.alpha == 1:
+                    status = "kalpha"
+                    break
+                self.alpha = ceil(0.5 * self.alpha)
+                level = 0
+            if token is not None and token.cancelled:
+                status = "cancelled"
+                break
+            if tmax is not None and perf_counter() - start > tmax:
+                status = "tmax"
+                break
+            # with an active region, all but the last iteration of the bracket are restricted to the region
+            if region is not None:
+                dx[:] = 0.0
+            for j in range(kdiv):
+                k = i * kdiv + j
+                if region is None or j == kdiv - 1:
+                    dx[self.free] = self.step(dt, ca, cb)
+                else:
+                    dx[region["nodes"]] = self._local_step(region, dt, ca, cb)
+                if (k + 1) % every == 0:
+                    yield SolverSnapshot(self, k, dx)
+            if active:
+                region = self._active_region(atol, halo)
+            # convergence
+            crit1 = norm(self.r[self.membrane_nodes])
+            crit2 = norm(self.r[self.spline_nodes])
+            if self._rods is not None:
+                crit2 = hypot(crit2, norm(self._torques[self._rods["free"]]))
+            crit3 = norm(dx[self.free])
+            iterations["membrane"][str(k)] = crit1
+            iterations["spline"][str(k)] = crit2
+            iterations["displacements"][str(k)] = crit3
+            level += 1
+        if self.alpha == 1 and ((crit1 < tol1 and crit2 < tol2) or crit3 < tol3):
+            status = "converged"
+        iterations["status"] = status
+        iterations["converged"] = status == "converged"
+        self.write()
+
+    def write(self):
+        """Write the current state of the solver to the network.
+
+        Returns
+        -------
+        None
+
+        """
+        from numpy import hstack
+
+        nodes = hstack((self.xyz, self.r, self.s, self.m))
+        edges = hstack((self.q, self.f, self.l, self.linit))
+        self.network.nodes_attributes_array(NODE_RESULTS, nodes)
+        self.network.edges_attributes_array(EDGE_RESULTS, edges)
+
+
+class SolverSnapshot(object):
+    """
+    Read-only view on the state of a :class:`BendSolver` during the iterations.
+
+    The coordinates are not copied,
+    and therefore reflect the current state of the solver, also after the iterations continue.
+    Use :meth:`copy` to keep the state of a specific iteration.
+
+    Parameters
+    ----------
+    solver : :class:`BendSolver`
+    k : int
+        The iteration number.
+    dx : array
+        The displacements of the nodes during the last iteration.
+
+    Attributes
+    ----------
+    k : int
+        The iteration number.
+    alpha : float
+        The scaling factor of the shear forces at the time of the snapshot.
+    crit1 : float
+        The norm of the residual forces at the nodes of the membrane.
+    crit2 : float
+        The norm of the residual forces at the nodes of the splines.
+    crit3 : float
+        The norm of the displacements of the free nodes during the last iteration.
+    xyz : array
+        A read-only view on the coordinates of the nodes.
+
+    """
+
+    __slots__ = ("k", "alpha", "crit1", "crit2", "crit3", "xyz")
+
+    def __init__(self, solver, k, dx):
+        from numpy.linalg import norm
+
+        self.k = k
+        self.alpha = solver.alpha
+        self.crit1 = norm(solver.r[solver.membrane_nodes])
+        self.crit2 = norm(solver.r[solver.spline_nodes])
+        self.crit3 = norm(dx[solver.free])
+        self.xyz = solver.xyz.view()
+        self.xyz.flags.writeable = False
+
+    def __repr__(self):
+        return "SolverSnapshot(k={}, alpha={}, crit1={:.3e}, crit2={:.3e}, crit3={:.3e})".format(
+            self.k, self.alpha, self.crit1, self.crit2, self.crit3
+        )
+
+    def copy(self):
+        """Make a snapshot with a copy of the coordinates, independent of the state of the solver.
+
+        Returns
+        -------
+        :class:`SolverSnapshot`
+
+        """
+        snapshot = object.__new__(SolverSnapshot)
+        for name in self.__slots__:
+            setattr(snapshot, name, getattr(self, name))
+        snapshot.xyz = self.xyz.copy()
+        snapshot.xyz.flags.writeable = False
+        return snapshot
+
+
+class CancellationToken(object):
+    """
+    Token for cooperative cancellation of a solve.
+
+    The solver checks the token every ``config["kdiv"]`` iterations,
+    and stops with a partial result if it has been cancelled.
+
+    Parameters
+    ----------
+    event : :class:`threading.Event` | :class:`multiprocessing.Event`, optional
+        The underlying event.
+        Use an event of a :class:`multiprocessing.Manager` to cancel solves running in other processes.
+        Default is a new :class:`threading.Event`.
+
+    Examples
+    --------
+    >>> token = CancellationToken()
+    >>> token.cancelled
+    False
+    >>> token.cancel()
+    >>> token.cancelled
+    True
+
+    """
+
+    __slots__ = ("event",)
+
+    def __init__(self, event=None):
+        if event is None:
+            event = threading.Event()
+        self.event = event
+
+    @property
+    def cancelled(self):
+        """bool : True if the token has been cancelled."""
+        return self.event.is_set()
+
+    def cancel(self):
+        """Cancel the solves using this token.
+
+        Returns
+        -------
+        None
+
+        """
+        self.event.set()
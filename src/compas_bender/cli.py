@@ -0,0 +1,355 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import csv
+import json
+import os
+import sys
+from time import perf_counter
+
+import compas
+from compas_bender.bend import SolveCache
+from compas_bender.bend import bend_splines
+from compas_bender.datastructures import BendNetwork
+from compas_bender.files import npz_dump
+from compas_bender.files import npz_load
+
+EXTENSIONS = (".json", ".npz")
+SUMMARY = [
+    "model",
+    "output",
+    "status",
+    "converged",
+    "iterations",
+    "membrane",
+    "spline",
+    "displacements",
+    "time_load",
+    "time_solve",
+    "time_write",
+    "error",
+]
+
+
+# ==============================================================================
+# Models
+# ==============================================================================
+
+
+def load_model(filepath):
+    """Load the network and the solver configuration of a model.
+
+    Parameters
+    ----------
+    filepath : str
+        A COMPAS JSON file or a bend network archive (``.npz``),
+        with a :class:`compas_bender.datastructures.BendNetwork`,
+        or a dict with the network under ``"network"`` and optionally the solver configuration under ``"config"``.
+
+    Returns
+    -------
+    tuple[:class:`compas_bender.datastructures.BendNetwork`, dict]
+        The network and the configuration stored with the model.
+
+    Raises
+    ------
+    ValueError
+        If the file doesn't contain a bend network.
+
+    """
+    if filepath.endswith(".npz"):
+        data = npz_load(filepath)
+    else:
+        data = compas.json_load(filepath)
+    if isinstance(data, BendNetwork):
+        return data, {}
+    if isinstance(data, dict) and isinstance(data.get("network"), BendNetwork):
+        return data["network"], dict(data.get("config") or {})
+    raise ValueError("The file does not contain a bend network: {}".format(filepath))
+
+
+def save_result(filepath, network, iterations, config):
+    """Save the network with the results of a solve, together with the convergence history and the configuration.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the output file.
+        Files with the extension ``.json`` are written as COMPAS JSON, all others as bend network archives.
+    network : :class:`compas_bender.datastructures.BendNetwork`
+    iterations : dict
+    config : dict
+
+    Returns
+    -------
+    None
+
+    """
+    folder = os.path.dirname(filepath)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    data = {"network": network, "iterations": iterations, "config": config}
+    if filepath.endswith(".json"):
+        compas.json_dump(data, filepath)
+    else:
+        npz_dump(data, filepath)
+
+
+def find_models(paths):
+    """Collect the model files in a list of files and folders.
+
+    Parameters
+    ----------
+    paths : list[str]
+        Model files, or folders with model files.
+        Only the ``.json`` and ``.npz`` files directly in a folder are collected.
+
+    Returns
+    -------
+    list[str]
+
+    """
+    models = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(name for name in os.listdir(path) if name.endswith(EXTENSIONS))
+            models += [os.path.join(path, name) for name in names]
+        else:
+            models.append(path)
+    return models
+
+
+def _solve(model, output, config, cache):
+    """Solve a model, and return a row of the summary."""
+    row = dict.fromkeys(SUMMARY, "")
+    row["model"] = model
+    row["output"] = output or ""
+    try:
+        t0 = perf_counter()
+        network, stored = load_model(model)
+        stored.update(config)
+        config = stored
+        t1 = perf_counter()
+        iterations = bend_splines(network, config=config, cache=SolveCache(cache) if cache else None)
+        t2 = perf_counter()
+        if output:
+            save_result(output, network, iterations, config)
+        t3 = perf_counter()
+    except Exception as e:
+        row["status"] = "error"
+        row["converged"] = False
+        row["error"] = "{}: {}".format(type(e).__name__, e)
+        return row
+    keys = list(iterations["membrane"])
+    row["status"] = iterations["status"]
+    row["converged"] = iterations["converged"]
+    row["iterations"] = int(keys[-1]) + 1 if keys else 0
+    for name in ("membrane", "spline", "displacements"):
+        row[name] = float(iterations[name][keys[-1]]) if keys else ""
+    row["time_load"] = t1 - t0
+    row["time_solve"] = t2 - t1
+    row["time_write"] = t3 - t2
+    return row
+
+
+# ==============================================================================
+# Commands
+# ==============================================================================
+
+
+def _value(text):
+    key, sep, value = text.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError("Expected KEY=VALUE: {}".format(text))
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def _shard(text):
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("Expected INDEX/COUNT: {}".format(text))
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError("Invalid shard: {}".format(text))
+    return index, count
+
+
+def _outputs(models, out, fmt):
+    if not out:
+        return [None] * len(models)
+    if out.endswith(EXTENSIONS):
+        if len(models) > 1:
+            raise ValueError("Multiple models require an output folder instead of a file: {}".format(out))
+        return [out]
+    names = [os.path.splitext(os.path.basename(model))[0] for model in models]
+    if len(set(names)) != len(names):
+        raise ValueError("The output folder cannot be used for models with the same name.")
+    return [os.path.join(out, name + fmt) for name in names]
+
+
+def write_summary(filepath, rows):
+    """Write the summary of a batch of solves to a JSON or CSV file.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the summary file.
+        Files with the extension ``.csv`` are written as CSV, all others as JSON.
+    rows : list[dict]
+
+    Returns
+    -------
+    None
+
+    """
+    if filepath.endswith(".csv"):
+        with open(filepath, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(filepath, "w") as f:
+            json.dump(rows, f, indent=4)
+
+
+def solve(args):
+    """Run the ``solve`` command.
+
+    Parameters
+    ----------
+    args : :class:`argparse.Namespace`
+
+    Returns
+    -------
+    int
+        The exit code.
+
+    """
+    models = find_models(args.models)
+    if args.shard:
+        index, count = args.shard
+        models = models[index::count]
+    if not models:
+        print("No models found.", file=sys.stderr)
+        return 1
+
+    config = {}
+    if args.config:
+        with open(args.config, "r") as f:
+            config.update(json.load(f))
+    config.update(args.set)
+
+    outputs = _outputs(models, args.out, args.format)
+    tasks = [(model, output, config, args.cache) for model, output in zip(models, outputs)]
+
+    rows = [None] * len(tasks)
+    if args.jobs == 1 or len(tasks) == 1:
+        for index, task in enumerate(tasks):
+            rows[index] = _report(_solve(*task), args.quiet)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures import as_completed
+
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = {executor.submit(_solve, *task): index for index, task in enumerate(tasks)}
+            for future in as_completed(futures):
+                rows[futures[future]] = _report(future.result(), args.quiet)
+
+    if args.summary:
+        write_summary(args.summary, rows)
+
+    failed = [row for row in rows if row["status"] == "error" or (args.strict and not row["converged"])]
+    return 1 if failed else 0
+
+
+def _report(row, quiet):
+    if not quiet:
+        if row["status"] == "error":
+            print("{model}: error: {error}".format(**row), file=sys.stderr)
+        else:
+            print("{model}: {status} ({iterations} iterations, {time_solve:.2f}s)".format(**row))
+        sys.stdout.flush()
+    return row
+
+
+def parser():
+    """Construct the parser of the command line interface.
+
+    Returns
+    -------
+    :class:`argparse.ArgumentParser`
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m compas_bender",
+        description="Form finding of bending active structures from the command line.",
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    command = commands.add_parser(
+        "solve",
+        help="solve one or more models",
+        description="Solve models and write the networks with the results.",
+    )
+    command.add_argument("models", nargs="+", help="model files (.json, .npz), or folders with model files")
+    command.add_argument("--config", help="a JSON file with the solver configuration")
+    command.add_argument(
+        "--set",
+        type=_value,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="a configuration option, overriding the configuration file (e.g. --set kmax=20000)",
+    )
+    command.add_argument(
+        "--out",
+        help="the output file (.npz, .json) for a single model, or the output folder for multiple models",
+    )
+    command.add_argument(
+        "--format",
+        choices=EXTENSIONS,
+        default=".npz",
+        help="the format of the output files in an output folder (default: .npz)",
+    )
+    command.add_argument("--summary", help="a JSON or CSV file with the status, convergence and timings of the solves")
+    command.add_argument("--jobs", "-j", type=int, default=1, help="the number of parallel worker processes")
+    command.add_argument(
+        "--shard",
+        type=_shard,
+        metavar="INDEX/COUNT",
+        help="solve only every COUNT-th model, starting from INDEX (e.g. for job arrays)",
+    )
+    command.add_argument("--cache", help="a folder for caching solve results")
+    command.add_argument("--strict", action="store_true", help="exit with an error if a solve doesn't converge")
+    command.add_argument("--quiet", "-q", action="store_true", help="don't report the progress")
+    command.set_defaults(func=solve)
+    return parser
+
+
+def main(argv=None):
+    """Run the command line interface.
+
+    Parameters
+    ----------
+    argv : list[str], optional
+        The command line arguments.
+        Default is ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        The exit code.
+
+    """
+    args = parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print("error: {}".format(e), file=sys.stderr)
+        return 1
@@ -2,6 +2,11 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+from .elements import Cable
+from .elements import Spline
+from .sections import SectionProperties
+from .sections import SectionUnits
+from .sections import section_constants
 from .bendnetwork import BendNetwork
 
-__all__ = ["BendNetwork"]
+__all__ = ["BendNetwork", "Cable", "Spline", "SectionProperties", "SectionUnits", "section_constants"]
@@ -6,6 +6,17 @@ from compas.datastructures import Network
 from compas.geometry import Line
 from compas.geometry import Point
 from compas.geometry import Vector
+from compas.tolerance import TOL
+
+from .columns import AttributeColumns
+from .columns import AttributeRow
+from .elements import Cable
+from .elements import Spline
+from .sections import SectionProperties
+from .sections import SectionUnits
+
+NODE_COLUMNS = ["x", "y", "z", "px", "py", "pz", "rx", "ry", "rz", "sx", "sy", "sz", "mx", "my", "mz"]
+EDGE_COLUMNS = ["qpre", "fpre", "lpre", "linit", "E", "radius", "thickness", "width", "height", "q", "f", "l"]
 
 
 class BendNetwork(Network):
@@ -26,6 +37,7 @@ class BendNetwork(Network):
 
     **edges**
 
+    * ``is_tie`` : `False`
     * ``qpre`` : `1.0`
     * ``fpre`` : `0.0`
     * ``lpre`` : `0.0`
@@ -33,17 +45,39 @@ class BendNetwork(Network):
     * ``E`` : `0.0`
     * ``radius`` : `0.0`
     * ``thickness`` : `0.0`
+    * ``width`` : `0.0`
+    * ``height`` : `0.0`
 
     These attributes define the properties of the struts, ties, cablenets, and bending-active splines in the system.
     And a re then used by :func:`compas_bender.bend.bend_splines`
     to solve for equilibrium under the given boundary conditions.
+    The section of an edge is rectangular if its width and height are not zero,
+    a solid circle if its thickness is not smaller than its radius, and a tube otherwise
+    (see :meth:`section_properties`).
+
+    With ``columnar=True``, the numerical attributes used by the solvers
+    (coordinates, loads, residuals, shears, moments, and all edge attributes listed above)
+    are stored in contiguous columns instead of per-element dicts (see :meth:`set_columnar`).
 
     """
 
     def __init__(self, *args, **kwargs):
+        columnar = kwargs.pop("columnar", False)
         super(BendNetwork, self).__init__(*args, **kwargs)
         self.cables = []
         self.splines = []
+        self._topology = 0
+        self._node_index = None
+        self._index_node = None
+        self._edge_index = None
+        self._edge_index_undirected = None
+        self._index_edge = None
+        self._edges_array = None
+        self._node_rows = None
+        self._edge_rows = None
+        self._node_columns = None
+        self._edge_columns = None
+        self._sections = {}
         self.default_node_attributes.update(
             {
                 "is_anchor": False,
@@ -63,6 +97,7 @@ class BendNetwork(Network):
         )
         self.default_edge_attributes.update(
             {
+                "is_tie": False,
                 "qpre": 1.0,
                 "fpre": 0.0,
                 "lpre": 0.0,
@@ -70,11 +105,219 @@ class BendNetwork(Network):
                 "E": 0.0,
                 "radius": 0.0,
                 "thickness": 0.0,
+                "width": 0.0,
+                "height": 0.0,
                 "q": 0.0,
                 "f": 0.0,
                 "l": 0.0,
             }
         )
+        if columnar:
+            self.set_columnar(True)
+
+    @property
+    def __data__(self):
+        data = super(BendNetwork, self).__data__
+        if self.is_columnar:
+            data["node"] = {key: dict(attr) for key, attr in data["node"].items()}
+            data["edge"] = {u: {v: dict(attr) for v, attr in nbrs.items()} for u, nbrs in data["edge"].items()}
+        data["splines"] = [spline.__data__ for spline in self.splines]
+        data["cables"] = [cable.__data__ for cable in self.cables]
+        return data
+
+    @classmethod
+    def __from_data__(cls, data):
+        network = super(BendNetwork, cls).__from_data__(data)
+        for spline in data.get("splines") or []:
+            network.splines.append(Spline.__from_data__(spline, network))
+        for cable in data.get("cables") or []:
+            network.cables.append(Cable.__from_data__(cable, network))
+        return network
+
+    def to_npz(self, filepath):
+        """Write the network, including its splines and cables, to a binary archive.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file.
+
+        Returns
+        -------
+        None
+
+        See Also
+        --------
+        :func:`compas_bender.files.npz_dump`
+
+        """
+        from compas_bender.files import npz_dump
+
+        npz_dump(self, filepath)
+
+    @classmethod
+    def from_npz(cls, filepath, mmap=False, columnar=None):
+        """Construct a network from a binary archive written by :meth:`to_npz`.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file.
+        mmap : bool, optional
+            If True, map the arrays of the archive into memory instead of reading them.
+        columnar : bool, optional
+            If True, use columnar storage.
+            If False, use per-element dicts.
+            Default is the storage mode of the network when it was written.
+
+        Returns
+        -------
+        :class:`compas_bender.datastructures.BendNetwork`
+
+        See Also
+        --------
+        :func:`compas_bender.files.npz_load`
+
+        """
+        from compas_bender.files import npz_load
+
+        network = npz_load(filepath, mmap=mmap, columnar=columnar)
+        if not isinstance(network, cls):
+            raise ValueError("The archive does not contain a single network of type {}.".format(cls.__name__))
+        return network
+
+    @classmethod
+    def from_lines_with_features(cls, lines, anchors=None, splines=None, cables=None, ties=None, tol=None):
+        """Construct a network from lines, and identify anchors, splines, cables and ties from additional geometry.
+
+        The end points of the lines are merged into nodes if they are closer than the tolerance.
+        Every end point is merged with the first end point before it within the tolerance that starts a new node,
+        such that all end points of a node are within the tolerance of the location of the node,
+        which is the location of its first end point.
+        The anchor points, the vertices of the spline and cable polylines, and the end points of the tie lines,
+        are snapped in bulk to the nearest node within the tolerance.
+        Geometry that doesn't match any nodes or edges of the network is ignored.
+
+        Parameters
+        ----------
+        lines : list[[point, point]]
+            The lines defining the edges of the network.
+        anchors : list[point], optional
+            The locations of the anchored nodes.
+        splines : list[list[point]], optional
+            A polyline per spline, along consecutive edges of the network.
+        cables : list[list[point]], optional
+            A polyline per cable, along edges of the network.
+        ties : list[[point, point]], optional
+            The lines of the edges that are ties.
+            Tie edges are identified by the ``is_tie`` attribute.
+        tol : float, optional
+            The snapping tolerance.
+            Default is ``10 ** -TOL.precision``, matching the resolution of geometric keys.
+
+        Returns
+        -------
+        :class:`compas_bender.datastructures.BendNetwork`
+
+        Raises
+        ------
+        ValueError
+            If the matched edges of a spline do not form a continuous chain.
+
+        Examples
+        --------
+        >>> network = BendNetwork.from_lines_with_features(lines, anchors=points, splines=polylines)  # doctest: +SKIP
+        >>> network.splines  # doctest: +SKIP
+
+        """
+        from numpy import arange
+        from numpy import asarray
+        from numpy import concatenate
+        from numpy import cumsum
+        from numpy import isinf
+        from numpy import ones
+        from numpy import sort
+        from numpy import unique
+        from scipy.sparse import coo_matrix
+        from scipy.spatial import cKDTree
+
+        if tol is None:
+            tol = 10**-TOL.precision
+
+        # merge the end points of the lines into nodes, numbered in order of first appearance.
+        # every point is merged into the first earlier point within the tolerance that is itself not merged,
+        # such that nodes don't chain together points that are further apart than the tolerance.
+        points = asarray(lines, dtype=float).reshape((-1, 3))
+        pairs = cKDTree(points).query_pairs(tol, output_type="ndarray")
+        rows = concatenate((pairs[:, 0], pairs[:, 1]))
+        cols = concatenate((pairs[:, 1], pairs[:, 0]))
+        neighbors = coo_matrix((ones(len(rows)), (rows, cols)), shape=(len(points), len(points))).tocsr()
+        neighbors.sort_indices()
+        indptr = neighbors.indptr.tolist()
+        indices = neighbors.indices.tolist()
+        labels = arange(len(points)).tolist()
+        merged = [False] * len(points)
+        for i in unique(rows).tolist():
+            if merged[i]:
+                continue
+            for j in indices[indptr[i] : indptr[i + 1]]:
+                if j > i and not merged[j]:
+                    labels[j] = i
+                    merged[j] = True
+        _, first, inverse = unique(labels, return_index=True, return_inverse=True)
+        xyz = points[first]
+        uv = inverse.reshape((-1, 2))
+
+        # drop collapsed lines and duplicate lines, regardless of their orientation
+        uv = uv[uv[:, 0] != uv[:, 1]]
+        _, index = unique(sort(uv, axis=1), axis=0, return_index=True)
+        uv = uv[sort(index)]
+
+        network = cls()
+        for key, (x, y, z) in enumerate(xyz.tolist()):
+            network.add_node(key, x=x, y=y, z=z)
+        for u, v in uv.tolist():
+            network.add_edge(u, v)
+
+        tree = cKDTree(xyz)
+
+        def snap(points):
+            if not len(points):
+                return []
+            distance, index = tree.query(asarray(points, dtype=float).reshape((-1, 3)), distance_upper_bound=tol)
+            index[isinf(distance)] = -1
+            return index.tolist()
+
+        edge_index = network.edge_index(undirected=True)
+        index_edge = network.index_edge()
+
+        def edges(polylines):
+            sizes = [len(polyline) for polyline in polylines]
+            nodes = snap([point for polyline in polylines for point in polyline])
+            for end, size in zip(cumsum(sizes).tolist(), sizes):
+                chain = nodes[end - size : end]
+                found = []
+                for u, v in zip(chain[:-1], chain[1:]):
+                    if (u, v) in edge_index:
+                        found.append((u, index_edge[edge_index[(u, v)]]))
+                if found:
+                    yield found[0][0], [edge for _, edge in found]
+
+        for node in snap(anchors or []):
+            if node >= 0:
+                network.node_attribute(node, "is_anchor", True)
+
+        for start, found in edges(splines or []):
+            network.add_spline(found, start=start)
+
+        for _, found in edges(cables or []):
+            network.add_cable(found)
+
+        for _, found in edges(ties or []):
+            for edge in found:
+                network.edge_attribute(edge, "is_tie", True)
+
+        return network
 
     def node_point(self, node):
         """
@@ -144,3 +387,564 @@ class BendNetwork(Network):
         ry = self.node_attribute(node, "ry")
         rz = self.node_attribute(node, "rz")
         return Vector(rx, ry, rz)
+
+    # --------------------------------------------------------------------------
+    # Topology
+    # --------------------------------------------------------------------------
+
+    def _invalidate(self):
+        self._topology += 1
+        self._node_index = None
+        self._index_node = None
+        self._edge_index = None
+        self._edge_index_undirected = None
+        self._index_edge = None
+        self._edges_array = None
+        self._node_rows = None
+        self._edge_rows = None
+
+    def add_node(self, key=None, attr_dict=None, **kwattr):
+        if key is None or key not in self.node:
+            self._invalidate()
+            key = super(BendNetwork, self).add_node(key=key, attr_dict=attr_dict, **kwattr)
+            if self._node_columns is not None:
+                self.node[key] = self._row(self._node_columns, self.node[key])
+            return key
+        return super(BendNetwork, self).add_node(key=key, attr_dict=attr_dict, **kwattr)
+
+    def add_edge(self, u, v, attr_dict=None, **kwattr):
+        if u not in self.edge or v not in self.edge[u]:
+            self._invalidate()
+            u, v = super(BendNetwork, self).add_edge(u, v, attr_dict=attr_dict, **kwattr)
+            if self._edge_columns is not None:
+                self.edge[u][v] = self._row(self._edge_columns, self.edge[u][v])
+            return u, v
+        return super(BendNetwork, self).add_edge(u, v, attr_dict=attr_dict, **kwattr)
+
+    def delete_node(self, key):
+        # the edges of the node are found through its neighbours,
+        # instead of through the edges of all nodes
+        self._invalidate()
+        for nbr in list(self.adjacency.get(key, ())):
+            if key in self.edge.get(nbr, ()):
+                if self._edge_columns is not None:
+                    self._edge_columns.release(self.edge[nbr][key].index)
+                del self.edge[nbr][key]
+            if nbr in self.adjacency:
+                self.adjacency[nbr].pop(key, None)
+        if key in self.edge:
+            if self._edge_columns is not None:
+                for attr in self.edge[key].values():
+                    self._edge_columns.release(attr.index)
+            del self.edge[key]
+        self.adjacency.pop(key, None)
+        if key in self.node:
+            if self._node_columns is not None:
+                self._node_columns.release(self.node[key].index)
+            del self.node[key]
+
+    def delete_edge(self, edge):
+        self._invalidate()
+        u, v = edge
+        if self._edge_columns is not None and u in self.edge and v in self.edge[u]:
+            self._edge_columns.release(self.edge[u][v].index)
+        super(BendNetwork, self).delete_edge(edge)
+
+    def clear(self):
+        self._invalidate()
+        super(BendNetwork, self).clear()
+        self.splines = []
+        self.cables = []
+        if self._node_columns is not None:
+            self.set_columnar(True)
+
+    # --------------------------------------------------------------------------
+    # Elements
+    # --------------------------------------------------------------------------
+
+    def add_spline(self, edges, start=None, E=0.0, radius=0.0, thickness=0.0, **kwargs):
+        """Add a bending-active spline along a continuous chain of edges.
+
+        Parameters
+        ----------
+        edges : list[tuple[int, int]]
+            The consecutive edges of the spline, in any orientation.
+        start : int, optional
+            The first node of the spline.
+        E : float, optional
+            Young's modulus of the material.
+        radius : float, optional
+            The outer radius of the tubular cross section.
+        thickness : float, optional
+            The wall thickness of the tubular cross section.
+        **kwargs : dict, optional
+            The parameters of the rod model and of rectangular cross sections
+            (``rod``, ``width``, ``height``, ``G``, ``normal``).
+            See :class:`compas_bender.datastructures.Spline`.
+
+        Returns
+        -------
+        :class:`compas_bender.datastructures.Spline`
+
+        Raises
+        ------
+        ValueError
+            If the edges are not in the network, or do not form a continuous chain.
+
+        """
+        spline = Spline(self, edges, start=start, E=E, radius=radius, thickness=thickness, **kwargs)
+        self.splines.append(spline)
+        return spline
+
+    def add_cable(self, edges, qpre=1.0):
+        """Add a cable along a series of edges.
+
+        Parameters
+        ----------
+        edges : list[tuple[int, int]]
+            The edges of the cable, in any orientation.
+        qpre : float, optional
+            The prescribed force density of the edges of the cable.
+
+        Returns
+        -------
+        :class:`compas_bender.datastructures.Cable`
+
+        Raises
+        ------
+        ValueError
+            If the edges are not in the network.
+
+        """
+        cable = Cable(self, edges, qpre=qpre)
+        self.cables.append(cable)
+        return cable
+
+    # --------------------------------------------------------------------------
+    # Columnar storage
+    # --------------------------------------------------------------------------
+
+    @property
+    def is_columnar(self):
+        """bool : True if the numerical solver attributes are stored in contiguous columns."""
+        return self._node_columns is not None
+
+    @staticmethod
+    def _row(store, attr):
+        row = AttributeRow(store, store.allocate())
+        row.update(attr)
+        return row
+
+    def set_columnar(self, columnar=True):
+        """Switch between columnar and per-element dict storage of the numerical solver attributes.
+
+        In columnar mode, the coordinates, loads, residuals, shears and moments of the nodes,
+        and the prestress, material, section and result attributes of the edges,
+        are stored in contiguous NumPy arrays.
+        The attribute dicts of nodes and edges are replaced by mappings onto rows of these arrays,
+        such that the regular attribute API keeps working,
+        and the bulk array accessors become simple array operations.
+
+        Parameters
+        ----------
+        columnar : bool, optional
+            If True, convert to columnar storage.
+            If False, convert back to per-element dicts.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        Changes to the default values of the attributes with a column
+        only apply to nodes and edges added after the conversion.
+
+        """
+        self._invalidate()
+        if not columnar:
+            self._node_columns = None
+            self._edge_columns = None
+            for key in self.node:
+                self.node[key] = dict(self.node[key])
+            for u in self.edge:
+                for v in self.edge[u]:
+                    self.edge[u][v] = dict(self.edge[u][v])
+            return
+        nodes = {name: self.default_node_attributes.get(name, 0.0) for name in NODE_COLUMNS}
+        edges = {name: self.default_edge_attributes.get(name, 0.0) for name in EDGE_COLUMNS}
+        self._node_columns = AttributeColumns(nodes, capacity=len(self.node))
+        self._edge_columns = AttributeColumns(edges, capacity=sum(len(nbrs) for nbrs in self.edge.values()))
+        for key in self.node:
+            self.node[key] = self._row(self._node_columns, self.node[key])
+        for u in self.edge:
+            for v in self.edge[u]:
+                self.edge[u][v] = self._row(self._edge_columns, self.edge[u][v])
+
+    def _rows(self):
+        from numpy import array
+
+        if self._node_rows is None:
+            self._node_rows = array([attr.index for attr in self.node.values()], dtype=int)
+            self._edge_rows = array([attr.index for nbrs in self.edge.values() for attr in nbrs.values()], dtype=int)
+        return self._node_rows, self._edge_rows
+
+    @property
+    def topology(self):
+        """int : A counter that is incremented whenever nodes or edges are added or deleted.
+
+        Maps and arrays derived from the topology of the network remain valid as long as the counter does not change.
+        """
+        return self._topology
+
+    def node_index(self):
+        """Returns a dictionary that maps node identifiers to their corresponding index in a node list or array.
+
+        The dictionary is cached until the topology of the network changes,
+        and should therefore not be modified.
+
+        Returns
+        -------
+        dict[int, int]
+
+        """
+        if self._node_index is None:
+            self._node_index = {key: index for index, key in enumerate(self.node)}
+        return self._node_index
+
+    def index_node(self):
+        """Returns a dictionary that maps the indices of a node list or array to node identifiers.
+
+        The dictionary is cached until the topology of the network changes,
+        and should therefore not be modified.
+
+        Returns
+        -------
+        dict[int, int]
+
+        """
+        if self._index_node is None:
+            self._index_node = dict(enumerate(self.node))
+        return self._index_node
+
+    def edge_index(self, undirected=False):
+        """Returns a dictionary that maps edge identifiers to their corresponding index in an edge list or array.
+
+        The dictionary is cached until the topology of the network changes,
+        and should therefore not be modified.
+
+        Parameters
+        ----------
+        undirected : bool, optional
+            If True, the dictionary also contains the reversed edge identifiers,
+            such that edges can be looked up regardless of their orientation.
+
+        Returns
+        -------
+        dict[tuple[int, int], int]
+
+        """
+        if self._edge_index is None:
+            self._edge_index = {edge: index for index, edge in enumerate(self.edges())}
+        if not undirected:
+            return self._edge_index
+        if self._edge_index_undirected is None:
+            self._edge_index_undirected = {(v, u): index for (u, v), index in self._edge_index.items()}
+            self._edge_index_undirected.update(self._edge_index)
+        return self._edge_index_undirected
+
+    def index_edge(self):
+        """Returns a dictionary that maps the indices of an edge list or array to edge identifiers.
+
+        The dictionary is cached until the topology of the network changes,
+        and should therefore not be modified.
+
+        Returns
+        -------
+        dict[int, tuple[int, int]]
+
+        """
+        if self._index_edge is None:
+            self._index_edge = dict(enumerate(self.edges()))
+        return self._index_edge
+
+    def edge_oriented(self, edge):
+        """Return the identifier of an edge in the orientation in which it is stored in the network.
+
+        Parameters
+        ----------
+        edge : tuple[int, int]
+            A pair of node identifiers, in any order.
+
+        Returns
+        -------
+        tuple[int, int]
+
+        Raises
+        ------
+        KeyError
+            If there is no edge between the two nodes.
+
+        """
+        return self.index_edge()[self.edge_index(undirected=True)[tuple(edge)]]
+
+    def edges_array(self):
+        """Return the edges of the network as pairs of node indices.
+
+        Returns
+        -------
+        numpy.ndarray
+            An integer array of shape (number_of_edges, 2).
+
+        """
+        from numpy import empty
+
+        if self._edges_array is None:
+            node_index = self.node_index()
+            start = [node_index[u] for u, nbrs in self.edge.items() for v in nbrs]
+            end = [node_index[v] for nbrs in self.edge.values() for v in nbrs]
+            self._edges_array = empty((len(start), 2), dtype=int)
+            self._edges_array[:, 0] = start
+            self._edges_array[:, 1] = end
+        return self._edges_array
+
+    # --------------------------------------------------------------------------
+    # Bulk attributes
+    # --------------------------------------------------------------------------
+
+    def _attributes_array(self, attrs, defaults, names, values=None):
+        from numpy import array
+        from numpy import empty
+        from numpy import float64
+
+        if values is not None:
+            values = array(values, dtype=float64).reshape((len(attrs), len(names)))
+            for name, column in zip(names, values.T.tolist()):
+                for attr, value in zip(attrs, column):
+                    attr[name] = value
+            return
+        values = empty((len(attrs), len(names)), dtype=float64)
+        for index, name in enumerate(names):
+            default = defaults.get(name)
+            values[:, index] = [attr.get(name, default) for attr in attrs]
+        return values
+
+    def nodes_attributes_array(self, names, values=None):
+        """Get or set multiple attributes of all nodes as an array.
+
+        Parameters
+        ----------
+        names : list[str]
+            The names of the attributes.
+        values : array-like, optional
+            An array of shape (number_of_nodes, len(names)),
+            with the rows in the order of :meth:`node_index`.
+
+        Returns
+        -------
+        numpy.ndarray | None
+            An array of shape (number_of_nodes, len(names)),
+            or None if the function is used as a setter.
+
+        """
+        if self._node_columns is not None and all(name in self._node_columns.columns for name in names):
+            rows = self._rows()[0]
+            if values is not None:
+                return self._node_columns.scatter(names, rows, values)
+            return self._node_columns.gather(names, rows)
+        attrs = list(self.node.values())
+        return self._attributes_array(attrs, self.default_node_attributes, names, values)
+
+    def edges_attributes_array(self, names, values=None):
+        """Get or set multiple attributes of all edges as an array.
+
+        Parameters
+        ----------
+        names : list[str]
+            The names of the attributes.
+        values : array-like, optional
+            An array of shape (number_of_edges, len(names)),
+            with the rows in the order of :meth:`edge_index`.
+
+        Returns
+        -------
+        numpy.ndarray | None
+            An array of shape (number_of_edges, len(names)),
+            or None if the function is used as a setter.
+
+        """
+        if self._edge_columns is not None and all(name in self._edge_columns.columns for name in names):
+            rows = self._rows()[1]
+            if values is not None:
+                return self._edge_columns.scatter(names, rows, values)
+            return self._edge_columns.gather(names, rows)
+        attrs = [attr for nbrs in self.edge.values() for attr in nbrs.values()]
+        return self._attributes_array(attrs, self.default_edge_attributes, names, values)
+
+    def nodes_xyz_array(self, xyz=None):
+        """Get or set the coordinates of all nodes.
+
+        Parameters
+        ----------
+        xyz : array-like, optional
+            An array of shape (number_of_nodes, 3).
+
+        Returns
+        -------
+        numpy.ndarray | None
+
+        """
+        return self.nodes_attributes_array(["x", "y", "z"], xyz)
+
+    def loads_array(self, loads=None):
+        """Get or set the loads applied to all nodes.
+
+        Parameters
+        ----------
+        loads : array-like, optional
+            An array of shape (number_of_nodes, 3).
+
+        Returns
+        -------
+        numpy.ndarray | None
+
+        """
+        return self.nodes_attributes_array(["px", "py", "pz"], loads)
+
+    def residuals_array(self, residuals=None):
+        """Get or set the residual forces at all nodes.
+
+        Parameters
+        ----------
+        residuals : array-like, optional
+            An array of shape (number_of_nodes, 3).
+
+        Returns
+        -------
+        numpy.ndarray | None
+
+        """
+        return self.nodes_attributes_array(["rx", "ry", "rz"], residuals)
+
+    def reactions_array(self):
+        """Return the reaction forces at all nodes.
+
+        The reaction forces of nodes that are not anchored are zero.
+
+        Returns
+        -------
+        numpy.ndarray
+            An array of shape (number_of_nodes, 3).
+
+        """
+        reactions = -self.residuals_array()
+        is_anchor = self.nodes_attributes_array(["is_anchor"])[:, 0].astype(bool)
+        reactions[~is_anchor] = 0.0
+        return reactions
+
+    def shears_array(self, shears=None):
+        """Get or set the shear forces at all nodes.
+
+        Parameters
+        ----------
+        shears : array-like, optional
+            An array of shape (number_of_nodes, 3).
+
+        Returns
+        -------
+        numpy.ndarray | None
+
+        """
+        return self.nodes_attributes_array(["sx", "sy", "sz"], shears)
+
+    def moments_array(self, moments=None):
+        """Get or set the bending moment vectors at all nodes.
+
+        Parameters
+        ----------
+        moments : array-like, optional
+            An array of shape (number_of_nodes, 3).
+
+        Returns
+        -------
+        numpy.ndarray | None
+
+        """
+        return self.nodes_attributes_array(["mx", "my", "mz"], moments)
+
+    def edge_forces_array(self, forces=None):
+        """Get or set the axial forces in all edges.
+
+        Parameters
+        ----------
+        forces : array-like, optional
+            An array of shape (number_of_edges,).
+
+        Returns
+        -------
+        numpy.ndarray | None
+
+        """
+        if forces is not None:
+            return self.edges_attributes_array(["f"], forces)
+        return self.edges_attributes_array(["f"])[:, 0]
+
+    def edge_lengths_array(self, lengths=None):
+        """Get or set the lengths of all edges, as computed by the solver.
+
+        Parameters
+        ----------
+        lengths : array-like, optional
+            An array of shape (number_of_edges,).
+
+        Returns
+        -------
+        numpy.ndarray | None
+
+        """
+        if lengths is not None:
+            return self.edges_attributes_array(["l"], lengths)
+        return self.edges_attributes_array(["l"])[:, 0]
+
+    def edge_lines_array(self):
+        """Return the start and end points of all edges.
+
+        Returns
+        -------
+        numpy.ndarray
+            An array of shape (number_of_edges, 2, 3).
+
+        """
+        from numpy import ascontiguousarray
+
+        return ascontiguousarray(self.nodes_xyz_array()[self.edges_array()])
+
+    # --------------------------------------------------------------------------
+    # Sections
+    # --------------------------------------------------------------------------
+
+    def section_properties(self, units=None, edges=None):
+        """Return the sectional properties of all edges, updated for the current edge attributes.
+
+        The properties are cached per set of units,
+        and only the edges of which the section attributes have changed since the previous call are recomputed.
+
+        Parameters
+        ----------
+        units : :class:`SectionUnits`, optional
+            The scaling factors of the edge attributes to the base units (m, N).
+        edges : list[tuple[int, int]], optional
+            The identifiers of the edges that may have changed.
+            Default is all edges.
+
+        Returns
+        -------
+        :class:`SectionProperties`
+
+        """
+        units = SectionUnits() if units is None else SectionUnits(*units)
+        if units not in self._sections:
+            self._sections[units] = SectionProperties(self, units)
+        sections = self._sections[units]
+        sections.update(edges)
+        return sections
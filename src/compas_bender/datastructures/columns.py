@@ -0,0 +1,219 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections.abc import MutableMapping
+
+
+class AttributeColumns(object):
+    """
+    Contiguous storage of numerical attributes of the elements of a data structure.
+
+    Every attribute is stored in a separate column (a 1D array of floats).
+    Every element occupies one row in all columns.
+    Rows of deleted elements are reused by new elements.
+
+    Parameters
+    ----------
+    defaults : dict[str, float]
+        The names of the attributes stored in columns, and their default values.
+    capacity : int, optional
+        The initial number of rows.
+
+    """
+
+    def __init__(self, defaults, capacity=64):
+        from numpy import full
+
+        self.defaults = dict(defaults)
+        self.capacity = max(1, capacity)
+        self.size = 0
+        self.free = []
+        self.columns = {name: full(self.capacity, default, dtype=float) for name, default in self.defaults.items()}
+
+    def __len__(self):
+        return self.size - len(self.free)
+
+    @classmethod
+    def from_arrays(cls, defaults, columns, size):
+        """Construct a store around existing columns, with all rows in use.
+
+        Parameters
+        ----------
+        defaults : dict[str, float]
+            The names of the attributes stored in columns, and their default values.
+        columns : dict[str, numpy.ndarray]
+            The columns, of length `size`.
+            Missing columns are filled with the default values.
+            The arrays are used as-is, without copying, such that memory-mapped arrays stay mapped.
+        size : int
+            The number of rows.
+
+        Returns
+        -------
+        :class:`AttributeColumns`
+
+        """
+        from numpy import full
+
+        store = cls(defaults, capacity=1)
+        store.capacity = max(1, size)
+        store.size = size
+        for name, default in store.defaults.items():
+            column = columns.get(name)
+            if column is None or len(column) == 0:
+                column = full(store.capacity, default, dtype=float)
+            store.columns[name] = column
+        return store
+
+    def _grow(self):
+        from numpy import full
+
+        capacity = 2 * self.capacity
+        for name, column in self.columns.items():
+            grown = full(capacity, self.defaults[name], dtype=float)
+            grown[: self.capacity] = column
+            self.columns[name] = grown
+        self.capacity = capacity
+
+    def allocate(self):
+        """Allocate a row, with all attributes set to their default values.
+
+        Returns
+        -------
+        int
+            The index of the row.
+
+        """
+        if self.free:
+            index = self.free.pop()
+            for name, column in self.columns.items():
+                column[index] = self.defaults[name]
+            return index
+        if self.size == self.capacity:
+            self._grow()
+        index = self.size
+        self.size += 1
+        return index
+
+    def release(self, index):
+        """Release a row for reuse.
+
+        Parameters
+        ----------
+        index : int
+
+        Returns
+        -------
+        None
+
+        """
+        self.free.append(index)
+
+    def gather(self, names, rows):
+        """Collect the values of multiple attributes for a list of rows.
+
+        Parameters
+        ----------
+        names : list[str]
+        rows : array-like
+            The row indices.
+
+        Returns
+        -------
+        numpy.ndarray
+            An array of shape (len(rows), len(names)).
+
+        """
+        from numpy import empty
+
+        values = empty((len(rows), len(names)), dtype=float)
+        for index, name in enumerate(names):
+            values[:, index] = self.columns[name][rows]
+        return values
+
+    def scatter(self, names, rows, values):
+        """Set the values of multiple attributes for a list of rows.
+
+        Parameters
+        ----------
+        names : list[str]
+        rows : array-like
+            The row indices.
+        values : array-like
+            An array of shape (len(rows), len(names)).
+
+        Returns
+        -------
+        None
+
+        """
+        from numpy import asarray
+
+        values = asarray(values, dtype=float).reshape((len(rows), len(names)))
+        for index, name in enumerate(names):
+            self.columns[name][rows] = values[:, index]
+
+
+class AttributeRow(MutableMapping):
+    """
+    Attribute dict of a single element, backed by a row of :class:`AttributeColumns`.
+
+    Attributes with a column are read from and written to the column.
+    All other attributes are stored in a regular dict.
+
+    Parameters
+    ----------
+    store : :class:`AttributeColumns`
+    index : int
+        The index of the row.
+
+    """
+
+    __slots__ = ("store", "index", "attr")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+        self.attr = None
+
+    def __contains__(self, name):
+        return name in self.store.columns or (self.attr is not None and name in self.attr)
+
+    def __getitem__(self, name):
+        column = self.store.columns.get(name)
+        if column is not None:
+            return float(column[self.index])
+        if self.attr is None:
+            raise KeyError(name)
+        return self.attr[name]
+
+    def __setitem__(self, name, value):
+        column = self.store.columns.get(name)
+        if column is not None:
+            column[self.index] = value
+            return
+        if self.attr is None:
+            self.attr = {}
+        self.attr[name] = value
+
+    def __delitem__(self, name):
+        if name in self.store.columns:
+            self.store.columns[name][self.index] = self.store.defaults[name]
+            return
+        if self.attr is None:
+            raise KeyError(name)
+        del self.attr[name]
+
+    def __iter__(self):
+        for name in self.store.columns:
+            yield name
+        if self.attr is not None:
+            for name in self.attr:
+                yield name
+
+    def __len__(self):
+        return len(self.store.columns) + (len(self.attr) if self.attr is not None else 0)
+
+    def __repr__(self):
+        return repr(dict(self))
@@ -0,0 +1,343 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from .sections import section_constants
+
+
+class Cable(object):
+    """
+    A chain of edges of a :class:`BendNetwork` with a common prescribed force density.
+
+    Parameters
+    ----------
+    network : :class:`BendNetwork`
+        The network containing the edges of the cable.
+    edges : list[tuple[int, int]]
+        The edges of the cable, in any orientation.
+    qpre : float, optional
+        The prescribed force density of the edges of the cable.
+
+    Attributes
+    ----------
+    edge_indices : list[int]
+        The indices of the edges of the cable in the edge list of the network.
+        The indices are cached until the topology of the network changes.
+
+    """
+
+    __slots__ = ("network", "edges", "qpre", "_topology", "_ei")
+
+    def __init__(self, network, edges, qpre=1.0):
+        self.network = network
+        self.edges = [tuple(edge) for edge in edges]
+        self.qpre = qpre
+        self._topology = None
+        self._ei = None
+        self._compile()
+
+    def __repr__(self):
+        return "Cable(edges={}, qpre={})".format(len(self.edges), self.qpre)
+
+    @property
+    def __data__(self):
+        return {"edges": self.edges, "qpre": self.qpre}
+
+    @classmethod
+    def __from_data__(cls, data, network):
+        return cls(network, data["edges"], qpre=data.get("qpre", 1.0))
+
+    def _compile(self):
+        edge_index = self.network.edge_index(undirected=True)
+        try:
+            self._ei = [edge_index[edge] for edge in self.edges]
+        except KeyError as e:
+            raise ValueError("The cable contains an edge that is not in the network: {}".format(e))
+        self._topology = self.network.topology
+
+    @property
+    def edge_indices(self):
+        if self._topology != self.network.topology:
+            self._compile()
+        return self._ei
+
+
+class Spline(object):
+    """
+    A continuous chain of edges of a :class:`BendNetwork` representing a bending-active element.
+
+    Parameters
+    ----------
+    network : :class:`BendNetwork`
+        The network containing the edges of the spline.
+    edges : list[tuple[int, int]]
+        The consecutive edges of the spline, in any orientation.
+    start : int, optional
+        The first node of the spline.
+        Default is the node of the first edge that is not shared with the second edge.
+    E : float, optional
+        Young's modulus of the material.
+    radius : float, optional
+        The outer radius of the tubular cross section.
+    thickness : float, optional
+        The wall thickness of the tubular cross section.
+        The cross section is a solid circle if the thickness is not smaller than the radius.
+    rod : bool, optional
+        If True, the spline is modelled as a discrete elastic rod,
+        with two bending stiffnesses, torsion and material frames,
+        instead of with the isotropic bending stiffness of the tube.
+    width : float, optional
+        The width of a rectangular cross section, in the units of the radius.
+        The cross section is rectangular if both the width and the height are not zero.
+    height : float, optional
+        The height of a rectangular cross section, in the units of the radius.
+    G : float, optional
+        The shear modulus of the material, in the units of Young's modulus.
+        Default is the shear modulus of an isotropic material with a Poisson's ratio of 0.3.
+    normal : list[float], optional
+        The direction of the height of the cross section of a rod, at all edges in the initial configuration.
+        Default is the Z axis, or the X axis for vertical edges.
+
+    Attributes
+    ----------
+    node_indices : list[int]
+        The indices of the nodes of the spline, in order, in the node list of the network.
+    edge_indices : list[int]
+        The indices of the edges of the spline, in order, in the edge list of the network.
+    reversed : list[bool]
+        Per edge, True if its orientation in the network is opposite to the direction of the spline.
+
+    Raises
+    ------
+    ValueError
+        If the edges are not in the network, or do not form a continuous chain starting at the start node.
+
+    Notes
+    -----
+    The connectivity of the spline is validated once,
+    and the index lists are cached until the topology of the network changes.
+
+    """
+
+    __slots__ = (
+        "network",
+        "edges",
+        "start",
+        "E",
+        "radius",
+        "thickness",
+        "rod",
+        "width",
+        "height",
+        "G",
+        "normal",
+        "_topology",
+        "_vi",
+        "_ei",
+        "_reversed",
+        "_section",
+    )
+
+    def __init__(
+        self,
+        network,
+        edges,
+        start=None,
+        E=0.0,
+        radius=0.0,
+        thickness=0.0,
+        rod=False,
+        width=0.0,
+        height=0.0,
+        G=0.0,
+        normal=None,
+    ):
+        self.network = network
+        self.edges = [tuple(edge) for edge in edges]
+        if start is None:
+            start = self._find_start()
+        self.start = start
+        self.E = E
+        self.radius = radius
+        self.thickness = thickness
+        self.rod = rod
+        self.width = width
+        self.height = height
+        self.G = G
+        self.normal = None if normal is None else list(normal)
+        self._topology = None
+        self._vi = None
+        self._ei = None
+        self._reversed = None
+        self._section = None
+        self._compile()
+
+    def __repr__(self):
+        return "Spline(edges={}, E={}, radius={}, thickness={})".format(
+            len(self.edges), self.E, self.radius, self.thickness
+        )
+
+    @property
+    def __data__(self):
+        return {
+            "start": self.start,
+            "edges": self.edges,
+            "E": self.E,
+            "radius": self.radius,
+            "thickness": self.thickness,
+            "rod": self.rod,
+            "width": self.width,
+            "height": self.height,
+            "G": self.G,
+            "normal": self.normal,
+        }
+
+    @classmethod
+    def __from_data__(cls, data, network):
+        return cls(
+            network,
+            data["edges"],
+            start=data.get("start"),
+            E=data.get("E", 0.0),
+            radius=data.get("radius", 0.0),
+            thickness=data.get("thickness", 0.0),
+            rod=data.get("rod", False),
+            width=data.get("width", 0.0),
+            height=data.get("height", 0.0),
+            G=data.get("G", 0.0),
+            normal=data.get("normal"),
+        )
+
+    def _find_start(self):
+        if not self.edges:
+            raise ValueError("A spline needs at least one edge.")
+        u, v = self.edges[0]
+        if len(self.edges) == 1:
+            return u
+        if u in self.edges[1]:
+            return v
+        return u
+
+    def _compile(self):
+        node_index = self.network.node_index()
+        edge_index = self.network.edge_index(undirected=True)
+        nodes = [self.start]
+        ei = []
+        reversed_ = []
+        for u, v in self.edges:
+            if (u, v) not in edge_index:
+                raise ValueError("The spline contains an edge that is not in the network: {}".format((u, v)))
+            if nodes[-1] == u:
+                nodes.append(v)
+            elif nodes[-1] == v:
+                nodes.append(u)
+            else:
+                raise ValueError("The edges of the spline do not form a continuous chain at {}.".format((u, v)))
+            index = edge_index[(u, v)]
+            ei.append(index)
+            reversed_.append(self.network.index_edge()[index] != (nodes[-2], nodes[-1]))
+        self._vi = [node_index[node] for node in nodes]
+        self._ei = ei
+        self._reversed = reversed_
+        self._topology = self.network.topology
+
+    def _validate(self):
+        if self._topology != self.network.topology:
+            self._compile()
+
+    @property
+    def nodes(self):
+        """list[int] : The identifiers of the nodes of the spline, in order."""
+        self._validate()
+        index_node = self.network.index_node()
+        return [index_node[index] for index in self._vi]
+
+    @property
+    def node_indices(self):
+        self._validate()
+        return self._vi
+
+    @property
+    def edge_indices(self):
+        self._validate()
+        return self._ei
+
+    @property
+    def reversed(self):
+        self._validate()
+        return self._reversed
+
+    def section(self, unit_E=1.0, unit_radius=1.0, unit_thickness=1.0):
+        """Compute the sectional properties of the spline.
+
+        The result is cached until the material or section parameters, or the units, change.
+        The second moment of area of a rectangular cross section is the one about its weak axis.
+
+        Parameters
+        ----------
+        unit_E : float, optional
+            Scaling factor of Young's modulus.
+        unit_radius : float, optional
+            Scaling factor of the radius, the width and the height.
+        unit_thickness : float, optional
+            Scaling factor of the thickness.
+
+        Returns
+        -------
+        tuple[float, float, float, float]
+            The area (A), second moment of area (I), axial stiffness (EA) and bending stiffness (EI).
+
+        """
+        A, I1, I2, J, E, G = self._properties(unit_E, unit_radius, unit_thickness)
+        return A, min(I1, I2), E * A, E * min(I1, I2)
+
+    def rod_section(self, unit_E=1.0, unit_radius=1.0, unit_thickness=1.0):
+        """Compute the sectional properties of the spline as a discrete elastic rod.
+
+        Parameters
+        ----------
+        unit_E : float, optional
+            Scaling factor of Young's modulus and the shear modulus.
+        unit_radius : float, optional
+            Scaling factor of the radius, the width and the height.
+        unit_thickness : float, optional
+            Scaling factor of the thickness.
+
+        Returns
+        -------
+        tuple[float, float, float, float]
+            The bending stiffness in the direction of the width (EI1),
+            the bending stiffness in the direction of the height (EI2),
+            the torsional stiffness (GJ),
+            and the polar moment of area (I1 + I2).
+
+        """
+        A, I1, I2, J, E, G = self._properties(unit_E, unit_radius, unit_thickness)
+        return E * I1, E * I2, G * J, I1 + I2
+
+    def _properties(self, unit_E, unit_radius, unit_thickness):
+        """Compute the area, the second moments of area, the torsion constant and the moduli, with caching."""
+        key = (
+            self.E,
+            self.G,
+            self.radius,
+            self.thickness,
+            self.width,
+            self.height,
+            unit_E,
+            unit_radius,
+            unit_thickness,
+        )
+        if self._section is None or self._section[0] != key:
+            E = self.E * unit_E
+            G = (self.G or self.E / 2.6) * unit_E
+            # the first moment is for bending in the direction of the width
+            A, I1, I2, J = section_constants(
+                self.radius * unit_radius,
+                self.thickness * unit_thickness,
+                self.width * unit_radius,
+                self.height * unit_radius,
+            )
+            A, I1, I2, J = float(A), float(I1), float(I2), float(J)
+            self._section = key, (A, I1, I2, J, E, G)
+        return self._section[1]
@@ -0,0 +1,197 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import namedtuple
+
+PI = 3.14159
+SECTION_ATTRIBUTES = ["E", "radius", "thickness", "width", "height"]
+
+
+class SectionUnits(namedtuple("SectionUnits", ["E", "radius", "thickness"])):
+    """
+    The scaling factors of the material and section attributes to the base units (m, N).
+
+    Parameters
+    ----------
+    E : float, optional
+        Scaling factor of Young's modulus.
+    radius : float, optional
+        Scaling factor of the radius, the width and the height.
+    thickness : float, optional
+        Scaling factor of the thickness.
+
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, E=1e9, radius=1e-3, thickness=1e-3):
+        return super(SectionUnits, cls).__new__(cls, E, radius, thickness)
+
+
+def section_constants(radius, thickness, width=0.0, height=0.0):
+    """Compute the area, the second moments of area and the torsion constant of cross sections.
+
+    The cross section is rectangular if both the width and the height are not zero,
+    a solid circle if the thickness is not smaller than the radius,
+    and a tube otherwise.
+    The arguments are scalars or arrays of the same shape, in consistent units.
+
+    Parameters
+    ----------
+    radius : float | numpy.ndarray
+        The outer radius of a circular section.
+    thickness : float | numpy.ndarray
+        The wall thickness of a tubular section.
+    width : float | numpy.ndarray, optional
+        The width of a rectangular section.
+    height : float | numpy.ndarray, optional
+        The height of a rectangular section.
+
+    Returns
+    -------
+    tuple
+        The area (A), the second moment of area for bending in the direction of the width (I1),
+        the second moment of area for bending in the direction of the height (I2),
+        and the torsion constant (J).
+
+    """
+    from numpy import asarray
+    from numpy import maximum
+    from numpy import minimum
+    from numpy import where
+
+    rectangle = asarray((width != 0) & (height != 0))
+    inner = radius - minimum(thickness, radius)
+    A = PI * (radius**2 - inner**2)
+    I1 = I2 = PI * (radius**4 - inner**4) / 4.0
+    J = 2 * I1
+    if not rectangle.any():
+        return A, I1, I2, J
+    a = maximum(width, height)
+    b = minimum(width, height)
+    # Saint-Venant's approximation of the torsion constant of a rectangle
+    ratio = where(rectangle, b / where(rectangle, a, 1.0), 0.0)
+    A = where(rectangle, width * height, A)
+    I1 = where(rectangle, height * width**3 / 12.0, I1)
+    I2 = where(rectangle, width * height**3 / 12.0, I2)
+    J = where(rectangle, a * b**3 * (1.0 / 3.0 - 0.21 * ratio * (1 - ratio**4 / 12.0)), J)
+    return A, I1, I2, J
+
+
+class SectionProperties(object):
+    """
+    Per-edge sectional properties of a :class:`BendNetwork`, cached between solves.
+
+    The properties are computed from the edge attributes ``E``, ``radius``, ``thickness``, ``width`` and ``height``
+    (see :func:`section_constants` for the types of sections),
+    and are only recomputed for the edges of which these attributes have changed since the previous update.
+    All properties are recomputed if the topology of the network changes.
+
+    Use :meth:`BendNetwork.section_properties` to get the cached properties of a network.
+
+    Parameters
+    ----------
+    network : :class:`BendNetwork`
+    units : :class:`SectionUnits`, optional
+        The scaling factors of the edge attributes to the base units (m, N).
+
+    Attributes
+    ----------
+    A : numpy.ndarray
+        The areas of the sections of the edges, in the order of :meth:`BendNetwork.edge_index`.
+    I : numpy.ndarray
+        The second moments of area of the sections, about their weak axis.
+    EA : numpy.ndarray
+        The axial stiffness of the edges.
+    EI : numpy.ndarray
+        The bending stiffness of the edges, about the weak axis of their sections.
+    recomputed : int
+        The number of edges of which the properties were recomputed at the last update.
+
+    Examples
+    --------
+    >>> sections = network.section_properties()  # doctest: +SKIP
+    >>> network.edge_attribute(edge, "thickness", 2.0)  # doctest: +SKIP
+    >>> sections.update([edge])  # doctest: +SKIP
+    >>> sections.recomputed  # doctest: +SKIP
+    1
+
+    """
+
+    def __init__(self, network, units=None):
+        self.network = network
+        self.units = SectionUnits() if units is None else SectionUnits(*units)
+        self.A = None
+        self.I = None  # noqa: E741
+        self.EA = None
+        self.EI = None
+        self.recomputed = 0
+        self._topology = None
+        self._values = None
+
+    def update(self, edges=None):
+        """Recompute the properties of the edges of which the section attributes have changed.
+
+        Parameters
+        ----------
+        edges : list[tuple[int, int]], optional
+            The identifiers of the edges that may have changed, in any orientation.
+            Default is all edges.
+
+        Returns
+        -------
+        numpy.ndarray
+            The indices of the recomputed edges.
+
+        """
+        from numpy import arange
+        from numpy import array
+        from numpy import float64
+        from numpy import zeros
+
+        network = self.network
+        full = self._topology != network.topology
+        if full:
+            self._topology = network.topology
+            count = network.number_of_edges()
+            self._values = zeros((count, len(SECTION_ATTRIBUTES)), dtype=float64)
+            self.A = zeros(count, dtype=float64)
+            self.I = zeros(count, dtype=float64)  # noqa: E741
+            self.EA = zeros(count, dtype=float64)
+            self.EI = zeros(count, dtype=float64)
+        if full or edges is None:
+            values = network.edges_attributes_array(SECTION_ATTRIBUTES)
+            indices = arange(len(values))
+        else:
+            edge_index = network.edge_index(undirected=True)
+            edges = [network.edge_oriented(edge) for edge in edges]
+            indices = array([edge_index[edge] for edge in edges], dtype=int)
+            values = array([network.edge_attributes(edge, SECTION_ATTRIBUTES) for edge in edges], dtype=float64)
+            values = values.reshape((-1, len(SECTION_ATTRIBUTES)))
+        if not full:
+            stale = (values != self._values[indices]).any(axis=1)
+            indices = indices[stale]
+            values = values[stale]
+        self._compute(indices, values)
+        self.recomputed = len(indices)
+        return indices
+
+    def _compute(self, indices, values):
+        """Compute the properties of a selection of edges from their section attributes."""
+        from numpy import minimum
+
+        self._values[indices] = values
+        units = self.units
+        E = values[:, 0] * units.E
+        A, I1, I2, _ = section_constants(
+            values[:, 1] * units.radius,
+            values[:, 2] * units.thickness,
+            values[:, 3] * units.radius,
+            values[:, 4] * units.radius,
+        )
+        I = minimum(I1, I2)  # noqa: E741
+        self.A[indices] = A
+        self.I[indices] = I
+        self.EA[indices] = E * A
+        self.EI[indices] = E * I
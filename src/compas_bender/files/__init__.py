@@ -0,0 +1,10 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from .npz import npz_dump
+from .npz import npz_load
+from .npz import npz_load_arrays
+from .results import ResultStore
+
+__all__ = ["npz_dump", "npz_load", "npz_load_arrays", "ResultStore"]
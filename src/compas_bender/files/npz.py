@@ -0,0 +1,402 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import struct
+import zipfile
+
+import compas
+from compas.data.encoders import cls_from_dtype
+from compas_bender.datastructures import BendNetwork
+from compas_bender.datastructures.bendnetwork import EDGE_COLUMNS
+from compas_bender.datastructures.bendnetwork import NODE_COLUMNS
+from compas_bender.datastructures.columns import AttributeColumns
+from compas_bender.datastructures.columns import AttributeRow
+from compas_bender.datastructures.elements import Cable
+from compas_bender.datastructures.elements import Spline
+
+FORMAT = "compas_bender.npz"
+VERSION = 1
+HEADER = "__header__"
+DTYPES = {float: "float64", bool: "bool", int: "int64"}
+
+
+# ==============================================================================
+# Writing
+# ==============================================================================
+
+
+def _encode_attributes(attrs, prefix, arrays, columns=None):
+    from numpy import array
+
+    specs = []
+    names = []
+    seen = set()
+    for name, column in (columns or {}).items():
+        member = "{}_{}".format(prefix, len(specs))
+        arrays[member] = column
+        specs.append({"name": name, "member": member, "dtype": "float64", "mask": False})
+        seen.add(name)
+    for attr in attrs:
+        for name in attr:
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+
+    for name in names:
+        member = "{}_{}".format(prefix, len(specs))
+        values = [attr.get(name) if name in attr else None for attr in attrs]
+        mask = [name in attr for attr in attrs]
+        present = values if all(mask) else [value for value, found in zip(values, mask) if found]
+        types = set(map(type, present))
+        spec = {"name": name, "member": member, "dtype": "json", "mask": not all(mask)}
+        if len(types) == 1:
+            dtype = DTYPES.get(types.pop())
+            if dtype:
+                try:
+                    arrays[member] = array([value if found else 0 for value, found in zip(values, mask)], dtype=dtype)
+                    spec["dtype"] = dtype
+                except OverflowError:
+                    pass
+        if spec["dtype"] == "json":
+            spec["mask"] = False
+            spec["values"] = [[index, value] for index, (value, found) in enumerate(zip(values, mask)) if found]
+        elif spec["mask"]:
+            arrays[member + "_mask"] = array(mask, dtype=bool)
+        specs.append(spec)
+    return specs
+
+
+def _encode_network(network, key, arrays):
+    from numpy import array
+
+    nodes = list(network.node)
+    node_index = {node: index for index, node in enumerate(nodes)}
+    edges = [(u, v) for u in network.edge for v in network.edge[u]]
+
+    header = {
+        "dtype": network.__dtype__,
+        "name": network.name,
+        "attributes": network.attributes,
+        "default_node_attributes": network.default_node_attributes,
+        "default_edge_attributes": network.default_edge_attributes,
+        "max_node": network._max_node,
+        "columnar": network.is_columnar,
+        "number_of_nodes": len(nodes),
+        "number_of_edges": len(edges),
+        "splines": [spline.__data__ for spline in network.splines],
+        "cables": [cable.__data__ for cable in network.cables],
+    }
+
+    if all(type(node) is int for node in nodes):
+        header["nodes"] = None
+        arrays[key + "/nodes"] = array(nodes, dtype="int64")
+    else:
+        header["nodes"] = nodes
+    arrays[key + "/edges"] = array([(node_index[u], node_index[v]) for u, v in edges], dtype="int64").reshape((-1, 2))
+
+    nodeattrs = list(network.node.values())
+    edgeattrs = [network.edge[u][v] for u, v in edges]
+    if network.is_columnar:
+        # only the attributes without a column are collected per element
+        noderows, edgerows = network._rows()
+        nodecolumns = {name: column[noderows] for name, column in network._node_columns.columns.items()}
+        edgecolumns = {name: column[edgerows] for name, column in network._edge_columns.columns.items()}
+        nodeattrs = [attr.attr or {} for attr in nodeattrs]
+        edgeattrs = [attr.attr or {} for attr in edgeattrs]
+    else:
+        nodecolumns = None
+        edgecolumns = None
+
+    header["node_attributes"] = _encode_attributes(nodeattrs, key + "/node", arrays, nodecolumns)
+    header["edge_attributes"] = _encode_attributes(edgeattrs, key + "/edge", arrays, edgecolumns)
+    return header
+
+
+def npz_dump(data, filepath):
+    """Write bend networks and related data to an uncompressed NumPy archive.
+
+    The numerical attributes of the nodes and edges of every :class:`compas_bender.datastructures.BendNetwork`
+    are stored as columns of typed binary arrays.
+    Everything else, including attributes that are not of type float, int or bool,
+    is stored in a JSON header using the COMPAS JSON encoder.
+
+    Parameters
+    ----------
+    data : :class:`compas_bender.datastructures.BendNetwork` | dict
+        A bend network, or a dict with bend networks and other JSON-serializable data,
+        for example the networks, splines, cables and ties of a model.
+    filepath : str
+        The path to the file.
+        The file is written as-is, without adding an extension.
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    :func:`npz_load`, :func:`npz_load_arrays`
+
+    Notes
+    -----
+    The archive is not compressed, such that the arrays can be memory-mapped by :func:`npz_load_arrays`.
+
+    """
+    from numpy import frombuffer
+    from numpy import savez
+
+    single = isinstance(data, BendNetwork)
+    items = {"data": data} if single else data
+
+    arrays = {}
+    header = {"format": FORMAT, "version": VERSION, "single": single, "networks": {}, "data": {}}
+    for key, value in items.items():
+        if isinstance(value, BendNetwork):
+            header["networks"][key] = _encode_network(value, key, arrays)
+        else:
+            header["data"][key] = value
+
+    arrays[HEADER] = frombuffer(compas.json_dumps(header).encode("utf-8"), dtype="uint8")
+    with open(filepath, "wb") as f:
+        savez(f, **arrays)
+
+
+# ==============================================================================
+# Reading
+# ==============================================================================
+
+
+def _memmap_members(filepath, mode):
+    from numpy import empty
+    from numpy import memmap
+    from numpy.lib import format
+
+    arrays = {}
+    with zipfile.ZipFile(filepath) as archive, open(filepath, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError("Compressed archives cannot be memory-mapped: {}".format(info.filename))
+            f.seek(info.header_offset + 26)
+            namelength, extralength = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + namelength + extralength)
+            version = format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = format.read_array_header_2_0(f)
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if not shape or 0 in shape:
+                arrays[name] = empty(shape, dtype=dtype)
+                continue
+            order = "F" if fortran else "C"
+            arrays[name] = memmap(filepath, dtype=dtype, mode=mode, offset=f.tell(), shape=shape, order=order)
+    return arrays
+
+
+def _read(filepath, mmap, mode="r"):
+    from numpy import load
+
+    if mmap:
+        arrays = _memmap_members(filepath, mode)
+    else:
+        with load(filepath) as archive:
+            arrays = {name: archive[name] for name in archive.files}
+    if HEADER not in arrays:
+        raise ValueError("Not a bend network archive: {}".format(filepath))
+    header = json.loads(bytes(arrays.pop(HEADER)).decode("utf-8"))
+    if header.get("format") != FORMAT:
+        raise ValueError("Not a bend network archive: {}".format(filepath))
+    if header["version"] > VERSION:
+        raise ValueError("Unsupported archive version: {}".format(header["version"]))
+    return header, arrays
+
+
+def _decode(value):
+    return compas.json_loads(json.dumps(value))
+
+
+def _columns(specs, arrays):
+    columns = {}
+    for spec in specs:
+        if spec["dtype"] != "json":
+            columns[spec["name"]] = arrays[spec["member"]]
+    return columns
+
+
+def _decode_attributes(specs, arrays, count, skip=()):
+    from numpy import flatnonzero
+
+    specs = [spec for spec in specs if spec["name"] not in skip]
+    typed = [spec for spec in specs if spec["dtype"] != "json"]
+    names = [spec["name"] for spec in typed]
+    values = [arrays[spec["member"]].tolist() for spec in typed]
+    if values:
+        attrs = [dict(zip(names, row)) for row in zip(*values)]
+    else:
+        attrs = [{} for _ in range(count)]
+
+    for spec in specs:
+        if spec["dtype"] == "json":
+            for index, value in _decode(spec["values"]):
+                attrs[index][spec["name"]] = value
+        elif spec["mask"]:
+            for index in flatnonzero(~arrays[spec["member"] + "_mask"]).tolist():
+                del attrs[index][spec["name"]]
+    return attrs
+
+
+def _decode_network(header, key, arrays, columnar):
+    cls = cls_from_dtype(header["dtype"])
+    network = cls(name=header["name"])
+    network.attributes.update(_decode(header["attributes"]) or {})
+    network.default_node_attributes.update(_decode(header["default_node_attributes"]))
+    network.default_edge_attributes.update(_decode(header["default_edge_attributes"]))
+    if columnar is None:
+        columnar = header["columnar"]
+
+    nodes = header["nodes"] if header["nodes"] is not None else arrays[key + "/nodes"].tolist()
+    edges = arrays[key + "/edges"].tolist()
+    count = header["number_of_nodes"]
+    nodeattrs = header["node_attributes"]
+    edgeattrs = header["edge_attributes"]
+
+    if header["columnar"] and columnar:
+        # the stored columns become the columns of the network without copying
+        defaults = {name: network.default_node_attributes.get(name, 0.0) for name in NODE_COLUMNS}
+        store = AttributeColumns.from_arrays(defaults, _columns(nodeattrs, arrays), count)
+        node_attr = []
+        for index, extra in enumerate(_decode_attributes(nodeattrs, arrays, count, skip=NODE_COLUMNS)):
+            row = AttributeRow(store, index)
+            row.attr = extra or None
+            node_attr.append(row)
+        network._node_columns = store
+
+        defaults = {name: network.default_edge_attributes.get(name, 0.0) for name in EDGE_COLUMNS}
+        store = AttributeColumns.from_arrays(defaults, _columns(edgeattrs, arrays), len(edges))
+        edge_attr = []
+        for index, extra in enumerate(_decode_attributes(edgeattrs, arrays, len(edges), skip=EDGE_COLUMNS)):
+            row = AttributeRow(store, index)
+            row.attr = extra or None
+            edge_attr.append(row)
+        network._edge_columns = store
+    else:
+        node_attr = _decode_attributes(nodeattrs, arrays, count)
+        edge_attr = _decode_attributes(edgeattrs, arrays, len(edges))
+
+    network.node = dict(zip(nodes, node_attr))
+    network.edge = {node: {} for node in nodes}
+    network.adjacency = {node: {} for node in nodes}
+    for (i, j), attr in zip(edges, edge_attr):
+        u = nodes[i]
+        v = nodes[j]
+        network.edge[u][v] = attr
+        network.adjacency[u][v] = None
+        network.adjacency[v][u] = None
+    network._max_node = header["max_node"]
+    network._invalidate()
+
+    if columnar and not network.is_columnar:
+        network.set_columnar(True)
+
+    for spline in _decode(header["splines"]):
+        network.splines.append(Spline.__from_data__(spline, network))
+    for cable in _decode(header["cables"]):
+        network.cables.append(Cable.__from_data__(cable, network))
+    return network
+
+
+def npz_load(filepath, mmap=False, columnar=None):
+    """Read bend networks and related data from an archive written by :func:`npz_dump`.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the file.
+    mmap : bool, optional
+        If True, map the arrays of the archive into memory instead of reading them.
+        For networks with columnar storage, the mapped arrays are used as the columns of the network.
+        They are mapped copy-on-write, such that changes to the network are never written back to the file.
+    columnar : bool, optional
+        If True, load the networks with columnar storage.
+        If False, load them with per-element dicts.
+        Default is to restore the storage mode of the networks when they were written.
+
+    Returns
+    -------
+    :class:`compas_bender.datastructures.BendNetwork` | dict
+        The bend network, or the dict with the bend networks and other data,
+        as passed to :func:`npz_dump`.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a bend network archive, or was written by a newer version.
+
+    See Also
+    --------
+    :func:`npz_dump`, :func:`npz_load_arrays`
+
+    """
+    header, arrays = _read(filepath, mmap, mode="c")
+    data = {key: _decode(value) for key, value in header["data"].items()}
+    for key, network in header["networks"].items():
+        data[key] = _decode_network(network, key, arrays, columnar)
+    if header["single"]:
+        return data["data"]
+    return data
+
+
+def npz_load_arrays(filepath, key=None, mmap=True):
+    """Read the arrays of a bend network from an archive written by :func:`npz_dump`,
+    without reconstructing the network.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the file.
+    key : str, optional
+        The key of the network in the dict passed to :func:`npz_dump`.
+        Not required if the archive contains a single network.
+    mmap : bool, optional
+        If True, the arrays are read-only memory maps of the file.
+        If False, the arrays are read into memory.
+
+    Returns
+    -------
+    dict
+        A dict with the following items.
+
+        * ``"nodes"``: the identifiers of the nodes.
+        * ``"edges"``: an array of shape (number of edges, 2) with the indices of the nodes of the edges.
+        * ``"node_attributes"``: a dict mapping attribute names to arrays with one value per node.
+        * ``"edge_attributes"``: a dict mapping attribute names to arrays with one value per edge.
+
+        Attributes that are not stored as binary arrays, or are missing for some of the elements, are not included.
+
+    Raises
+    ------
+    KeyError
+        If the network is not in the archive.
+
+    Examples
+    --------
+    >>> arrays = npz_load_arrays("model.npz")  # doctest: +SKIP
+    >>> x = arrays["node_attributes"]["x"]  # doctest: +SKIP
+    >>> f = arrays["edge_attributes"]["f"]  # doctest: +SKIP
+
+    """
+    header, arrays = _read(filepath, mmap)
+    if key is None:
+        if len(header["networks"]) != 1:
+            raise KeyError("The archive contains multiple networks: {}".format(sorted(header["networks"])))
+        key = list(header["networks"])[0]
+    network = header["networks"][key]
+    complete = [spec for spec in network["node_attributes"] if not spec["mask"]]
+    return {
+        "nodes": network["nodes"] if network["nodes"] is not None else arrays[key + "/nodes"],
+        "edges": arrays[key + "/edges"],
+        "node_attributes": _columns(complete, arrays),
+        "edge_attributes": _columns([spec for spec in network["edge_attributes"] if not spec["mask"]], arrays),
+    }
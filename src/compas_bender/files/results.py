@@ -0,0 +1,426 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+
+VERSION = 1
+INDEX = "store.json"
+RUNS = "runs.jsonl"
+NODE_FIELDS = ["xyz", "r", "s", "m"]
+EDGE_FIELDS = ["q", "f", "l"]
+HISTORY = ["membrane", "spline", "displacements"]
+
+
+class ResultStore(object):
+    """
+    Store of the results of many solves of networks with the same topology,
+    in preallocated memory-mapped files.
+
+    The store is a folder with one ``.npy`` file per result field, with one slice per run,
+    a small JSON index with the dimensions of the fields,
+    and a log with one line per run identifier, written when the run is appended.
+    Runs that were appended before a crash are therefore still in the store when it is opened again.
+    The node fields (``xyz``, ``r``, ``s``, ``m``) have shape (capacity, number of nodes, 3),
+    the edge fields (``q``, ``f``, ``l``) have shape (capacity, number of edges),
+    and the convergence history has shape (capacity, history, 4),
+    with per recorded iteration the iteration number and the three convergence criteria.
+
+    Use :meth:`create` to create a new store and :meth:`open` to open an existing one.
+
+    Parameters
+    ----------
+    path : str
+        The path to the folder of the store.
+    mode : {"r", "r+"}
+        Read-only, or read and append.
+
+    Attributes
+    ----------
+    runs : list
+        The identifiers of the stored runs, in order of appending.
+    number_of_nodes : int
+    number_of_edges : int
+    capacity : int
+        The number of runs that fit in the files.
+        The files are grown automatically when the capacity is exceeded.
+
+    Examples
+    --------
+    >>> store = ResultStore.create("sweep", network, capacity=1000)  # doctest: +SKIP
+    >>> for run, radius in enumerate(radii):  # doctest: +SKIP
+    ...     spline.radius = radius
+    ...     iterations = bend_splines(network)
+    ...     store.append(run, network, iterations)
+    >>> store.close()  # doctest: +SKIP
+
+    >>> store = ResultStore.open("sweep")  # doctest: +SKIP
+    >>> store.get(10, "f")  # doctest: +SKIP
+    >>> store.field("xyz")[:, node, 2]  # doctest: +SKIP
+
+    """
+
+    def __init__(self, path, mode="r"):
+        if mode not in ("r", "r+"):
+            raise ValueError("Invalid mode: {}".format(mode))
+        self.path = path
+        self.mode = mode
+        with open(os.path.join(path, INDEX), "r") as f:
+            index = json.load(f)
+        if index["version"] > VERSION:
+            raise ValueError("Unsupported store version: {}".format(index["version"]))
+        self.number_of_nodes = index["number_of_nodes"]
+        self.number_of_edges = index["number_of_edges"]
+        self.history = index["history"]
+        self.runs = self._read_runs()
+        self._run_index = {run: i for i, run in enumerate(self.runs)}
+        self._fields = {}
+        self._edges = None
+
+    def __len__(self):
+        return len(self.runs)
+
+    def __contains__(self, run):
+        return run in self._run_index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @classmethod
+    def create(cls, path, network, capacity=100, history=100):
+        """Create a new store for the results of a network.
+
+        Parameters
+        ----------
+        path : str
+            The path to the folder of the store.
+            The folder is created if it doesn't exist.
+        network : :class:`compas_bender.datastructures.BendNetwork`
+            The network of which the results will be stored.
+            All runs must have the same topology as this network.
+        capacity : int, optional
+            The initial number of runs.
+        history : int, optional
+            The maximum number of recorded iterations of the convergence history per run.
+            Additional iterations are not stored.
+
+        Returns
+        -------
+        :class:`ResultStore`
+            The store, opened for appending.
+
+        Raises
+        ------
+        ValueError
+            If the folder already contains a store.
+
+        """
+        from numpy import save
+
+        if os.path.exists(os.path.join(path, INDEX)):
+            raise ValueError("The folder already contains a result store: {}".format(path))
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        save(os.path.join(path, "edges.npy"), network.edges_array())
+
+        index = {
+            "version": VERSION,
+            "number_of_nodes": network.number_of_nodes(),
+            "number_of_edges": len(network.edges_array()),
+            "history": history,
+        }
+        for name in NODE_FIELDS + EDGE_FIELDS + ["history"]:
+            cls._allocate(path, name, index, max(1, capacity))
+        with open(os.path.join(path, RUNS), "w"):
+            pass
+        with open(os.path.join(path, INDEX), "w") as f:
+            json.dump(index, f)
+        return cls(path, mode="r+")
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        """Open an existing store.
+
+        Parameters
+        ----------
+        path : str
+            The path to the folder of the store.
+        mode : {"r", "r+"}, optional
+            Read-only, or read and append.
+
+        Returns
+        -------
+        :class:`ResultStore`
+
+        """
+        return cls(path, mode=mode)
+
+    @staticmethod
+    def _shape(name, index, capacity):
+        if name in NODE_FIELDS:
+            return (capacity, index["number_of_nodes"], 3)
+        if name in EDGE_FIELDS:
+            return (capacity, index["number_of_edges"])
+        if name == "history":
+            return (capacity, index["history"], 4)
+        raise KeyError(name)
+
+    @classmethod
+    def _allocate(cls, path, name, index, capacity, suffix=".npy"):
+        from numpy import nan
+        from numpy.lib.format import open_memmap
+
+        shape = cls._shape(name, index, capacity)
+        array = open_memmap(os.path.join(path, name + suffix), mode="w+", dtype=float, shape=shape)
+        if name == "history":
+            array[:] = nan
+        return array
+
+    # --------------------------------------------------------------------------
+    # Files
+    # --------------------------------------------------------------------------
+
+    def _read_runs(self):
+        # a line without a newline was not written completely,
+        # and is removed before appending more lines
+        with open(os.path.join(self.path, RUNS), "rb") as f:
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data) and self.mode == "r+":
+            with open(os.path.join(self.path, RUNS), "r+b") as f:
+                f.truncate(complete)
+        return [json.loads(line) for line in data[:complete].decode("utf-8").splitlines()]
+
+    @property
+    def capacity(self):
+        return len(self._field("history"))
+
+    def _field(self, name):
+        from numpy.lib.format import open_memmap
+
+        if name not in self._fields:
+            self._fields[name] = open_memmap(os.path.join(self.path, name + ".npy"), mode=self.mode)
+        return self._fields[name]
+
+    def _grow(self):
+        index = {
+            "number_of_nodes": self.number_of_nodes,
+            "number_of_edges": self.number_of_edges,
+            "history": self.history,
+        }
+        capacity = 2 * self.capacity
+        for name in NODE_FIELDS + EDGE_FIELDS + ["history"]:
+            old = self._fields.pop(name, None)
+            if old is None:
+                old = self._field(name)
+                del self._fields[name]
+            new = self._allocate(self.path, name, index, capacity, suffix=".tmp.npy")
+            new[: len(old)] = old
+            new.flush()
+            del old
+            del new
+            os.replace(os.path.join(self.path, name + ".tmp.npy"), os.path.join(self.path, name + ".npy"))
+
+    def flush(self):
+        """Write all pending changes of the memory maps to disk.
+
+        Returns
+        -------
+        None
+
+        """
+        if self.mode == "r":
+            return
+        for array in self._fields.values():
+            array.flush()
+
+    def close(self):
+        """Flush the store and release the memory maps.
+
+        Returns
+        -------
+        None
+
+        """
+        self.flush()
+        self._fields = {}
+
+    # --------------------------------------------------------------------------
+    # Writing
+    # --------------------------------------------------------------------------
+
+    def append(self, run, network, iterations=None):
+        """Append the results of a run.
+
+        Parameters
+        ----------
+        run : int | str
+            The identifier of the run.
+        network : :class:`compas_bender.datastructures.BendNetwork`
+            The network with the results of the run.
+        iterations : dict, optional
+            The convergence history of the run, as returned by :func:`compas_bender.bend.bend_splines`.
+
+        Returns
+        -------
+        int
+            The index of the run in the store.
+
+        Raises
+        ------
+        ValueError
+            If the store is read-only, the run is already in the store,
+            or the topology of the network doesn't match the store.
+
+        """
+        from numpy import array_equal
+
+        if self._edges is None:
+            from numpy import load
+
+            self._edges = load(os.path.join(self.path, "edges.npy"))
+        if not array_equal(network.edges_array(), self._edges):
+            raise ValueError("The topology of the network does not match the topology of the store.")
+
+        values = {
+            "xyz": network.nodes_xyz_array(),
+            "r": network.residuals_array(),
+            "s": network.shears_array(),
+            "m": network.moments_array(),
+        }
+        values.update(zip(EDGE_FIELDS, network.edges_attributes_array(EDGE_FIELDS).T))
+        return self.append_arrays(run, iterations=iterations, **values)
+
+    def append_arrays(self, run, iterations=None, **values):
+        """Append the results of a run from arrays.
+
+        Parameters
+        ----------
+        run : int | str
+            The identifier of the run.
+        iterations : dict, optional
+            The convergence history of the run.
+        **values : dict[str, array-like]
+            The values of the result fields.
+            Missing fields are stored as zeros.
+
+        Returns
+        -------
+        int
+            The index of the run in the store.
+
+        Raises
+        ------
+        ValueError
+            If the store is read-only, or the run is already in the store.
+
+        """
+        if self.mode == "r":
+            raise ValueError("The store is read-only.")
+        if run in self._run_index:
+            raise ValueError("The run is already in the store: {}".format(run))
+
+        index = len(self.runs)
+        if index == self.capacity:
+            self._grow()
+
+        for name in NODE_FIELDS + EDGE_FIELDS:
+            self._field(name)[index] = values.get(name, 0.0)
+
+        history = self._field("history")
+        history[index] = float("nan")
+        if iterations:
+            membrane, spline, displacements = (iterations[key] for key in HISTORY)
+            keys = list(membrane)[: self.history]
+            for i, k in enumerate(keys):
+                history[index, i] = (int(k), membrane[k], spline[k], displacements[k])
+
+        # the run is logged after its results are written,
+        # such that every logged run has results
+        with open(os.path.join(self.path, RUNS), "a") as f:
+            f.write(json.dumps(run) + "\n")
+        self.runs.append(run)
+        self._run_index[run] = index
+        return index
+
+    # --------------------------------------------------------------------------
+    # Reading
+    # --------------------------------------------------------------------------
+
+    def edges(self):
+        """Return the edges of the stored network as pairs of node indices.
+
+        Returns
+        -------
+        numpy.ndarray
+            An integer array of shape (number of edges, 2).
+
+        """
+        from numpy import load
+
+        return load(os.path.join(self.path, "edges.npy"), mmap_mode="r")
+
+    def field(self, name):
+        """Return a field of all stored runs as a memory map.
+
+        Parameters
+        ----------
+        name : {"xyz", "r", "s", "m", "q", "f", "l"}
+            The name of the field.
+
+        Returns
+        -------
+        numpy.memmap
+            The values of the field, with the first dimension the run index.
+
+        """
+        if name not in NODE_FIELDS + EDGE_FIELDS:
+            raise KeyError(name)
+        return self._field(name)[: len(self.runs)]
+
+    def get(self, run, name):
+        """Return a field of a single run as a memory map.
+
+        Parameters
+        ----------
+        run : int | str
+            The identifier of the run.
+        name : {"xyz", "r", "s", "m", "q", "f", "l"}
+            The name of the field.
+
+        Returns
+        -------
+        numpy.memmap
+
+        """
+        return self.field(name)[self._run_index[run]]
+
+    def iterations(self, run):
+        """Return the convergence history of a run.
+
+        Parameters
+        ----------
+        run : int | str
+            The identifier of the run.
+
+        Returns
+        -------
+        dict
+            The convergence history, in the format returned by :func:`compas_bender.bend.bend_splines`.
+
+        """
+        from numpy import isnan
+
+        history = self._field("history")[self._run_index[run]]
+        iterations = {key: {} for key in HISTORY}
+        for k, membrane, spline, displacements in history[~isnan(history[:, 0])].tolist():
+            k = str(int(k))
+            iterations["membrane"][k] = membrane
+            iterations["spline"][k] = spline
+            iterations["displacements"][k] = displacements
+        return iterations
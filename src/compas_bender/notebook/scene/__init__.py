@@ -0,0 +1,13 @@
+from compas.plugins import plugin
+from compas.scene import register
+from compas_bender.datastructures import BendNetwork
+
+from .bendnetworkobject import ThreeBendNetworkObject
+
+
+@plugin(category="factories", requires=["pythreejs", "compas_notebook"])
+def register_scene_objects():
+    register(BendNetwork, ThreeBendNetworkObject, context="Notebook")
+
+
+__all__ = ["ThreeBendNetworkObject"]
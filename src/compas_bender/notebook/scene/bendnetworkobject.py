@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pythreejs as three
+from compas_notebook.scene import ThreeSceneObject
+
+from compas.scene import GraphObject
+from compas_bender.scene import level_of_detail
+
+
+class ThreeBendNetworkObject(ThreeSceneObject, GraphObject):
+    """
+    Scene object for drawing the results of a :class:`compas_bender.datastructures.BendNetwork` in a notebook,
+    with automatic level of detail.
+
+    Edges with large forces are drawn as pipes, all other edges as a single buffer of line segments,
+    decimated to the resolution of the view.
+    The geometry is generated when the view draws the object, not when the object is added to the scene.
+
+    Parameters
+    ----------
+    width : int, optional
+        The width of the view in pixels.
+    pixels : float, optional
+        The size in pixels of the grid used for decimating the lines.
+    threshold : float, optional
+        The minimum force magnitude of pipes, as a fraction of the largest force magnitude.
+    radius : tuple[float, float] | float, optional
+        The radii of the pipes with the smallest and largest force magnitude,
+        or a single radius for all pipes.
+    sides : int, optional
+        The maximum number of sides of the pipes.
+    **kwargs : dict, optional
+        Additional keyword arguments for :class:`compas.scene.GraphObject`.
+
+    See Also
+    --------
+    :func:`compas_bender.scene.level_of_detail`
+
+    """
+
+    def __init__(self, width=800, pixels=2.0, threshold=0.1, radius=(0.01, 0.2), sides=12, **kwargs):
+        super(ThreeBendNetworkObject, self).__init__(**kwargs)
+        self.width = width
+        self.pixels = pixels
+        self.threshold = threshold
+        self.radius = radius
+        self.sides = sides
+
+    @property
+    def network(self):
+        return self.graph
+
+    def draw(self):
+        """Draw the lines and pipes of the network at the current level of detail.
+
+        Returns
+        -------
+        list[pythreejs.Object3D]
+
+        """
+        from numpy import float32
+        from numpy import uint32
+
+        lines, pipes = level_of_detail(
+            self.network,
+            width=self.width,
+            pixels=self.pixels,
+            threshold=self.threshold,
+            radius=self.radius,
+            sides=self.sides,
+        )
+        self._guids = []
+
+        if lines.number_of_segments:
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": three.BufferAttribute(lines.vertices.astype(float32), normalized=False),
+                    "color": three.BufferAttribute(lines.colors.astype(float32), normalized=False),
+                }
+            )
+            material = three.LineBasicMaterial(vertexColors="VertexColors")
+            self._guids.append(three.LineSegments(geometry, material))
+
+        if pipes.number_of_faces:
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": three.BufferAttribute(pipes.vertices.astype(float32), normalized=False),
+                    "color": three.BufferAttribute(pipes.colors.astype(float32), normalized=False),
+                    "index": three.BufferAttribute(pipes.faces.ravel().astype(uint32), normalized=False),
+                }
+            )
+            geometry.exec_three_obj_method("computeVertexNormals")
+            material = three.MeshStandardMaterial(vertexColors="VertexColors", side="DoubleSide")
+            self._guids.append(three.Mesh(geometry, material))
+
+        return self.guids
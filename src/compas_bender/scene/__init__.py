@@ -0,0 +1,23 @@
+from .buffers import LineBuffer
+from .buffers import MeshBuffer
+from .geometry import tubes
+from .geometry import force_radii
+from .geometry import force_pipes
+from .geometry import moment_ribbons
+from .geometry import reaction_arrows
+from .lod import screen_scale
+from .lod import decimate_edges
+from .lod import level_of_detail
+
+__all__ = [
+    "LineBuffer",
+    "MeshBuffer",
+    "tubes",
+    "force_radii",
+    "force_pipes",
+    "moment_ribbons",
+    "reaction_arrows",
+    "screen_scale",
+    "decimate_edges",
+    "level_of_detail",
+]
@@ -0,0 +1,238 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas.colors import Color
+from compas.datastructures import Mesh
+from compas.geometry import Line
+
+
+class MeshBuffer(object):
+    """
+    Triangle mesh stored in flat arrays, for displaying large numbers of elements as a single object.
+
+    Parameters
+    ----------
+    vertices : array-like
+        The coordinates of the vertices, as an array of shape (number of vertices, 3).
+    faces : array-like
+        The vertex indices of the triangles, as an integer array of shape (number of faces, 3).
+    colors : array-like, optional
+        The RGB colors of the vertices, with components between 0 and 1,
+        as an array of shape (number of vertices, 3).
+        Default is white.
+
+    Examples
+    --------
+    >>> from compas_viewer.scene import BufferGeometry  # doctest: +SKIP
+    >>> buffer = MeshBuffer.merged([force_pipes(network), reaction_arrows(network)])  # doctest: +SKIP
+    >>> faces, facecolor = buffer.to_triangles()  # doctest: +SKIP
+    >>> viewer.scene.add(BufferGeometry(faces=faces, facecolor=facecolor), show_lines=False)  # doctest: +SKIP
+
+    """
+
+    __slots__ = ("vertices", "faces", "colors")
+
+    def __init__(self, vertices, faces, colors=None):
+        from numpy import asarray
+        from numpy import float64
+        from numpy import int64
+        from numpy import ones
+
+        self.vertices = asarray(vertices, dtype=float64).reshape((-1, 3))
+        self.faces = asarray(faces, dtype=int64).reshape((-1, 3))
+        if colors is None:
+            colors = ones(self.vertices.shape)
+        self.colors = asarray(colors, dtype=float64).reshape((-1, 3))
+
+    def __repr__(self):
+        return "MeshBuffer(vertices={}, faces={})".format(self.number_of_vertices, self.number_of_faces)
+
+    @property
+    def number_of_vertices(self):
+        """int : The number of vertices of the buffer."""
+        return len(self.vertices)
+
+    @property
+    def number_of_faces(self):
+        """int : The number of triangles of the buffer."""
+        return len(self.faces)
+
+    @classmethod
+    def merged(cls, buffers):
+        """Merge multiple buffers into one.
+
+        Parameters
+        ----------
+        buffers : list[:class:`MeshBuffer`]
+
+        Returns
+        -------
+        :class:`MeshBuffer`
+
+        """
+        from numpy import cumsum
+        from numpy import vstack
+
+        buffers = list(buffers)
+        if not buffers:
+            return cls([], [])
+        offsets = cumsum([0] + [buffer.number_of_vertices for buffer in buffers[:-1]])
+        vertices = vstack([buffer.vertices for buffer in buffers])
+        faces = vstack([buffer.faces + offset for buffer, offset in zip(buffers, offsets)])
+        colors = vstack([buffer.colors for buffer in buffers])
+        return cls(vertices, faces, colors)
+
+    def to_triangles(self, alpha=1.0):
+        """Convert the buffer to the corners of its triangles, with one RGBA color per corner.
+
+        This is the format of the face buffers of OpenGL viewers,
+        such as :class:`compas_viewer.scene.BufferGeometry`.
+
+        Parameters
+        ----------
+        alpha : float, optional
+            The opacity of the colors.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The coordinates of the corners, as an array of shape (3 * number of faces, 3),
+            and their colors, as an array of shape (3 * number of faces, 4).
+
+        """
+        from numpy import full
+        from numpy import hstack
+
+        corners = self.faces.ravel()
+        colors = self.colors[corners]
+        return self.vertices[corners], hstack((colors, full((len(colors), 1), float(alpha))))
+
+    def to_vertices_and_faces(self):
+        """Convert the buffer to lists of vertices and faces.
+
+        Returns
+        -------
+        tuple[list[list[float]], list[list[int]]]
+
+        """
+        return self.vertices.tolist(), self.faces.tolist()
+
+    def to_mesh(self):
+        """Convert the buffer to a mesh.
+
+        Returns
+        -------
+        :class:`compas.datastructures.Mesh`
+            A mesh with one vertex per vertex of the buffer, in the same order.
+
+        Notes
+        -----
+        The construction of a mesh is much slower than the construction of the buffer.
+        For very large buffers, pass the arrays of :meth:`to_triangles` to the viewer instead.
+
+        """
+        vertices, faces = self.to_vertices_and_faces()
+        return Mesh.from_vertices_and_faces(vertices, faces)
+
+    def vertexcolor(self):
+        """Return the vertex colors of the buffer as a dict, for the vertices of the mesh returned by :meth:`to_mesh`.
+
+        Returns
+        -------
+        dict[int, :class:`compas.colors.Color`]
+
+        """
+        return {index: Color(*rgb) for index, rgb in enumerate(self.colors.tolist())}
+
+
+class LineBuffer(object):
+    """
+    Line segments stored in flat arrays, for displaying large numbers of edges as a single object.
+
+    Parameters
+    ----------
+    vertices : array-like
+        The start and end points of the segments, as an array of shape (2 * number of segments, 3).
+    colors : array-like, optional
+        The RGB colors of the vertices, with components between 0 and 1,
+        as an array of shape (2 * number of segments, 3).
+        Default is black.
+
+    """
+
+    __slots__ = ("vertices", "colors")
+
+    def __init__(self, vertices, colors=None):
+        from numpy import asarray
+        from numpy import float64
+        from numpy import zeros
+
+        self.vertices = asarray(vertices, dtype=float64).reshape((-1, 3))
+        if len(self.vertices) % 2:
+            raise ValueError("A line buffer needs an even number of vertices.")
+        if colors is None:
+            colors = zeros(self.vertices.shape)
+        self.colors = asarray(colors, dtype=float64).reshape((-1, 3))
+
+    def __repr__(self):
+        return "LineBuffer(segments={})".format(self.number_of_segments)
+
+    @property
+    def number_of_segments(self):
+        """int : The number of segments of the buffer."""
+        return len(self.vertices) // 2
+
+    @classmethod
+    def merged(cls, buffers):
+        """Merge multiple buffers into one.
+
+        Parameters
+        ----------
+        buffers : list[:class:`LineBuffer`]
+
+        Returns
+        -------
+        :class:`LineBuffer`
+
+        """
+        from numpy import vstack
+
+        buffers = list(buffers)
+        if not buffers:
+            return cls([])
+        return cls(vstack([buffer.vertices for buffer in buffers]), vstack([buffer.colors for buffer in buffers]))
+
+    def to_segments(self, alpha=1.0):
+        """Convert the buffer to the end points of its segments, with one RGBA color per end point.
+
+        This is the format of the line buffers of OpenGL viewers,
+        such as :class:`compas_viewer.scene.BufferGeometry`.
+
+        Parameters
+        ----------
+        alpha : float, optional
+            The opacity of the colors.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The coordinates of the end points, as an array of shape (2 * number of segments, 3),
+            and their colors, as an array of shape (2 * number of segments, 4).
+
+        """
+        from numpy import full
+        from numpy import hstack
+
+        return self.vertices, hstack((self.colors, full((len(self.colors), 1), float(alpha))))
+
+    def to_lines(self):
+        """Convert the buffer to a list of lines.
+
+        Returns
+        -------
+        list[:class:`compas.geometry.Line`]
+
+        """
+        vertices = self.vertices.tolist()
+        return [Line(vertices[i], vertices[i + 1]) for i in range(0, len(vertices), 2)]
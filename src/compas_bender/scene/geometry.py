@@ -0,0 +1,296 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas.colors import Color
+
+from .buffers import MeshBuffer
+
+PI = 3.141592653589793
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _edge_indices(network, edges):
+    if edges is None:
+        return slice(None)
+    edge_index = network.edge_index(undirected=True)
+    return [edge_index[tuple(edge)] for edge in edges]
+
+
+def _rgb(color):
+    return list(Color.coerce(color).rgb)
+
+
+def _frames(directions):
+    """Compute two unit vectors perpendicular to every direction vector."""
+    from numpy import abs
+    from numpy import cross
+    from numpy import zeros_like
+    from numpy.linalg import norm
+
+    reference = zeros_like(directions)
+    reference[:, 2] = 1.0
+    reference[abs(directions[:, 2]) > 0.9 * norm(directions, axis=1)] = [1.0, 0.0, 0.0]
+    u = cross(directions, reference)
+    length = norm(u, axis=1)
+    length[length == 0] = 1.0
+    u /= length[:, None]
+    v = cross(directions, u)
+    length = norm(v, axis=1)
+    length[length == 0] = 1.0
+    v /= length[:, None]
+    return u, v
+
+
+def tubes(start, end, radius, sides=8, end_radius=None):
+    """Compute the vertices and triangles of open tubes or cones along line segments, in bulk.
+
+    Parameters
+    ----------
+    start : array-like
+        The start points of the segments, as an array of shape (n, 3).
+    end : array-like
+        The end points of the segments, as an array of shape (n, 3).
+    radius : float | array-like
+        The radius of the tubes at the start points, per tube or for all tubes.
+    sides : int, optional
+        The number of sides of the tubes.
+    end_radius : float | array-like, optional
+        The radius of the tubes at the end points.
+        Default is the same as at the start points.
+        Use zero for cones.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The vertices, as an array of shape (2 * sides * n, 3),
+        and the triangles, as an array of shape (2 * sides * n, 3).
+
+    """
+    from numpy import arange
+    from numpy import asarray
+    from numpy import broadcast_to
+    from numpy import cos
+    from numpy import float64
+    from numpy import sin
+    from numpy import stack
+
+    start = asarray(start, dtype=float64).reshape((-1, 3))
+    end = asarray(end, dtype=float64).reshape((-1, 3))
+    n = len(start)
+    r0 = broadcast_to(asarray(radius, dtype=float64), (n,))
+    r1 = r0 if end_radius is None else broadcast_to(asarray(end_radius, dtype=float64), (n,))
+
+    u, v = _frames(end - start)
+    angles = 2 * PI * arange(sides) / sides
+    ring = cos(angles)[None, :, None] * u[:, None, :] + sin(angles)[None, :, None] * v[:, None, :]
+    a = start[:, None, :] + r0[:, None, None] * ring
+    b = end[:, None, :] + r1[:, None, None] * ring
+    vertices = stack((a, b), axis=1).reshape((-1, 3))
+
+    k = arange(sides)
+    k1 = (k + 1) % sides
+    local = stack((stack((k, k1, sides + k1), axis=1), stack((k, sides + k1, sides + k), axis=1)), axis=1)
+    local = local.reshape((-1, 3))
+    faces = (arange(n) * 2 * sides)[:, None, None] + local[None, :, :]
+    return vertices, faces.reshape((-1, 3))
+
+
+# ==============================================================================
+# Results
+# ==============================================================================
+
+
+def force_radii(network, radius=(0.01, 0.2)):
+    """Compute the radii of pipes proportional to the magnitude of the axial forces in the edges.
+
+    Parameters
+    ----------
+    network : :class:`compas_bender.datastructures.BendNetwork`
+    radius : tuple[float, float] | float, optional
+        The radii of the pipes with the smallest and largest force magnitude,
+        or a single radius for all pipes.
+
+    Returns
+    -------
+    numpy.ndarray
+        The radii of all edges, as an array of shape (number of edges,).
+
+    """
+    from numpy import abs
+    from numpy import full
+
+    forces = abs(network.edge_forces_array())
+    if isinstance(radius, (int, float)):
+        return full(len(forces), float(radius))
+    rmin, rmax = radius
+    if not len(forces):
+        return forces
+    fmin = forces.min()
+    fmax = forces.max()
+    if fmax == fmin:
+        return full(len(forces), float(rmin))
+    return rmin + (forces - fmin) / (fmax - fmin) * (rmax - rmin)
+
+
+def force_pipes(network, edges=None, radius=(0.01, 0.2), scale=1.0, sides=8, tension=None, compression=None):
+    """Generate pipes along the edges of a network, with radii proportional to the magnitude of the axial forces.
+
+    The radii are scaled with respect to the forces of all edges of the network,
+    such that pipes generated separately for different subsets of edges are consistent.
+
+    Parameters
+    ----------
+    network : :class:`compas_bender.datastructures.BendNetwork`
+    edges : list[tuple[int, int]], optional
+        The edges, in any orientation.
+        Default is all edges.
+    radius : tuple[float, float] | float, optional
+        The radii of the pipes with the smallest and largest force magnitude,
+        or a single radius for all pipes.
+    scale : float, optional
+        A scaling factor for the radii.
+    sides : int, optional
+        The number of sides of the pipes.
+    tension : :class:`compas.colors.Color`, optional
+        The color of edges in tension.
+        Default is red.
+    compression : :class:`compas.colors.Color`, optional
+        The color of edges in compression.
+        Default is blue.
+
+    Returns
+    -------
+    :class:`MeshBuffer`
+
+    """
+    indices = _edge_indices(network, edges)
+    xyz = network.nodes_xyz_array()
+    uv = network.edges_array()[indices]
+    forces = network.edge_forces_array()[indices]
+    radii = scale * force_radii(network, radius)[indices]
+    return _pipes(xyz, uv, forces, radii, sides, tension, compression)
+
+
+def _pipes(xyz, uv, forces, radii, sides, tension=None, compression=None):
+    from numpy import array
+    from numpy import repeat
+    from numpy import where
+
+    vertices, faces = tubes(xyz[uv[:, 0]], xyz[uv[:, 1]], radii, sides=sides)
+    tension = _rgb(tension or Color.red())
+    compression = _rgb(compression or Color.blue())
+    colors = where((forces > 0)[:, None], array([tension]), array([compression]))
+    return MeshBuffer(vertices, faces, repeat(colors, 2 * sides, axis=0))
+
+
+def moment_ribbons(network, splines=None, scale=1.0, color=None):
+    """Generate ribbons along the splines of a network, visualising the bending moment vectors at the nodes.
+
+    Every spline edge is represented by a quad between the edge and the edge offset by the scaled moment vectors.
+    Edges without a bending moment at both of their nodes are skipped,
+    which includes the edges at the free ends of the splines.
+
+    Parameters
+    ----------
+    network : :class:`compas_bender.datastructures.BendNetwork`
+    splines : list[:class:`compas_bender.datastructures.Spline`], optional
+        Default is the splines of the network.
+    scale : float, optional
+        The scaling factor of the moment vectors.
+    color : :class:`compas.colors.Color`, optional
+        Default is yellow.
+
+    Returns
+    -------
+    :class:`MeshBuffer`
+
+    """
+    from numpy import any
+    from numpy import arange
+    from numpy import array
+    from numpy import concatenate
+    from numpy import stack
+    from numpy import tile
+
+    splines = network.splines if splines is None else splines
+    if not splines:
+        return MeshBuffer([], [])
+    xyz = network.nodes_xyz_array()
+    moments = scale * network.moments_array()
+
+    a = concatenate([spline.node_indices[:-1] for spline in splines]).astype(int)
+    b = concatenate([spline.node_indices[1:] for spline in splines]).astype(int)
+    keep = any(moments[a] != 0, axis=1) & any(moments[b] != 0, axis=1)
+    a = a[keep]
+    b = b[keep]
+
+    vertices = stack((xyz[a], xyz[b], xyz[b] + moments[b], xyz[a] + moments[a]), axis=1).reshape((-1, 3))
+    local = array([[0, 1, 2], [0, 2, 3]])
+    faces = (4 * arange(len(a)))[:, None, None] + local[None, :, :]
+    colors = tile(_rgb(color or Color.yellow()), (len(vertices), 1))
+    return MeshBuffer(vertices, faces.reshape((-1, 3)), colors)
+
+
+def reaction_arrows(network, scale=0.2, radius=0.02, sides=8, head=0.25, color=None):
+    """Generate arrows representing the reaction forces at the anchored nodes of a network.
+
+    Arrows of reactions pulling on the structure start at the anchor,
+    arrows of reactions pushing on the structure end at the anchor.
+
+    Parameters
+    ----------
+    network : :class:`compas_bender.datastructures.BendNetwork`
+    scale : float, optional
+        The scaling factor of the reaction forces.
+    radius : float, optional
+        The radius of the shafts of the arrows.
+        The heads have twice this radius.
+    sides : int, optional
+        The number of sides of the shafts and heads.
+    head : float, optional
+        The length of the heads, as a fraction of the length of the arrows.
+    color : :class:`compas.colors.Color`, optional
+        Default is dark green.
+
+    Returns
+    -------
+    :class:`MeshBuffer`
+
+    """
+    from numpy import add
+    from numpy import tile
+    from numpy import vstack
+    from numpy import where
+    from numpy import zeros_like
+
+    xyz = network.nodes_xyz_array()
+    uv = network.edges_array()
+    reactions = network.reactions_array()
+    # the direction of the arrow depends on the direction of the forces in the edges at the anchor
+    vectors = xyz[uv[:, 1]] - xyz[uv[:, 0]]
+    forcevectors = network.edge_forces_array()[:, None] * vectors
+    edgevectors = zeros_like(xyz)
+    add.at(edgevectors, uv[:, 0], vectors)
+    add.at(edgevectors, uv[:, 1], -vectors)
+    nodeforces = zeros_like(xyz)
+    add.at(nodeforces, uv[:, 0], forcevectors)
+    add.at(nodeforces, uv[:, 1], -forcevectors)
+
+    nodes = (reactions != 0).any(axis=1).nonzero()[0]
+    vectors = scale * reactions[nodes]
+    pulling = (edgevectors[nodes] * nodeforces[nodes]).sum(axis=1)[:, None] > 0
+    start = where(pulling, xyz[nodes], xyz[nodes] - vectors)
+    middle = start + (1 - head) * vectors
+    end = start + vectors
+
+    shafts, shaftfaces = tubes(start, middle, radius, sides=sides)
+    heads, headfaces = tubes(middle, end, 2 * radius, sides=sides, end_radius=0.0)
+    vertices = vstack((shafts, heads))
+    faces = vstack((shaftfaces, headfaces + len(shafts)))
+    colors = tile(_rgb(color or Color.green().darkened(50)), (len(vertices), 1))
+    return MeshBuffer(vertices, faces, colors)
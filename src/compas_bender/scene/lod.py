@@ -0,0 +1,184 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas.colors import Color
+
+from .buffers import LineBuffer
+from .buffers import MeshBuffer
+from .geometry import _pipes
+from .geometry import _rgb
+from .geometry import force_radii
+
+# the number of sides of pipes with a radius on screen of less than the given number of pixels
+SIDES = [(2.0, 3), (8.0, 6)]
+
+
+def screen_scale(xyz, width):
+    """Estimate the number of pixels per model unit when a set of points is zoomed to fit the width of a view.
+
+    Parameters
+    ----------
+    xyz : array-like
+        The coordinates of the points.
+    width : int
+        The width of the view in pixels.
+
+    Returns
+    -------
+    float
+        The number of pixels per model unit,
+        or infinity if the points have no extent.
+
+    """
+    from numpy import asarray
+    from numpy.linalg import norm
+
+    xyz = asarray(xyz).reshape((-1, 3))
+    if not len(xyz):
+        return float("inf")
+    diagonal = norm(xyz.max(axis=0) - xyz.min(axis=0))
+    if diagonal == 0:
+        return float("inf")
+    return width / diagonal
+
+
+def decimate_edges(xyz, edges, size):
+    """Decimate a set of edges by clustering their end points on a regular grid.
+
+    All points in the same cell of the grid are replaced by their centroid.
+    Edges with both end points in the same cell are removed,
+    and edges connecting the same pair of cells are merged.
+
+    Parameters
+    ----------
+    xyz : array-like
+        The coordinates of the points, as an array of shape (n, 3).
+    edges : array-like
+        Pairs of point indices, as an integer array of shape (m, 2).
+    size : float
+        The size of the cells of the grid.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        The coordinates of the cluster centroids,
+        the remaining edges as pairs of cluster indices,
+        and for every remaining edge the index of one of the original edges it represents.
+
+    """
+    from numpy import add
+    from numpy import arange
+    from numpy import asarray
+    from numpy import bincount
+    from numpy import float64
+    from numpy import floor
+    from numpy import int64
+    from numpy import sort
+    from numpy import unique
+    from numpy import zeros
+
+    xyz = asarray(xyz, dtype=float64).reshape((-1, 3))
+    edges = asarray(edges, dtype=int64).reshape((-1, 2))
+    if not len(xyz) or not size > 0:
+        return xyz, edges, arange(len(edges))
+
+    cells = floor((xyz - xyz.min(axis=0)) / size).astype(int64)
+    _, labels = unique(cells, axis=0, return_inverse=True)
+    labels = labels.ravel()
+    count = labels.max() + 1
+    centroids = zeros((count, 3))
+    add.at(centroids, labels, xyz)
+    centroids /= bincount(labels, minlength=count)[:, None]
+
+    pairs = labels[edges]
+    keep = (pairs[:, 0] != pairs[:, 1]).nonzero()[0]
+    if not len(keep):
+        return centroids, zeros((0, 2), dtype=int64), keep
+    _, first = unique(sort(pairs[keep], axis=1), axis=0, return_index=True)
+    first = sort(first)
+    return centroids, pairs[keep[first]], keep[first]
+
+
+def level_of_detail(
+    network,
+    width=800,
+    pixels=2.0,
+    threshold=0.1,
+    radius=(0.01, 0.2),
+    sides=12,
+    tension=None,
+    compression=None,
+):
+    """Generate the result geometry of a network at a level of detail suitable for a view of a given size.
+
+    Edges with a force above the threshold, and a pipe at least half a pixel wide on screen,
+    are represented by pipes, with the number of sides depending on the size of the pipes on screen.
+    All other edges are merged into a single buffer of lines,
+    decimated such that no segment is shorter than the given number of pixels.
+
+    Parameters
+    ----------
+    network : :class:`compas_bender.datastructures.BendNetwork`
+    width : int, optional
+        The width of the view in pixels.
+        The scale of the view is estimated by zooming the network to fit the width.
+    pixels : float, optional
+        The size in pixels of the grid used for decimating the lines.
+    threshold : float, optional
+        The minimum force magnitude of pipes, as a fraction of the largest force magnitude.
+        Use a value above 1 to represent all edges with lines.
+    radius : tuple[float, float] | float, optional
+        The radii of the pipes with the smallest and largest force magnitude,
+        or a single radius for all pipes.
+    sides : int, optional
+        The maximum number of sides of the pipes.
+    tension : :class:`compas.colors.Color`, optional
+        The color of edges in tension.
+        Default is red.
+    compression : :class:`compas.colors.Color`, optional
+        The color of edges in compression.
+        Default is blue.
+
+    Returns
+    -------
+    tuple[:class:`LineBuffer`, :class:`MeshBuffer`]
+        The lines and the pipes.
+
+    """
+    from numpy import abs
+    from numpy import array
+    from numpy import repeat
+    from numpy import where
+
+    xyz = network.nodes_xyz_array()
+    uv = network.edges_array()
+    forces = network.edge_forces_array()
+    magnitudes = abs(forces)
+    scale = screen_scale(xyz, width)
+
+    # pipes
+    radii = force_radii(network, radius)
+    onscreen = radii * scale
+    fmax = magnitudes.max() if len(magnitudes) else 0.0
+    is_pipe = (magnitudes > 0) & (magnitudes >= threshold * fmax) & (onscreen >= 0.5)
+
+    pipes = []
+    lower = 0.0
+    for upper, count in SIDES + [(float("inf"), sides)]:
+        count = min(count, sides)
+        selected = (is_pipe & (onscreen >= lower) & (onscreen < upper)).nonzero()[0]
+        lower = upper
+        if len(selected):
+            pipes.append(_pipes(xyz, uv[selected], forces[selected], radii[selected], count, tension, compression))
+
+    # lines
+    lines = (~is_pipe).nonzero()[0]
+    points, segments, represents = decimate_edges(xyz, uv[lines], pixels / scale)
+    represents = lines[represents]
+    tension = _rgb(tension or Color.red())
+    compression = _rgb(compression or Color.blue())
+    colors = where((forces[represents] > 0)[:, None], array([tension]), array([compression]))
+    lines = LineBuffer(points[segments].reshape((-1, 3)), repeat(colors, 2, axis=0))
+
+    return lines, MeshBuffer.merged(pipes)
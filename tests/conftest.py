@@ -0,0 +1,113 @@
+import pytest
+
+from compas_bender.datastructures import BendNetwork
+
+# a strict configuration for the small networks of the tests,
+# which are stiff enough to not need the scaling of the shear forces
+CONFIG = {"kmax": 5000, "kdiv": 50, "tol1": 1e-7, "tol2": 1e-7, "tol3": 1e-12, "alpha": 1}
+
+
+@pytest.fixture
+def config():
+    """A copy of the solver configuration of the small test networks."""
+    return dict(CONFIG)
+
+
+@pytest.fixture
+def tied_cantilever():
+    """A factory of short splines clamped at one end, loaded at the other end and held up by a tie.
+
+    The factory returns the network, the tie and the tip of the spline.
+    """
+
+    def factory(radius=30.0, thickness=5.0, lpre=0.99, pz=-3.0):
+        points = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [2.0, 0.0, 0.0]]
+        top = [2.0, 0.0, 1.0]
+        lines = [(points[0], points[1]), (points[1], points[2]), (points[2], top)]
+        network = BendNetwork.from_lines_with_features(
+            lines,
+            anchors=[points[0], points[1], top],
+            splines=[points],
+            ties=[(points[2], top)],
+        )
+        spline = network.splines[0]
+        spline.E = 1.0
+        spline.radius = radius
+        spline.thickness = thickness
+        tie = next(network.edges_where(is_tie=True))
+        network.edge_attribute(tie, "lpre", lpre)
+        tip = spline.nodes[-1]
+        network.node_attribute(tip, "pz", pz)
+        return network, tie, tip
+
+    return factory
+
+
+@pytest.fixture
+def cantilever():
+    """A factory of short splines clamped at one end, with a load at the other end.
+
+    The keyword arguments of the factory are set on the spline.
+    The factory returns the network and the tip of the spline.
+    """
+
+    def factory(load, length=0.1, **section):
+        points = [[0.0, 0.0, 0.0], [length, 0.0, 0.0], [2 * length, 0.0, 0.0]]
+        lines = list(zip(points[:-1], points[1:]))
+        network = BendNetwork.from_lines_with_features(lines, anchors=points[:2], splines=[points])
+        spline = network.splines[0]
+        spline.E = 1.0
+        for name, value in section.items():
+            setattr(spline, name, value)
+        tip = spline.nodes[-1]
+        for name, value in zip(("px", "py", "pz"), load):
+            network.node_attribute(tip, name, value)
+        return network, tip
+
+    return factory
+
+
+@pytest.fixture
+def string():
+    """A factory of straight strings of edges of unit length between two anchors, with a force density.
+
+    The string is plucked at the middle to a height of ``pluck``.
+    """
+
+    def factory(q=100.0, n=5, pluck=0.0):
+        points = [[float(i), 0.0, 0.0] for i in range(n + 1)]
+        lines = list(zip(points[:-1], points[1:]))
+        network = BendNetwork.from_lines_with_features(lines, anchors=[points[0], points[-1]])
+        for edge in network.edges():
+            network.edge_attribute(edge, "qpre", q)
+        for node in network.nodes():
+            x = network.node_attribute(node, "x")
+            network.node_attribute(node, "z", pluck * min(x, n - x) / (0.5 * n))
+        return network
+
+    return factory
+
+
+@pytest.fixture
+def crossing():
+    """A factory of two arches that cross at their tops, with a load at the crossing and one on the side.
+
+    The crossing is an interior node of both splines.
+    The factory returns the network and the crossing.
+    """
+
+    def factory(radius=(30.0, 20.0), thickness=5.0):
+        a = [[-2.0, 0.0, 0.0], [-1.0, 0.0, 0.6], [0.0, 0.0, 0.8], [1.0, 0.0, 0.6], [2.0, 0.0, 0.0]]
+        b = [[0.0, -2.0, 0.0], [0.0, -1.0, 0.6], [0.0, 0.0, 0.8], [0.0, 1.0, 0.6], [0.0, 2.0, 0.0]]
+        lines = list(zip(a[:-1], a[1:])) + list(zip(b[:-1], b[1:]))
+        network = BendNetwork.from_lines_with_features(lines, anchors=[a[0], a[-1], b[0], b[-1]], splines=[a, b])
+        for spline, value in zip(network.splines, radius):
+            spline.E = 1.0
+            spline.radius = value
+            spline.thickness = thickness
+        top = network.splines[0].nodes[2]
+        network.node_attribute(top, "pz", -3.0)
+        network.node_attribute(network.splines[0].nodes[3], "px", 1.0)
+        return network, top
+
+    return factory
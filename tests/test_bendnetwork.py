@@ -0,0 +1,206 @@
+import pytest
+
+from compas_bender.datastructures import BendNetwork
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_delete_node(columnar):
+    network = BendNetwork(columnar=columnar)
+    for key in range(4):
+        network.add_node(key, x=float(key))
+    # the deleted node has an outgoing and an incoming edge
+    network.add_edge(0, 1, qpre=2.0)
+    network.add_edge(1, 2, qpre=3.0)
+    network.add_edge(2, 3, qpre=4.0)
+    network.delete_node(1)
+    assert list(network.nodes()) == [0, 2, 3]
+    assert list(network.edges()) == [(2, 3)]
+    assert list(network.neighbors(0)) == []
+    assert list(network.neighbors(2)) == [3]
+    assert network.edge_attribute((2, 3), "qpre") == 4.0
+    if columnar:
+        assert len(network._node_columns) == 3
+        assert len(network._edge_columns) == 1
+    # deleting a node that does not exist does nothing
+    network.delete_node(1)
+    assert network.number_of_nodes() == 3
+
+
+def test_from_lines_merges_end_points():
+    lines = [
+        ([0.0, 0.0, 0.0], [1.0, 0.0, 0.0]),
+        ([1.0, 0.0, 0.0], [0.0, 0.0, 0.0]),
+        ([1.0, 0.0, 0.0], [1.0, 0.0, 0.0]),
+        ([1.0, 0.0, 0.0], [2.0, 0.0, 0.0]),
+        ([2.0, 0.05, 0.0], [2.0, 1.0, 0.0]),
+    ]
+    network = BendNetwork.from_lines_with_features(lines, tol=0.1)
+    # the nodes are numbered in order of first appearance, at the first of their end points
+    assert [network.node_point(node) for node in network.nodes()] == [
+        [0.0, 0.0, 0.0],
+        [1.0, 0.0, 0.0],
+        [2.0, 0.0, 0.0],
+        [2.0, 1.0, 0.0],
+    ]
+    # duplicate and collapsed lines are dropped
+    assert list(network.edges()) == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_from_lines_does_not_chain_end_points():
+    # every end point is within the tolerance of the next one, but not of the one after that
+    lines = [
+        ([0.0, 0.0, 0.0], [0.0, 1.0, 0.0]),
+        ([0.06, 0.0, 0.0], [1.0, 1.0, 0.0]),
+        ([0.12, 0.0, 0.0], [2.0, 1.0, 0.0]),
+        ([0.18, 0.0, 0.0], [3.0, 1.0, 0.0]),
+    ]
+    network = BendNetwork.from_lines_with_features(lines, tol=0.1)
+    assert network.number_of_nodes() == 6
+    assert network.node_point(0) == [0.0, 0.0, 0.0]
+    assert network.node_point(3) == [0.12, 0.0, 0.0]
+    assert list(network.neighbors(0)) == [1, 2]
+    assert list(network.neighbors(3)) == [4, 5]
+
+
+def test_from_lines_with_features():
+    points = [[float(i), 0.0, 0.0] for i in range(5)]
+    lines = list(zip(points[:-1], points[1:])) + [(points[2], [2.0, 0.0, 1.0]), ([2.0, 0.0, 1.0], [3.0, 0.0, 1.0])]
+    network = BendNetwork.from_lines_with_features(
+        lines,
+        # the anchors and the vertices of the polylines are snapped to the nodes within the tolerance
+        anchors=[[0.0, 0.0, 1e-6], points[-1], [9.0, 9.0, 9.0]],
+        splines=[list(reversed(points))],
+        cables=[[[2.0, 0.0, 1.0], [3.0, 0.0, 1.0]]],
+        ties=[(points[2], [2.0, 0.0, 1.0]), (points[0], points[4])],
+        tol=1e-3,
+    )
+    assert list(network.nodes_where(is_anchor=True)) == [0, 4]
+
+    spline = network.splines[0]
+    assert spline.start == 4
+    assert spline.nodes == [4, 3, 2, 1, 0]
+    # the edges are the edges of the network, in their original orientation
+    assert spline.edges == [(3, 4), (2, 3), (1, 2), (0, 1)]
+
+    assert network.cables[0].edges == [(5, 6)]
+    # ties without a matching edge are ignored
+    assert list(network.edges_where(is_tie=True)) == [(2, 5)]
+
+
+def test_from_lines_with_broken_spline():
+    points = [[float(i), 0.0, 0.0] for i in range(4)]
+    lines = [(points[0], points[1]), (points[2], points[3])]
+    with pytest.raises(ValueError):
+        BendNetwork.from_lines_with_features(lines, splines=[points])
+
+
+def test_bulk_accessors():
+    network = BendNetwork()
+    for key in range(3):
+        network.add_node(key, x=float(key), y=1.0)
+    network.add_edge(0, 1, qpre=2.0)
+    network.add_edge(2, 1, f=-3.0)
+    network.node_attribute(1, "pz", -1.0)
+
+    assert network.nodes_xyz_array().tolist() == [[0.0, 1.0, 0.0], [1.0, 1.0, 0.0], [2.0, 1.0, 0.0]]
+    assert network.loads_array().tolist() == [[0.0, 0.0, 0.0], [0.0, 0.0, -1.0], [0.0, 0.0, 0.0]]
+    # the rows are in the order of the index maps, and missing attributes get their defaults
+    assert network.edges_array().tolist() == [[0, 1], [2, 1]]
+    assert network.edges_attributes_array(["qpre", "f"]).tolist() == [[2.0, 0.0], [1.0, -3.0]]
+    assert network.edge_lines_array().shape == (2, 2, 3)
+    assert network.edge_lines_array()[1].tolist() == [[2.0, 1.0, 0.0], [1.0, 1.0, 0.0]]
+
+    network.residuals_array([[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 3.0]])
+    network.node_attribute(2, "is_anchor", True)
+    assert network.node_residual(1) == [0.0, 2.0, 0.0]
+    # only anchors have a reaction
+    assert network.reactions_array().tolist() == [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, -3.0]]
+
+    network.edge_forces_array([5.0, 6.0])
+    assert network.edge_attribute((2, 1), "f") == 6.0
+    assert network.edge_forces_array().tolist() == [5.0, 6.0]
+    with pytest.raises(ValueError):
+        network.nodes_xyz_array([[0.0, 0.0, 0.0]])
+
+
+def test_columnar_storage():
+    network = BendNetwork(columnar=True)
+    for key in range(3):
+        network.add_node(key, x=float(key), name="n{}".format(key))
+    network.add_edge(0, 1, qpre=2.0)
+    network.add_edge(1, 2)
+    # the attribute API works on the rows of the columns, and other attributes are kept in a dict
+    assert network.node_attribute(1, "x") == 1.0
+    assert network.node_attribute(1, "name") == "n1"
+    assert network.node_attribute(1, "is_anchor") is False
+    assert network.edge_attribute((0, 1), "qpre") == 2.0
+    network.node_attribute(2, "pz", -1.0)
+    assert network._node_columns.columns["pz"][network.node[2].index] == -1.0
+
+    # the bulk accessors read from and write to the columns
+    network.edges_attributes_array(["f"], [[3.0], [4.0]])
+    assert network.edge_attribute((1, 2), "f") == 4.0
+    assert network.loads_array()[:, 2].tolist() == [0.0, 0.0, -1.0]
+    with pytest.raises(ValueError):
+        network.loads_array([[0.0, 0.0, 0.0]])
+
+    # the rows of deleted nodes are reused with the default values, and the columns grow when full
+    row = network.node[2].index
+    network.delete_node(2)
+    network.add_node(3)
+    assert network.node[3].index == row
+    assert network.node_attribute(3, "pz") == 0.0
+    for key in range(4, 20):
+        network.add_node(key, x=float(key))
+    assert network._node_columns.capacity >= 19
+    assert network.nodes_xyz_array()[:, 0].tolist() == [0.0, 1.0, 0.0] + [float(key) for key in range(4, 20)]
+
+    # the attributes are the same in both storage modes
+    data = network.__data__
+    network.set_columnar(False)
+    assert not network.is_columnar
+    assert type(network.node[0]) is dict
+    assert network.__data__ == data
+    assert network.node_attribute(0, "name") == "n0"
+    assert network.edge_attribute((0, 1), "f") == 3.0
+    assert BendNetwork.__from_data__(data).edge_attribute((0, 1), "qpre") == 2.0
+
+
+def test_index_maps():
+    network = BendNetwork()
+    for key in range(3):
+        network.add_node(key)
+    network.add_edge(0, 1)
+    network.add_edge(2, 1)
+    node_index = network.node_index()
+    edge_index = network.edge_index()
+    edges = network.edges_array()
+    topology = network.topology
+    # the maps are cached while the topology does not change
+    network.add_node(1, x=1.0)
+    network.add_edge(0, 1, qpre=2.0)
+    network.node_attribute(0, "x", 1.0)
+    assert network.topology == topology
+    assert network.node_index() is node_index
+    assert network.edge_index() is edge_index
+    assert network.edges_array() is edges
+    assert network.index_edge() == {0: (0, 1), 1: (2, 1)}
+
+    # edges can be looked up in both orientations
+    undirected = network.edge_index(undirected=True)
+    assert undirected[(1, 2)] == undirected[(2, 1)] == 1
+    assert network.edge_oriented((1, 2)) == (2, 1)
+    with pytest.raises(KeyError):
+        network.edge_oriented((0, 2))
+
+    network.delete_edge((0, 1))
+    assert network.topology > topology
+    assert network.edge_index() == {(2, 1): 0}
+    assert network.edges_array().tolist() == [[2, 1]]
+    network.delete_node(0)
+    assert network.node_index() == {1: 0, 2: 1}
+    assert network.index_node() == {0: 1, 1: 2}
+    assert network.edges_array().tolist() == [[1, 0]]
+    network.add_edge(1, 2)
+    assert network.edge_oriented((2, 1)) == (2, 1)
+    assert network.edge_oriented((1, 2)) == (1, 2)
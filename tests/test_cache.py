@@ -0,0 +1,54 @@
+import os
+
+import numpy
+
+from compas_bender.bend import BendSolver
+from compas_bender.bend import SolveCache
+from compas_bender.bend import bend_splines
+
+
+def test_lru_eviction(tmp_path):
+    cache = SolveCache(str(tmp_path / "cache"))
+    nodes = numpy.zeros((100, 12))
+    edges = numpy.zeros((100, 4))
+    for key in "abc":
+        cache.put(key, nodes, edges, {"status": "converged"})
+    assert len(cache) == 3
+    # the entries are used in a different order than they were added
+    for key, mtime in zip("bca", (1, 2, 3)):
+        os.utime(cache._filepath(key), (mtime, mtime))
+    assert cache.get("b")[2] == {"status": "converged"}
+    assert cache.get("d") is None
+
+    cache.max_size = cache.size
+    cache.put("d", nodes, edges, {})
+    # the least recently used entry is evicted
+    assert "c" not in cache
+    assert all(key in cache for key in "abd")
+    assert cache.size <= cache.max_size
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_bend_splines(crossing, config, tmp_path, monkeypatch):
+    cache = SolveCache(str(tmp_path))
+    network, top = crossing()
+    first = bend_splines(network, config=config, cache=cache)
+    assert first["converged"]
+    assert len(cache) == 1
+
+    # the results are written to an unsolved copy without solving
+    other, _ = crossing()
+    monkeypatch.setattr(BendSolver, "solve", None)
+    assert bend_splines(other, config=config, cache=cache) == first
+    assert numpy.array_equal(other.nodes_xyz_array(), network.nodes_xyz_array())
+    assert numpy.array_equal(other.edge_forces_array(), network.edge_forces_array())
+    monkeypatch.undo()
+
+    # results that depend on more than the inputs are not stored
+    other.node_attribute(top, "pz", -4.0)
+    assert bend_splines(other, config=dict(config, tmax=0.0), cache=cache)["status"] == "tmax"
+    assert len(cache) == 1
+    assert bend_splines(other, config=config, cache=cache)["converged"]
+    assert len(cache) == 2
@@ -0,0 +1,84 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import compas
+from compas_bender.cli import main
+from compas_bender.files import npz_dump
+from compas_bender.files import npz_load
+
+
+@pytest.fixture
+def models(crossing, config, tmp_path):
+    folder = tmp_path / "models"
+    folder.mkdir()
+    network, _ = crossing()
+    compas.json_dump({"network": network, "config": config}, str(folder / "a.json"))
+    npz_dump({"network": crossing()[0], "config": config}, str(folder / "b.npz"))
+    compas.json_dump({"network": None}, str(folder / "c.json"))
+    (folder / "notes.txt").write_text("not a model")
+    return str(folder)
+
+
+def test_solve_folder(models, tmp_path):
+    out = str(tmp_path / "out")
+    summary = str(tmp_path / "summary.csv")
+    # the model without a network fails, but does not stop the others
+    assert main(["solve", models, "--out", out, "--summary", summary, "-q"]) == 1
+    with open(summary) as f:
+        rows = list(csv.DictReader(f))
+    assert [os.path.basename(row["model"]) for row in rows] == ["a.json", "b.npz", "c.json"]
+    assert [row["status"] for row in rows] == ["converged", "converged", "error"]
+    assert rows[2]["error"].startswith("ValueError")
+    assert sorted(os.listdir(out)) == ["a.npz", "b.npz"]
+
+    data = npz_load(os.path.join(out, "a.npz"))
+    assert data["iterations"]["converged"]
+    assert data["config"]["kdiv"] == 50
+    assert int(rows[0]["iterations"]) == int(list(data["iterations"]["membrane"])[-1]) + 1
+
+
+def test_solve_options(models, tmp_path):
+    config = str(tmp_path / "config.json")
+    with open(config, "w") as f:
+        json.dump({"kmax": 10**6, "kdiv": 10}, f)
+    summary = str(tmp_path / "summary.json")
+    out = str(tmp_path / "b.json")
+    model = os.path.join(models, "b.npz")
+    # the options override the configuration file, which overrides the configuration of the model
+    argv = ["solve", model, "--config", config, "--set", "kmax=20", "--out", out, "--summary", summary, "-q"]
+    assert main(argv) == 0
+    assert main(argv + ["--strict"]) == 1
+    with open(summary) as f:
+        (row,) = json.load(f)
+    assert row["status"] == "kmax"
+    assert row["iterations"] == 20
+    data = compas.json_load(out)
+    assert data["config"]["kmax"] == 20
+    assert data["config"]["kdiv"] == 10
+    assert data["config"]["tol1"] == 1e-7
+
+    # the models of a folder are split over the shards
+    summary = str(tmp_path / "shard.json")
+    assert main(["solve", models, "--shard", "1/2", "--summary", summary, "-q"]) == 0
+    with open(summary) as f:
+        assert [os.path.basename(row["model"]) for row in json.load(f)] == ["b.npz"]
+    with pytest.raises(SystemExit):
+        main(["solve", models, "--shard", "2/2"])
+    # an output file can only be used for a single model
+    assert main(["solve", models, "--out", out, "-q"]) == 1
+
+
+def test_module(models, tmp_path):
+    summary = str(tmp_path / "summary.json")
+    model = os.path.join(models, "a.json")
+    args = [sys.executable, "-m", "compas_bender", "solve", model, model, "--jobs", "2", "--summary", summary]
+    result = subprocess.run(args, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.count("converged") == 2
+    with open(summary) as f:
+        assert [row["converged"] for row in json.load(f)] == [True, True]
@@ -0,0 +1,112 @@
+import numpy
+
+from compas_bender.bend import SplineContact
+from compas_bender.bend.contact import _closest_points
+
+SKIN = 0.02
+
+
+def closest(p0, p1, q0, q1):
+    s, t = _closest_points(*(numpy.array([point], dtype=float) for point in (p0, p1, q0, q1)))
+    return s[0], t[0]
+
+
+def distance(p0, p1, q0, q1):
+    p0, p1, q0, q1 = (numpy.array(point, dtype=float) for point in (p0, p1, q0, q1))
+    s, t = closest(p0, p1, q0, q1)
+    return numpy.linalg.norm(p0 + s * (p1 - p0) - q0 - t * (q1 - q0))
+
+
+def chains(seed):
+    """Random walks of segments of a length of about 0.1 in a unit box."""
+    rng = numpy.random.default_rng(seed)
+    xyz = []
+    segments = []
+    for _ in range(20):
+        start = len(xyz)
+        point = rng.uniform(0.2, 0.8, 3)
+        for _ in range(11):
+            xyz.append(point)
+            point = point + rng.normal(0, 0.06, 3)
+        segments += [(i, i + 1) for i in range(start, start + 10)]
+    return rng, numpy.array(xyz), segments
+
+
+def normalized(pairs):
+    return sorted(map(tuple, numpy.sort(pairs, axis=1)))
+
+
+def test_closest_points_crossing():
+    assert numpy.allclose(closest([0, 0, 0], [2, 0, 0], [1, -1, 1], [1, 1, 1]), [0.5, 0.5])
+    assert numpy.isclose(distance([0, 0, 0], [2, 0, 0], [1, -1, 1], [1, 1, 1]), 1.0)
+
+
+def test_closest_points_parallel():
+    # overlapping
+    assert numpy.isclose(distance([0, 0, 0], [2, 0, 0], [1, 1, 0], [3, 1, 0]), 1.0)
+    # overlapping in the opposite direction
+    assert numpy.isclose(distance([0, 0, 0], [2, 0, 0], [3, 1, 0], [1, 1, 0]), 1.0)
+    # collinear, with a gap between the end of the first and the start of the second
+    assert numpy.allclose(closest([0, 0, 0], [1, 0, 0], [2, 0, 0], [3, 0, 0]), [1.0, 0.0])
+    assert numpy.isclose(distance([0, 0, 0], [1, 0, 0], [3, 0, 0], [2, 0, 0]), 1.0)
+
+
+def test_closest_points_degenerate():
+    with numpy.errstate(all="raise"):
+        # the second segment is a point
+        assert numpy.allclose(closest([0, 0, 0], [2, 0, 0], [1, 1, 0], [1, 1, 0]), [0.5, 0.0])
+        assert numpy.allclose(closest([0, 0, 0], [2, 0, 0], [3, 1, 0], [3, 1, 0]), [1.0, 0.0])
+        # the first segment is a point
+        assert numpy.allclose(closest([1, 1, 0], [1, 1, 0], [0, 0, 0], [2, 0, 0]), [0.0, 0.5])
+        assert numpy.allclose(closest([-1, 1, 0], [-1, 1, 0], [0, 0, 0], [2, 0, 0]), [0.0, 0.0])
+        # both segments are points
+        assert numpy.allclose(closest([1, 1, 0], [1, 1, 0], [0, 0, 0], [0, 0, 0]), [0.0, 0.0])
+        assert numpy.isclose(distance([1, 1, 0], [1, 1, 0], [0, 0, 0], [0, 0, 0]), 2**0.5)
+
+
+def test_incremental_update_matches_rebuild():
+    rng, xyz, segments = chains(0)
+    contact = SplineContact(segments, 0.01 * numpy.ones(len(segments)), 1e6, SKIN, len(xyz))
+    contact.update(xyz)
+    incremental = 0
+    for _ in range(10):
+        origin = contact._origin
+        # the moved nodes move further than half the skin, such that all segments are either hashed again
+        # or at the position at which they were hashed
+        moved = rng.random(len(xyz)) < 0.1
+        direction = rng.normal(0, 1, (moved.sum(), 3))
+        direction /= numpy.linalg.norm(direction, axis=1)[:, None]
+        xyz[moved] += rng.uniform(0.6, 2.0, (moved.sum(), 1)) * SKIN * direction
+        assert contact.update(xyz)
+        fresh = SplineContact(segments, 0.01 * numpy.ones(len(segments)), 1e6, SKIN, len(xyz))
+        fresh.update(xyz)
+        assert normalized(contact.pairs) == normalized(fresh.pairs)
+        assert len(contact.pairs) == len(set(normalized(contact.pairs)))
+        # the grid is kept if the moved segments still fit in it
+        incremental += contact._origin is origin
+    assert incremental
+    contact.reset()
+    contact.update(xyz)
+    assert normalized(contact.pairs) == normalized(fresh.pairs)
+
+
+def test_incremental_update_keeps_contacts():
+    rng, xyz, segments = chains(1)
+    radii = 0.01 * numpy.ones(len(segments))
+    contact = SplineContact(segments, radii, 1e6, SKIN, len(xyz))
+    contact.update(xyz)
+    for _ in range(20):
+        xyz += rng.normal(0, 0.2 * SKIN, xyz.shape)
+        contact.update(xyz)
+        fresh = SplineContact(segments, radii, 1e6, SKIN, len(xyz))
+        fresh.update(xyz)
+        # the candidate pairs may differ within the skin, but not for pairs that are in contact
+        pairs = numpy.array(normalized(fresh.pairs))
+        i = numpy.array(segments)[pairs[:, 0]]
+        j = numpy.array(segments)[pairs[:, 1]]
+        s, t = _closest_points(xyz[i[:, 0]], xyz[i[:, 1]], xyz[j[:, 0]], xyz[j[:, 1]])
+        d = xyz[i[:, 0]] + s[:, None] * (xyz[i[:, 1]] - xyz[i[:, 0]])
+        d -= xyz[j[:, 0]] + t[:, None] * (xyz[j[:, 1]] - xyz[j[:, 0]])
+        touching = numpy.linalg.norm(d, axis=1) < 2 * 0.01
+        assert touching.any()
+        assert set(map(tuple, pairs[touching])) <= set(normalized(contact.pairs))
@@ -0,0 +1,47 @@
+import numpy
+
+from compas_bender.bend import Continuation
+
+
+def test_trace(tied_cantilever, config):
+    network, tie, tip = tied_cantilever()
+    continuation = Continuation(network, [("lpre", tie)], end=[0.95], config=config)
+    path = continuation.trace(step=0.5, max_step=0.5)
+    assert path.status == "completed"
+    assert len(path) == 3
+    assert numpy.allclose(path.t, [0.0, 0.5, 1.0])
+    assert numpy.allclose(path.values[:, 0], [0.99, 0.97, 0.95])
+    # shortening the tie lifts the tip
+    z = path.xyz[:, continuation.solver.node_index[tip], 2]
+    assert (numpy.diff(z) > 0).all()
+    assert numpy.allclose(network.nodes_xyz_array(), path.xyz[-1])
+    assert network.edge_attribute(tie, "lpre") == 0.95
+
+
+def test_rejected_steps_restore_state(tied_cantilever, config):
+    network, tie, tip = tied_cantilever()
+    continuation = Continuation(network, [("lpre", tie)], end=[0.95], config=config)
+    # no step can follow the first-order prediction this closely
+    path = continuation.trace(step=0.5, min_step=0.1, tol=1e-9, atol=1e-12)
+    assert path.status == "min_step"
+    assert len(path) == 1
+    assert continuation.rejected > 0
+    assert network.edge_attribute(tie, "lpre") == 0.99
+    assert numpy.allclose(network.nodes_xyz_array(), path.xyz[0])
+    assert numpy.allclose(network.edge_forces_array(), path.f[0])
+    # the solver continues from the last accepted state
+    solver = continuation.solver
+    assert solver.iterations["converged"]
+    xyz = solver.xyz.copy()
+    assert solver.solve()["converged"]
+    assert numpy.allclose(solver.xyz, xyz, atol=1e-6)
+
+
+def test_crossing_splines_prediction(crossing, config):
+    network, top = crossing()
+    continuation = Continuation(network, [("radius", 0)], end=[31.0], config=config)
+    # the first-order prediction of a single step is accurate to 10%
+    path = continuation.trace(step=1.0, max_step=1.0, tol=0.1)
+    assert path.status == "completed"
+    assert len(path) == 2
+    assert continuation.rejected == 0
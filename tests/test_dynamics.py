@@ -0,0 +1,28 @@
+import numpy
+
+from compas_bender.bend import TransientSolver
+
+
+def test_critical_timestep_is_stable(string):
+    network = string(pluck=0.1)
+    transient = TransientSolver(network, linear_density=1.0)
+    dt = transient.critical_timestep()
+    result = transient.run(2000, dt=0.9 * dt, every=2)
+    assert result["status"] == "completed"
+    assert result["steps"] == 2000
+    assert numpy.isfinite(network.nodes_xyz_array()).all()
+    # without damping, the energy of the vibration does not grow
+    energy = result["energy"]
+    assert max(energy[-250:]) < 1.05 * max(energy[:250])
+
+
+def test_damping_reduces_energy(string):
+    network = string(pluck=0.1)
+    transient = TransientSolver(network, linear_density=1.0, damping=0.5)
+    result = transient.run(400, every=2)
+    assert result["status"] == "completed"
+    # the peaks of the kinetic energy decrease over every period of the vibration
+    energy = result["energy"]
+    peaks = [max(energy[i : i + 10]) for i in range(0, len(energy), 10)]
+    assert all(b < a for a, b in zip(peaks, peaks[1:]))
+    assert peaks[-1] < 1e-3 * peaks[0]
@@ -0,0 +1,79 @@
+import math
+
+import pytest
+
+from compas_bender.datastructures import BendNetwork
+from compas_bender.datastructures import Cable
+from compas_bender.datastructures import Spline
+
+
+@pytest.fixture
+def chain():
+    network = BendNetwork()
+    for key in range(5):
+        network.add_node(key, x=float(key))
+    network.add_edge(0, 1)
+    network.add_edge(2, 1)
+    network.add_edge(2, 3)
+    network.add_edge(3, 4)
+    return network
+
+
+def test_spline(chain):
+    spline = chain.add_spline([(3, 4), (2, 3), (2, 1)], E=1.0, radius=2.0, thickness=1.0)
+    assert isinstance(spline, Spline)
+    assert chain.splines == [spline]
+    # the start is the end of the first edge that is not shared with the second edge
+    assert spline.start == 4
+    assert spline.nodes == [4, 3, 2, 1]
+    assert spline.node_indices == [4, 3, 2, 1]
+    assert spline.edge_indices == [3, 2, 1]
+    assert spline.reversed == [True, True, False]
+
+    # the index lists follow changes of the topology
+    chain.delete_edge((0, 1))
+    chain.delete_node(0)
+    assert spline.nodes == [4, 3, 2, 1]
+    assert spline.node_indices == [3, 2, 1, 0]
+    assert spline.edge_indices == [2, 1, 0]
+
+    A, Iy, EA, EI = spline.section()
+    # the sections use the value of pi of the original solver
+    assert math.isclose(A, math.pi * (2.0**2 - 1.0**2), rel_tol=1e-5)
+    assert math.isclose(Iy, math.pi / 4 * (2.0**4 - 1.0**4), rel_tol=1e-5)
+    assert math.isclose(EI, Iy)
+    assert spline.section(unit_E=2.0)[3] == 2 * EI
+
+
+def test_spline_validation(chain):
+    with pytest.raises(ValueError):
+        chain.add_spline([])
+    with pytest.raises(ValueError):
+        chain.add_spline([(0, 1), (0, 4)])
+    with pytest.raises(ValueError):
+        chain.add_spline([(0, 1), (2, 3)])
+    with pytest.raises(ValueError):
+        chain.add_spline([(0, 1), (1, 2)], start=2)
+    assert chain.splines == []
+
+
+def test_cable(chain):
+    cable = chain.add_cable([(1, 2), (3, 4)], qpre=5.0)
+    assert isinstance(cable, Cable)
+    assert cable.edge_indices == [1, 3]
+    chain.delete_edge((0, 1))
+    assert cable.edge_indices == [0, 2]
+    with pytest.raises(ValueError):
+        chain.add_cable([(0, 2)])
+
+
+def test_elements_data(chain):
+    chain.add_spline([(0, 1), (1, 2)], E=3.0, radius=1.0, thickness=0.5, rod=True, normal=[0, 1, 0])
+    chain.add_cable([(2, 3), (3, 4)], qpre=2.0)
+    network = BendNetwork.__from_data__(chain.__data__)
+    spline = network.splines[0]
+    assert spline.network is network
+    assert spline.nodes == [0, 1, 2]
+    assert (spline.E, spline.radius, spline.thickness, spline.rod, spline.normal) == (3.0, 1.0, 0.5, True, [0, 1, 0])
+    assert network.cables[0].qpre == 2.0
+    assert network.cables[0].edges == [(2, 3), (3, 4)]
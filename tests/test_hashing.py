@@ -0,0 +1,26 @@
+from compas_bender.bend import hashing
+from compas_bender.bend import solve_hash
+from compas_bender.datastructures import BendNetwork
+
+
+def network():
+    points = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [2.0, 0.0, 0.0]]
+    lines = list(zip(points[:-1], points[1:]))
+    return BendNetwork.from_lines_with_features(lines, anchors=[points[0], points[-1]], splines=[points])
+
+
+def test_same_inputs_same_hash():
+    assert solve_hash(network()) == solve_hash(network())
+
+
+def test_section_changes_hash():
+    other = network()
+    edge = next(iter(other.edges()))
+    other.edge_attribute(edge, "width", 10.0)
+    assert solve_hash(network()) != solve_hash(other)
+
+
+def test_version_changes_hash(monkeypatch):
+    key = solve_hash(network())
+    monkeypatch.setattr(hashing, "HASH_VERSION", hashing.HASH_VERSION + 1)
+    assert solve_hash(network()) != key
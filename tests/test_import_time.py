@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+
+# the import time of the compas_bender packages on top of compas itself,
+# relative to the import time of the compas packages that they depend on,
+# because wall-clock times depend on the machine
+RELATIVE_BUDGET = 0.25
+# an absolute budget in seconds, instead of the relative one
+BUDGET = os.environ.get("COMPAS_BENDER_IMPORT_BUDGET")
+
+SCRIPT = """
+import json
+import sys
+import time
+
+import numpy
+
+start = time.perf_counter()
+
+import compas.datastructures
+import compas.geometry
+
+baseline = time.perf_counter() - start
+errors = numpy.geterr()
+start = time.perf_counter()
+
+import compas_bender
+import compas_bender.bend
+import compas_bender.datastructures
+import compas_bender.files
+
+elapsed = time.perf_counter() - start
+modules = [name for name in ("compas.matrices", "asyncio", "concurrent.futures.process") if name in sys.modules]
+print(json.dumps({"elapsed": elapsed, "baseline": baseline, "modules": modules, "errstate": numpy.geterr() == errors}))
+"""
+
+SOLVE = """
+import json
+
+import numpy
+
+from compas_bender.bend import bend_splines
+from compas_bender.datastructures import BendNetwork
+
+errors = numpy.geterr()
+points = [[i, 0, 0] for i in range(6)]
+lines = list(zip(points[:-1], points[1:]))
+network = BendNetwork.from_lines_with_features(lines, anchors=[points[0], points[-1]], splines=[points])
+network.node_attribute(3, "pz", -1.0)
+iterations = bend_splines(network, config={"kmax": 200, "kdiv": 20})
+print(json.dumps({"status": iterations["status"], "errstate": numpy.geterr() == errors}))
+"""
+
+
+def run(script):
+    output = subprocess.check_output([sys.executable, "-c", script])
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def test_import_time():
+    results = [run(SCRIPT) for _ in range(3)]
+    elapsed = min(result["elapsed"] for result in results)
+    if BUDGET:
+        budget = float(BUDGET)
+    else:
+        budget = RELATIVE_BUDGET * min(result["baseline"] for result in results)
+    assert elapsed < budget, "Importing compas_bender took {:.3f}s (budget {:.3f}s)".format(elapsed, budget)
+
+
+def test_import_is_lazy():
+    result = run(SCRIPT)
+    assert result["modules"] == []
+    assert result["errstate"]
+
+
+def test_solve_restores_errstate():
+    result = run(SOLVE)
+    assert result["status"]
+    assert result["errstate"]
@@ -0,0 +1,60 @@
+import numpy
+
+from compas_bender.bend import InverseSolver
+
+
+def test_target_height(tied_cantilever, config):
+    network, tie, tip = tied_cantilever()
+    # the stiff cantilever does not need the scaling of the shear forces
+    inverse = InverseSolver(network, [("lpre", tie)], targets={tip: [None, None, 0.1]}, config=config, alpha=1)
+    result = inverse.solve(tol=1e-4)
+    assert result["converged"]
+    assert abs(network.node_attribute(tip, "z") - 0.1) < 1e-4
+    assert network.edge_attribute(tie, "lpre") == result["values"][0]
+    assert result["values"][0] < 0.99
+
+
+def test_failed_inner_solve(tied_cantilever, config):
+    network, tie, tip = tied_cantilever()
+    xyz = network.nodes_xyz_array()
+    config["kmax"] = 50
+    inverse = InverseSolver(network, [("lpre", tie)], targets={tip: [None, None, 0.1]}, config=config, alpha=1)
+    result = inverse.solve(tol=1e-4)
+    assert not result["converged"]
+    assert result["status"] == "kmax"
+    assert result["values"] == [0.99]
+    # the network is returned to its initial state, without another solve
+    assert result["solves"] == 1
+    assert network.edge_attribute(tie, "lpre") == 0.99
+    assert numpy.allclose(network.nodes_xyz_array(), xyz)
+
+
+def test_maxsolves(tied_cantilever, config):
+    network, tie, tip = tied_cantilever()
+    inverse = InverseSolver(network, [("lpre", tie)], targets={tip: [None, None, 0.1]}, config=config, alpha=1)
+    result = inverse.solve(tol=1e-12, maxsolves=3)
+    assert result["status"] == "maxsolves"
+    assert result["solves"] == 3
+    # the network is in the equilibrium of the final values
+    solver = inverse.solver
+    assert network.edge_attribute(tie, "lpre") == result["values"][0]
+    assert numpy.allclose(network.nodes_xyz_array(), solver.xyz)
+    assert numpy.isclose(result["objective"], 0.5 * (network.node_attribute(tip, "z") - 0.1) ** 2)
+    assert result["objective"] == min(result["history"])
+    xyz = solver.xyz.copy()
+    assert solver.solve()["converged"]
+    assert numpy.allclose(solver.xyz, xyz, atol=1e-6)
+
+
+def test_crossing_splines(crossing, config):
+    network, top = crossing()
+    # the stiffer the first arch, the less the crossing moves with the load on its side
+    inverse = InverseSolver(
+        network, [("radius", 0)], targets={top: [1e-4, None, None]}, bounds=[(10.0, 60.0)], config=config, alpha=1
+    )
+    result = inverse.solve(tol=1e-7)
+    assert result["converged"]
+    assert result["values"][0] > 30.0
+    # with exact derivatives the optimiser needs only a few steps
+    assert result["solves"] <= 5
+    assert abs(network.node_attribute(top, "x") - 1e-4) < 1e-7
@@ -0,0 +1,78 @@
+from math import pi
+from math import sin
+
+import numpy
+
+from compas_bender.bend import BendSolver
+from compas_bender.bend import ModalAnalysis
+
+N = 5
+
+
+def solved(network):
+    solver = BendSolver(network, config={"alpha": 1})
+    assert solver.solve()["converged"]
+    return solver
+
+
+def test_prestressed_string(string):
+    q = 100.0
+    solver = solved(string(q, N))
+    analysis = ModalAnalysis(solver, linear_density=1.0)
+    # the stiffness of an edge with a force density is the same in all directions,
+    # so every mode of the discrete string appears three times
+    expected = 4 * q * sin(pi / (2 * N)) ** 2
+
+    modes = analysis.stability(k=3)
+    assert modes.stable
+    assert numpy.allclose(modes.values, expected)
+
+    modes = analysis.frequencies(k=3)
+    assert modes.stable
+    assert numpy.allclose(modes.frequencies, expected**0.5 / (2 * pi))
+    # the displacements of the first mode are a half sine wave along the string
+    x = solver.xyz[:, 0]
+    assert numpy.allclose(
+        numpy.linalg.norm(modes.shapes[0], axis=1), numpy.sin(pi * x / N) / sin(pi * 2 / N), atol=1e-5
+    )
+
+
+def test_compressed_string(string):
+    analysis = ModalAnalysis(solved(string(-100.0, N)), linear_density=1.0)
+    modes = analysis.stability(k=3)
+    assert not modes.stable
+    assert modes.values[0] < 0
+
+
+def residuals(solver, xyz):
+    """Evaluate the residual forces of the solver at other coordinates, with the force densities of those."""
+    solver.xyz[:] = xyz
+    solver.l[:] = numpy.linalg.norm(solver.C.dot(xyz), axis=1)[:, None]
+    with numpy.errstate(all="ignore"):
+        q_fpre, q_lpre, q_EA = solver.fdensity()
+    solver.q[:] = solver.qpre + q_fpre + q_EA
+    # the second evaluation uses the moments of the first at the ends of the splines
+    solver._evaluate()
+    solver._evaluate()
+    return solver.r.copy()
+
+
+def test_crossing_splines_stiffness(crossing, config):
+    network, _ = crossing()
+    solver = BendSolver(network, config=config)
+    assert solver.solve()["converged"]
+    K = ModalAnalysis(solver).stiffness().toarray()
+
+    xyz = solver.xyz.copy()
+    free = solver.free
+    h = 1e-6
+    J = numpy.zeros((3 * len(free), 3 * len(free)))
+    for i, node in enumerate(free):
+        for axis in range(3):
+            plus = xyz.copy()
+            plus[node, axis] += h
+            minus = xyz.copy()
+            minus[node, axis] -= h
+            dr = residuals(solver, plus) - residuals(solver, minus)
+            J[:, 3 * i + axis] = -dr[free].ravel() / (2 * h)
+    assert numpy.allclose(K, 0.5 * (J + J.T), rtol=1e-4, atol=1e-6 * abs(K).max())
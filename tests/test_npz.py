@@ -0,0 +1,77 @@
+import numpy
+import pytest
+
+from compas.geometry import Point
+from compas_bender.bend import BendSolver
+from compas_bender.datastructures import BendNetwork
+from compas_bender.files import npz_dump
+from compas_bender.files import npz_load
+from compas_bender.files import npz_load_arrays
+
+
+@pytest.fixture
+def solved(crossing, config):
+    network, top = crossing()
+    assert BendSolver(network, config=config).solve()["converged"]
+    # attributes that are missing for some nodes, or are not stored as binary arrays
+    network.node_attribute(top, "label", "top")
+    network.node_attribute(top, "point", Point(1, 2, 3))
+    network.node_attribute(top, "count", 2**70)
+    network.edge_attribute(network.splines[0].edges[0], "group", 3)
+    return network
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("mmap", [False, True])
+def test_round_trip(solved, columnar, mmap, tmp_path):
+    path = str(tmp_path / "model.npz")
+    solved.set_columnar(columnar)
+    solved.to_npz(path)
+    network = BendNetwork.from_npz(path, mmap=mmap)
+    assert network.is_columnar == columnar
+    assert network.__data__ == solved.__data__
+    assert network.node_attribute(network.splines[0].nodes[2], "point") == Point(1, 2, 3)
+    assert [spline.nodes for spline in network.splines] == [spline.nodes for spline in solved.splines]
+    assert numpy.array_equal(network.edges_array(), solved.edges_array())
+
+    # the storage mode can be changed when loading
+    other = BendNetwork.from_npz(path, mmap=mmap, columnar=not columnar)
+    assert other.is_columnar != columnar
+    assert numpy.array_equal(other.nodes_xyz_array(), solved.nodes_xyz_array())
+    assert numpy.array_equal(other.edge_forces_array(), solved.edge_forces_array())
+    assert other.node_attribute(other.splines[0].nodes[2], "label") == "top"
+
+    # changes to a mapped network are not written back to the file
+    network.nodes_xyz_array(numpy.zeros((network.number_of_nodes(), 3)))
+    network.add_node(x=1.0)
+    assert BendNetwork.from_npz(path).__data__ == solved.__data__
+
+
+def test_load_arrays(solved, tmp_path):
+    path = str(tmp_path / "model.npz")
+    npz_dump({"a": solved, "b": BendNetwork(), "config": {"kmax": 10}}, path)
+    data = npz_load(path)
+    assert data["config"] == {"kmax": 10}
+    assert data["a"].__data__ == solved.__data__
+    assert data["b"].number_of_nodes() == 0
+
+    with pytest.raises(KeyError):
+        npz_load_arrays(path)
+    arrays = npz_load_arrays(path, key="a")
+    assert isinstance(arrays["node_attributes"]["x"], numpy.memmap)
+    assert numpy.array_equal(arrays["nodes"], list(solved.nodes()))
+    assert numpy.array_equal(arrays["edges"], solved.edges_array())
+    assert numpy.array_equal(arrays["edge_attributes"]["f"], solved.edge_forces_array())
+    # attributes that are missing for some elements are not included
+    assert "label" not in arrays["node_attributes"]
+    assert "group" not in arrays["edge_attributes"]
+
+    with pytest.raises(ValueError):
+        BendNetwork.from_npz(path)
+
+
+def test_not_an_archive(tmp_path):
+    path = str(tmp_path / "other.npz")
+    numpy.savez(path, x=numpy.zeros(3))
+    with pytest.raises(ValueError):
+        npz_load(path)
@@ -0,0 +1,74 @@
+import numpy
+import pytest
+
+from compas_bender.bend import BendSolver
+from compas_bender.files import ResultStore
+
+
+def test_append_and_reopen(string, config, tmp_path):
+    path = str(tmp_path / "store")
+    network = string()
+    store = ResultStore.create(path, network, capacity=2, history=3)
+    xyz = []
+    for run, q in enumerate([10.0, 20.0, 30.0]):
+        for edge in network.edges():
+            network.edge_attribute(edge, "qpre", q)
+        network.node_attribute(2, "pz", -1.0)
+        iterations = BendSolver(network, config=dict(config)).solve()
+        store.append("run{}".format(run), network, iterations)
+        xyz.append(network.nodes_xyz_array())
+    # the files grow beyond the initial capacity
+    assert store.capacity == 4
+    with pytest.raises(ValueError):
+        store.append("run0", network)
+    store.close()
+
+    with ResultStore.open(path) as store:
+        assert store.runs == ["run0", "run1", "run2"]
+        assert "run1" in store
+        assert numpy.allclose(store.field("xyz"), xyz)
+        assert numpy.allclose(store.get("run2", "q"), 30.0)
+        assert numpy.array_equal(store.edges(), network.edges_array())
+        history = store.iterations("run2")
+        assert 0 < len(history["membrane"]) <= 3
+        assert history["membrane"] == dict(list(iterations["membrane"].items())[: len(history["membrane"])])
+        with pytest.raises(ValueError):
+            store.append("run3", network)
+
+    with ResultStore.open(path, mode="r+") as store:
+        store.append("run3", network)
+        assert len(store) == 4
+
+
+def test_runs_survive_without_close(string, tmp_path):
+    path = str(tmp_path / "store")
+    network = string()
+    store = ResultStore.create(path, network)
+    for run in range(3):
+        store.append_arrays(run, f=numpy.full(network.number_of_edges(), float(run)))
+    # the store is not flushed or closed, as if the process was killed
+    reopened = ResultStore.open(path)
+    assert reopened.runs == [0, 1, 2]
+    assert numpy.allclose(reopened.field("f")[:, 0], [0.0, 1.0, 2.0])
+    del store
+
+
+def test_incomplete_run_is_dropped(string, tmp_path):
+    path = tmp_path / "store"
+    network = string()
+    with ResultStore.create(str(path), network) as store:
+        store.append_arrays("a")
+    with open(path / "runs.jsonl", "a") as f:
+        f.write('"b')
+    with ResultStore.open(str(path), mode="r+") as store:
+        assert store.runs == ["a"]
+        store.append_arrays("c")
+    assert ResultStore.open(str(path)).runs == ["a", "c"]
+
+
+def test_topology_mismatch(string, tmp_path):
+    store = ResultStore.create(str(tmp_path / "store"), string(n=5))
+    with pytest.raises(ValueError):
+        store.append(0, string(n=6))
+    with pytest.raises(ValueError):
+        ResultStore.create(str(tmp_path / "store"), string(n=5))
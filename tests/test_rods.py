@@ -0,0 +1,32 @@
+import numpy
+
+from compas_bender.bend import BendSolver
+
+
+def deflection(model, config):
+    network, tip = model
+    xyz = numpy.array(network.node_point(tip))
+    iterations = BendSolver(network, config=dict(config)).solve()
+    assert iterations["converged"]
+    return numpy.array(network.node_point(tip)) - xyz
+
+
+def test_isotropic_rod_matches_spline(cantilever, config):
+    spline = deflection(cantilever([0.0, 0.0, -50.0], radius=30.0, thickness=30.0), config)
+    rod = deflection(cantilever([0.0, 0.0, -50.0], radius=30.0, thickness=30.0, rod=True), config)
+    assert spline[2] < 0
+    assert numpy.allclose(rod, spline, atol=1e-9)
+
+
+def test_lath_bends_about_weak_axis(cantilever, config):
+    # the height of the section is aligned with the normal,
+    # so the lath is four times stiffer in the direction of its width than in the direction of the normal
+    section = {"width": 60.0, "height": 30.0, "normal": [0.0, 0.0, 1.0]}
+    spline = deflection(cantilever([0.0, 0.0, -10.0], **section), config)
+    weak = deflection(cantilever([0.0, 0.0, -10.0], rod=True, **section), config)
+    strong = deflection(cantilever([0.0, -10.0, 0.0], rod=True, **section), config)
+    # the spline model only knows the bending stiffness about the weak axis
+    assert numpy.isclose(weak[2], spline[2], rtol=1e-3)
+    assert numpy.isclose(strong[1] / weak[2], 0.25, rtol=1e-3)
+    assert numpy.isclose(weak[1], 0.0, atol=1e-12)
+    assert numpy.isclose(strong[2], 0.0, atol=1e-12)
@@ -0,0 +1,183 @@
+import numpy
+import pytest
+
+from compas_bender.bend import BendSolver
+from compas_bender.scene import LineBuffer
+from compas_bender.scene import MeshBuffer
+from compas_bender.scene import decimate_edges
+from compas_bender.scene import force_pipes
+from compas_bender.scene import force_radii
+from compas_bender.scene import level_of_detail
+from compas_bender.scene import moment_ribbons
+from compas_bender.scene import reaction_arrows
+from compas_bender.scene import screen_scale
+from compas_bender.scene import tubes
+
+
+@pytest.fixture
+def solved(crossing, config):
+    network, _ = crossing()
+    assert BendSolver(network, config=config).solve()["converged"]
+    return network
+
+
+def test_tubes():
+    start = [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+    end = [[1.0, 0.0, 0.0], [0.0, 0.0, 2.0]]
+    vertices, faces = tubes(start, end, [0.1, 0.2], sides=6, end_radius=0.0)
+    assert vertices.shape == (24, 3)
+    assert faces.shape == (24, 3)
+    # the rings of the start points lie on circles around the start points, perpendicular to the segments
+    ring = vertices[:6]
+    assert numpy.allclose(numpy.linalg.norm(ring, axis=1), 0.1)
+    assert numpy.allclose(ring[:, 0], 0.0)
+    ring = vertices[12:18]
+    assert numpy.allclose(numpy.linalg.norm(ring, axis=1), 0.2)
+    assert numpy.allclose(ring[:, 2], 0.0)
+    # the cones end in the end points
+    assert numpy.allclose(vertices[6:12], end[0])
+    assert numpy.allclose(vertices[18:], end[1])
+    # the triangles of every tube only use the vertices of that tube
+    assert faces[:12].max() < 12
+    assert faces[12:].min() >= 12
+
+
+def test_mesh_buffer_merged():
+    a = MeshBuffer([[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 1, 2]], [[1, 0, 0]] * 3)
+    b = MeshBuffer([[0, 0, 1], [1, 0, 1], [0, 1, 1]], [[0, 2, 1]])
+    buffer = MeshBuffer.merged([a, b])
+    assert buffer.number_of_vertices == 6
+    assert buffer.number_of_faces == 2
+    assert buffer.faces.tolist() == [[0, 1, 2], [3, 5, 4]]
+    assert buffer.colors.tolist() == [[1, 0, 0]] * 3 + [[1, 1, 1]] * 3
+    assert MeshBuffer.merged([]).number_of_faces == 0
+
+    corners, colors = buffer.to_triangles(alpha=0.5)
+    assert numpy.allclose(corners, buffer.vertices[[0, 1, 2, 3, 5, 4]])
+    assert numpy.allclose(colors[:, :3], buffer.colors[[0, 1, 2, 3, 5, 4]])
+    assert numpy.allclose(colors[:, 3], 0.5)
+
+    mesh = buffer.to_mesh()
+    assert mesh.number_of_vertices() == 6
+    assert mesh.number_of_faces() == 2
+    assert buffer.vertexcolor()[0].rgb == (1.0, 0.0, 0.0)
+
+
+def test_line_buffer():
+    with pytest.raises(ValueError):
+        LineBuffer([[0, 0, 0], [1, 0, 0], [2, 0, 0]])
+    a = LineBuffer([[0, 0, 0], [1, 0, 0]])
+    b = LineBuffer([[0, 0, 0], [0, 1, 0], [0, 1, 0], [0, 1, 1]], [[0, 0, 1]] * 4)
+    buffer = LineBuffer.merged([a, b])
+    assert buffer.number_of_segments == 3
+    assert [line.length for line in buffer.to_lines()] == [1.0, 1.0, 1.0]
+    points, colors = buffer.to_segments()
+    assert points.shape == (6, 3)
+    assert colors.tolist() == [[0, 0, 0, 1]] * 2 + [[0, 0, 1, 1]] * 4
+    assert LineBuffer.merged([]).number_of_segments == 0
+
+
+def test_force_pipes(solved):
+    forces = solved.edge_forces_array()
+    radii = force_radii(solved, (0.01, 0.2))
+    assert numpy.isclose(radii.min(), 0.01)
+    assert numpy.isclose(radii.max(), 0.2)
+    assert numpy.argmax(radii) == numpy.argmax(numpy.abs(forces))
+    assert numpy.allclose(force_radii(solved, 0.1), 0.1)
+
+    pipes = force_pipes(solved, sides=4)
+    assert pipes.number_of_faces == 8 * solved.number_of_edges()
+    red = numpy.all(pipes.colors == [1.0, 0.0, 0.0], axis=1).reshape((-1, 8))
+    assert numpy.all(red.all(axis=1) == (forces > 0))
+
+    # the radii of a subset of edges are scaled with respect to all edges
+    edges = solved.splines[1].edges
+    subset = force_pipes(solved, edges, sides=4)
+    assert subset.number_of_faces == 8 * len(edges)
+    edge_index = solved.edge_index(undirected=True)
+    u, v = edges[0]
+    start = solved.node_point(u)
+    assert numpy.isclose(numpy.linalg.norm(subset.vertices[0] - start), radii[edge_index[(u, v)]])
+
+
+def test_moment_ribbons(solved):
+    moments = solved.moments_array()
+    node_index = solved.node_index()
+    ribbons = moment_ribbons(solved)
+    count = 0
+    for spline in solved.splines:
+        for u, v in spline.edges:
+            if moments[node_index[u]].any() and moments[node_index[v]].any():
+                count += 1
+    # the end edges of the splines have no moment at the anchors
+    assert 0 < count < sum(len(spline.edges) for spline in solved.splines)
+    assert ribbons.number_of_faces == 2 * count
+
+
+def test_reaction_arrows(solved):
+    reactions = solved.reactions_array()
+    anchors = numpy.any(reactions != 0, axis=1).sum()
+    assert anchors == 4
+    arrows = reaction_arrows(solved, sides=4)
+    # a shaft and a head per anchor
+    assert arrows.number_of_faces == anchors * 2 * 8
+
+
+def test_screen_scale():
+    assert screen_scale([[0, 0, 0], [3, 4, 0]], 500) == 100.0
+    assert screen_scale([[1, 1, 1]], 500) == float("inf")
+    assert screen_scale([], 500) == float("inf")
+
+
+def test_decimate_edges():
+    xyz = [[0.0, 0, 0], [0.1, 0, 0], [1.0, 0, 0], [1.1, 0, 0], [2.0, 0, 0]]
+    edges = [(0, 1), (1, 2), (0, 3), (2, 3), (3, 4)]
+    points, segments, represents = decimate_edges(xyz, edges, 0.5)
+    assert numpy.allclose(points, [[0.05, 0, 0], [1.05, 0, 0], [2.0, 0, 0]])
+    # the edges within a cell are removed and the parallel edges between the same cells are merged
+    assert segments.tolist() == [[0, 1], [1, 2]]
+    assert represents.tolist() == [1, 4]
+
+
+def test_level_of_detail(solved):
+    lines, pipes = level_of_detail(solved, threshold=0.5, pixels=0.0, sides=6)
+    forces = numpy.abs(solved.edge_forces_array())
+    is_pipe = forces >= 0.5 * forces.max()
+    assert lines.number_of_segments == (~is_pipe).sum()
+    assert pipes.number_of_faces % 6 == 0
+    assert pipes.number_of_faces >= 2 * 3 * is_pipe.sum()
+
+    lines, pipes = level_of_detail(solved, threshold=2.0)
+    assert pipes.number_of_faces == 0
+    assert lines.number_of_segments == solved.number_of_edges()
+
+    # the lines are decimated in a small view
+    lines, _ = level_of_detail(solved, width=10, threshold=2.0, pixels=5.0)
+    assert lines.number_of_segments < solved.number_of_edges()
+
+
+def test_level_of_detail_sides(solved):
+    count = solved.number_of_edges()
+    diagonal = numpy.linalg.norm(numpy.ptp(solved.nodes_xyz_array(), axis=0))
+    # the number of sides of the pipes depends on their radius on screen, in pixels
+    for pixels, sides in ((1.0, 3), (5.0, 6), (20.0, 12)):
+        lines, pipes = level_of_detail(solved, width=pixels * diagonal / 0.1, threshold=0.0, radius=0.1, pixels=0.0)
+        assert lines.number_of_segments == 0
+        assert pipes.number_of_faces == 2 * sides * count
+    # pipes of less than half a pixel are drawn as lines
+    lines, pipes = level_of_detail(solved, width=0.4 * diagonal / 0.1, threshold=0.0, radius=0.1, pixels=0.0)
+    assert lines.number_of_segments == count
+    assert pipes.number_of_faces == 0
+
+
+def test_notebook_object(solved):
+    pytest.importorskip("pythreejs")
+    pytest.importorskip("compas_notebook")
+    from compas_bender.notebook.scene import ThreeBendNetworkObject
+
+    sceneobject = ThreeBendNetworkObject(item=solved, threshold=0.5, sides=6)
+    objects = sceneobject.draw()
+    assert len(objects) == 2
+    lines, pipes = level_of_detail(solved, threshold=0.5, sides=6)
+    assert objects[0].geometry.attributes["position"].array.shape == (2 * lines.number_of_segments, 3)
+    assert objects[1].geometry.attributes["index"].array.shape == (3 * pipes.number_of_faces,)
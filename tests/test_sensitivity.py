@@ -0,0 +1,59 @@
+import numpy
+
+from compas_bender.bend import BendSolver
+from compas_bender.bend import Sensitivity
+
+VALUES = {"radius": 30.0, "thickness": 5.0, "lpre": 0.99}
+
+
+def test_gradient_finite_differences(tied_cantilever, config):
+    network, tie, tip = tied_cantilever()
+    solver = BendSolver(network, config=config)
+    solver.solve()
+    sensitivity = Sensitivity(solver, [("radius", 0), ("thickness", 0), ("lpre", tie)])
+    gradient = sensitivity.gradient(xyz={tip: [0, 0, 1]})
+
+    def height(**parameters):
+        network, _, tip = tied_cantilever(**parameters)
+        iterations = BendSolver(network, config=dict(config)).solve()
+        assert iterations["converged"]
+        return network.node_attribute(tip, "z")
+
+    for (name, _), value in zip(sensitivity.parameters, gradient):
+        h = 1e-3 * VALUES[name]
+        plus = height(**{name: VALUES[name] + h})
+        minus = height(**{name: VALUES[name] - h})
+        assert numpy.isclose(value, (plus - minus) / (2 * h), rtol=1e-2)
+
+
+def test_tangent_matches_gradient(tied_cantilever, config):
+    network, tie, tip = tied_cantilever()
+    solver = BendSolver(network, config=config)
+    solver.solve()
+    sensitivity = Sensitivity(solver, [("radius", 0), ("thickness", 0), ("lpre", tie)])
+    gradient = sensitivity.gradient(xyz={tip: [0, 0, 1]})
+    index = solver.node_index[tip]
+    for i, value in enumerate(gradient):
+        dp = numpy.zeros(len(gradient))
+        dp[i] = 1.0
+        assert numpy.isclose(sensitivity.tangent(dp)[index, 2], value, rtol=1e-6)
+
+
+def test_crossing_splines_finite_differences(crossing, config):
+    # the crossing is an interior node of both splines,
+    # and every spline bends with its own moment at the crossing
+    network, top = crossing()
+    solver = BendSolver(network, config=config)
+    assert solver.solve()["converged"]
+    sensitivity = Sensitivity(solver, [("radius", 0), ("radius", 1)])
+    gradient = numpy.array([sensitivity.gradient(xyz={top: axis}) for axis in numpy.eye(3)])
+
+    def point(radius):
+        network, top = crossing(radius=radius)
+        assert BendSolver(network, config=dict(config)).solve()["converged"]
+        return numpy.array(network.node_point(top))
+
+    h = 0.1
+    fd = [(point((30.0 + h, 20.0)) - point((30.0 - h, 20.0))) / (2 * h)]
+    fd += [(point((30.0, 20.0 + h)) - point((30.0, 20.0 - h))) / (2 * h)]
+    assert numpy.allclose(gradient, numpy.array(fd).T, rtol=1e-2, atol=1e-8)
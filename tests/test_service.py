@@ -0,0 +1,108 @@
+import asyncio
+
+import numpy
+
+from compas_bender.bend import BendSolver
+from compas_bender.bend import SolveCache
+from compas_bender.bend import SolveService
+
+
+def test_shared_solve(crossing, config):
+    reference, _ = crossing()
+    BendSolver(reference, config=dict(config)).solve()
+    networks = [crossing()[0] for _ in range(3)]
+    reports = []
+
+    async def main():
+        async with SolveService(max_workers=2, every=10, interval=0.01) as service:
+            tasks = [
+                asyncio.ensure_future(service.solve(network, config=config, progress=reports.append))
+                for network in networks
+            ]
+            await asyncio.sleep(0)
+            # identical requests share a single solve
+            assert service.running == 1
+            return await asyncio.gather(*tasks)
+
+    results = asyncio.run(main())
+    assert all(iterations["converged"] for iterations in results)
+    for network in networks:
+        assert numpy.allclose(network.nodes_xyz_array(), reference.nodes_xyz_array())
+    # every listener gets the reports of the shared solve
+    assert len(reports) % 3 == 0
+    assert len(reports) >= 3
+    assert reports[-1]["k"] >= reports[0]["k"]
+    assert len(set(report["key"] for report in reports)) == 1
+
+
+def test_cancel(crossing, config):
+    network, _ = crossing()
+    config.update(kmax=10**8, tol1=0.0, tol2=0.0, tol3=0.0)
+
+    async def main():
+        async with SolveService(max_workers=1, every=10, interval=0.01) as service:
+            reports = asyncio.Queue()
+            shared = [
+                asyncio.ensure_future(service.solve(network, config=config, progress=reports.put)) for _ in range(2)
+            ]
+            await reports.get()
+            # the solve continues while other requests are waiting for it
+            shared[0].cancel()
+            await asyncio.sleep(0.1)
+            assert service.running == 1
+            assert not shared[1].done()
+            shared[1].cancel()
+            for _ in range(500):
+                if not service.running:
+                    break
+                await asyncio.sleep(0.01)
+            assert not service.running
+            results = await asyncio.gather(*shared, return_exceptions=True)
+            assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+    asyncio.run(main())
+
+
+def test_close_does_not_block(crossing, config):
+    network, _ = crossing()
+    config.update(kmax=10**8, tol1=0.0, tol2=0.0, tol3=0.0)
+    ticks = []
+
+    async def ticker(closed):
+        while not closed.done():
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        service = SolveService(max_workers=1, every=10, interval=0.01)
+        reports = asyncio.Queue()
+        task = asyncio.ensure_future(service.solve(network, config=config, progress=reports.put))
+        await reports.get()
+        closed = asyncio.ensure_future(service.aclose())
+        await asyncio.gather(closed, ticker(closed))
+        # the running solve is cancelled when the service is closed
+        iterations = await task
+        assert iterations["status"] == "cancelled"
+        assert not service.running
+
+    asyncio.run(main())
+    assert ticks
+
+
+def test_cache(crossing, config, tmp_path):
+    cache = SolveCache(str(tmp_path))
+    network, _ = crossing()
+
+    async def main():
+        async with SolveService(max_workers=1, cache=cache) as service:
+            first = await service.solve(network, config=config)
+            assert len(cache) == 1
+            other, _ = crossing()
+            second = await service.solve(other, config=config)
+            assert service.running == 0
+            assert service._executor is not None
+            return first, second, other
+
+    first, second, other = asyncio.run(main())
+    assert first == second
+    assert numpy.allclose(other.nodes_xyz_array(), network.nodes_xyz_array())
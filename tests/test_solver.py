@@ -0,0 +1,279 @@
+import json
+import os
+import threading
+
+import numpy
+import pytest
+
+import compas
+from compas.tolerance import TOL
+from compas_bender.bend import BendSolver
+from compas_bender.bend import CancellationToken
+from compas_bender.bend import bend_splines
+from compas_bender.datastructures import BendNetwork
+
+HERE = os.path.dirname(__file__)
+EXAMPLES = os.path.join(HERE, "..", "docs", "examples")
+
+# the results of bend_splines before the introduction of BendSolver,
+# for the arch and cantilever examples with the configurations below
+REFERENCE = os.path.join(HERE, "fixtures", "bend_splines.json")
+
+ARCH = {"kmax": 5000, "tol1": 1e-2, "tol2": 1e-1, "tol3": 1e-4}
+CANTILEVER = {"kmax": 1000, "tol1": 1e-2, "tol2": 1e-1, "tol3": 1e-4, "alpha": 100}
+
+
+def arch():
+    network = compas.json_load(os.path.join(EXAMPLES, "example_arch.json"))["network"]
+    spline = network.splines[0]
+    spline.E = 30
+    spline.radius = 10
+    spline.thickness = 10
+    for _, attr in network.edges(True):
+        attr["linit"] = 0
+    return network
+
+
+def cantilever():
+    network = compas.json_load(os.path.join(EXAMPLES, "example_cantilever.json"))["network"]
+    spline = network.splines[0]
+    spline.E = 30
+    spline.radius = 30
+    spline.thickness = 5
+    for cable in network.cables:
+        cable.qpre = 7
+    for _, attr in network.edges(True):
+        attr["linit"] = 0
+    gkey = TOL.geometric_key([5, 10, 0])
+    for u, v in network.edges():
+        if gkey in (TOL.geometric_key(network.node_point(u)), TOL.geometric_key(network.node_point(v))):
+            network.edge_attribute((u, v), "lpre", 5.0)
+    return network
+
+
+def modules(count):
+    """A row of separate modules of two arches that cross at their tops, with loads like the crossing fixture."""
+    a = [[-2.0, 0.0, 0.0], [-1.0, 0.0, 0.6], [0.0, 0.0, 0.8], [1.0, 0.0, 0.6], [2.0, 0.0, 0.0]]
+    b = [[0.0, -2.0, 0.0], [0.0, -1.0, 0.6], [0.0, 0.0, 0.8], [0.0, 1.0, 0.6], [0.0, 2.0, 0.0]]
+    lines = []
+    anchors = []
+    splines = []
+    for i in range(count):
+        for points in (a, b):
+            points = [[x + 10.0 * i, y, z] for x, y, z in points]
+            lines += list(zip(points[:-1], points[1:]))
+            anchors += [points[0], points[-1]]
+            splines.append(points)
+    network = BendNetwork.from_lines_with_features(lines, anchors=anchors, splines=splines)
+    for spline in network.splines:
+        spline.E = 1.0
+        spline.radius = 30.0
+        spline.thickness = 5.0
+    for spline in network.splines[::2]:
+        network.node_attribute(spline.nodes[2], "pz", -3.0)
+        network.node_attribute(spline.nodes[3], "px", 1.0)
+    return network
+
+
+def reference(name, network):
+    with open(REFERENCE) as f:
+        xyz = json.load(f)[name]
+    return numpy.array([xyz[str(node)] for node in network.nodes()])
+
+
+def free_node(network):
+    free = [node for node in network.nodes() if not network.node_attribute(node, "is_anchor")]
+    return free[len(free) // 2]
+
+
+def test_parity_arch():
+    network = arch()
+    iterations = bend_splines(network, config=dict(ARCH))
+    assert iterations["converged"]
+    assert numpy.allclose(network.nodes_xyz_array(), reference("arch", network), atol=1e-8)
+
+
+def test_parity_cantilever():
+    network = cantilever()
+    bend_splines(network, config=dict(CANTILEVER))
+    assert numpy.allclose(network.nodes_xyz_array(), reference("cantilever", network), atol=1e-8)
+
+
+def test_parity_columnar():
+    network = cantilever()
+    network.set_columnar(True)
+    bend_splines(network, config=dict(CANTILEVER))
+    assert network.is_columnar
+    assert numpy.allclose(network.nodes_xyz_array(), reference("cantilever", network), atol=1e-8)
+
+
+def test_warm_start():
+    network = arch()
+    solver = BendSolver(network, config=dict(ARCH))
+    first = solver.solve()
+    xyz = network.nodes_xyz_array()
+    second = solver.solve()
+    assert second["converged"]
+    assert len(second["displacements"]) < len(first["displacements"])
+    assert numpy.allclose(network.nodes_xyz_array(), xyz, atol=1e-3)
+
+
+def test_update_matches_new_solver():
+    network = arch()
+    solver = BendSolver(network, config=dict(CANTILEVER))
+    node = free_node(network)
+    edge = next(iter(network.edges()))
+    network.node_attribute(node, "pz", -5.0)
+    network.edge_attribute(edge, "qpre", 2.0)
+    network.splines[0].E = 40
+    solver.update(nodes=[node], edges=[edge], splines=[network.splines[0]])
+    solver.solve()
+    xyz = network.nodes_xyz_array()
+
+    other = arch()
+    other.node_attribute(node, "pz", -5.0)
+    other.edge_attribute(edge, "qpre", 2.0)
+    other.splines[0].E = 40
+    BendSolver(other, config=dict(CANTILEVER)).solve()
+    assert numpy.allclose(xyz, other.nodes_xyz_array(), atol=1e-8)
+
+
+def test_update_then_resolve():
+    network = arch()
+    solver = BendSolver(network, config=dict(ARCH))
+    solver.solve()
+    node = free_node(network)
+    z = network.node_attribute(node, "z")
+    network.node_attribute(node, "pz", -20.0)
+    solver.update(nodes=[node])
+    iterations = solver.solve()
+    assert iterations["converged"]
+    assert numpy.isfinite(network.nodes_xyz_array()).all()
+    assert network.node_attribute(node, "z") < z
+
+
+def test_update_edges_keeps_initial_lengths():
+    network = arch()
+    solver = BendSolver(network, config=dict(ARCH))
+    linit = solver.linit.copy()
+    edge = next(iter(network.edges()))
+    solver.update(edges=[edge])
+    assert numpy.allclose(solver.linit, linit)
+    solver.solve()
+    assert numpy.isfinite(solver.xyz).all()
+    assert numpy.allclose(network.nodes_xyz_array(), reference("arch", network), atol=1e-8)
+
+
+def test_iterate():
+    network = arch()
+    solver = BendSolver(network, config=dict(ARCH, kdiv=20))
+    snapshots = []
+    for snapshot in solver.iterate(every=10):
+        # the coordinates are a read-only view on the state of the solver
+        assert numpy.shares_memory(snapshot.xyz, solver.xyz)
+        with pytest.raises(ValueError):
+            snapshot.xyz[0, 0] = 0.0
+        snapshots.append(snapshot.copy())
+    iterations = solver.iterations
+    assert iterations["converged"]
+    assert [snapshot.k for snapshot in snapshots] == list(range(9, 10 * len(snapshots), 10))
+    # the copies keep the state of their iteration
+    assert not numpy.allclose(snapshots[0].xyz, snapshots[-1].xyz)
+    assert numpy.array_equal(snapshots[-1].xyz, solver.xyz)
+    for snapshot in snapshots[1::2]:
+        assert snapshot.crit1 == iterations["membrane"][str(snapshot.k)]
+        assert snapshot.crit3 == iterations["displacements"][str(snapshot.k)]
+    # the results are the same as those of a solve
+    other = arch()
+    BendSolver(other, config=dict(ARCH, kdiv=20)).solve()
+    assert numpy.array_equal(network.nodes_xyz_array(), other.nodes_xyz_array())
+
+
+def test_budgets():
+    # without tolerances, the solves only stop at the budgets
+    config = dict(ARCH, kdiv=10, tol1=0.0, tol2=0.0, tol3=0.0)
+    network = arch()
+    xyz = network.nodes_xyz_array()
+    iterations = BendSolver(network, config=dict(config, tmax=0.0)).solve()
+    assert iterations["status"] == "tmax"
+    assert not iterations["converged"]
+    assert iterations["membrane"] == {}
+    assert numpy.allclose(network.nodes_xyz_array(), xyz)
+
+    iterations = BendSolver(arch(), config=dict(config, kmax=50)).solve()
+    assert iterations["status"] == "kmax"
+    assert len(iterations["membrane"]) == 5
+
+    # one bracket per level of alpha
+    solver = BendSolver(network, config=dict(config, alpha=8, kalpha=10))
+    alphas = [snapshot.alpha for snapshot in solver.iterate()]
+    assert alphas == [8, 4, 2, 1]
+    assert solver.iterations["status"] == "kalpha"
+    assert not numpy.allclose(network.nodes_xyz_array(), xyz)
+
+
+def test_cancel():
+    config = dict(ARCH, kdiv=10, tol1=0.0, tol2=0.0, tol3=0.0)
+    token = CancellationToken()
+    solver = BendSolver(arch(), config=config)
+    for snapshot in solver.iterate(token=token):
+        if snapshot.k == 29:
+            token.cancel()
+    # the token is checked before every bracket
+    assert snapshot.k == 29
+    assert solver.iterations["status"] == "cancelled"
+    assert numpy.allclose(solver.network.nodes_xyz_array(), solver.xyz)
+
+    # a token can be cancelled from another thread
+    token = CancellationToken()
+    timer = threading.Timer(0.1, token.cancel)
+    timer.start()
+    iterations = BendSolver(arch(), config=dict(config, kmax=10**8)).solve(token=token)
+    timer.join()
+    assert iterations["status"] == "cancelled"
+
+
+def test_write():
+    network = arch()
+    xyz = network.nodes_xyz_array()
+    solver = BendSolver(network, config=dict(ARCH))
+    for snapshot in solver.iterate(every=10):
+        if snapshot.k >= 99:
+            break
+    assert numpy.allclose(network.nodes_xyz_array(), xyz)
+    solver.write()
+    assert numpy.allclose(network.nodes_xyz_array(), solver.xyz)
+    assert numpy.allclose(network.edge_forces_array(), solver.f[:, 0])
+
+
+def test_active_region(config):
+    for count in (2, 8):
+        results = []
+        for active in (False, True):
+            network = modules(count)
+            solver = BendSolver(network, config=dict(config, active=active))
+            assert solver.solve()["converged"]
+            # the other modules are in equilibrium well within the tolerances of the next solve
+            solver.config.update(tol1=1e-5, tol2=1e-5)
+            top = network.splines[0].nodes[2]
+            network.node_attribute(top, "pz", -4.0)
+            solver.update(nodes=[top])
+            # count the nodes and the stencils of the splines of every evaluation
+            nodes = []
+            stencils = []
+            rk4 = solver.rk4
+            bending = solver._bending
+            solver.rk4 = lambda free, *args: nodes.append(len(free)) or rk4(free, *args)
+            solver._bending = lambda k: stencils.append(len(solver._stencils["center"][k])) or bending(k)
+            iterations = solver.solve()
+            assert iterations["converged"]
+            results.append(network.nodes_xyz_array())
+        assert numpy.allclose(results[1], results[0], atol=1e-5)
+        # only the selection of the first region and the last iteration of every bracket evaluate the entire network,
+        # and the other iterations only evaluate the loaded module, regardless of the size of the network
+        brackets = len(iterations["membrane"])
+        assert nodes.count(len(solver.free)) == brackets
+        assert set(nodes) == {5, len(solver.free)}
+        assert stencils.count(6 * count) == brackets + 1
+        assert set(stencils) == {6, 6 * count}
+        assert len(nodes) > 10 * brackets